@@ -0,0 +1,111 @@
+"""
+Encode/decode time per MB of the available JSON codecs on payloads shaped like the
+largest Ozon bodies: a 100-item product/import request and a 5000-value
+description-category/attribute/values page.
+
+    python -m benchmarks.bench_codec [--rounds 20]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+from ozon_api.codec import JSONCodec, get_codec
+
+
+def import_payload() -> Dict[str, Any]:
+    item = {
+        "attributes": [
+            {
+                "complex_id": 0,
+                "id": attribute_id,
+                "values": [
+                    {
+                        "dictionary_value_id": 971010234,
+                        "value": "Значение характеристики",
+                    }
+                ],
+            }
+            for attribute_id in range(40)
+        ],
+        "barcode": "4600000000000",
+        "description_category_id": 17027949,
+        "new_description_category_id": 0,
+        "color_image": "",
+        "complex_attributes": [],
+        "currency_code": "RUB",
+        "depth": 100,
+        "dimension_unit": "mm",
+        "height": 250,
+        "images": [f"https://cdn1.ozone.ru/s3/multimedia-p/{n}.jpg" for n in range(10)],
+        "images360": [],
+        "name": "Шины для легковых автомобилей WINDFORCE Catchfors 205/55 R16",
+        "offer_id": "",
+        "old_price": "5100",
+        "pdf_list": [],
+        "price": "4900",
+        "primary_image": "",
+        "vat": "0.2",
+        "weight": 9000,
+        "weight_unit": "g",
+        "width": 150,
+    }
+    return {"items": [{**item, "offer_id": f"offer-{n}"} for n in range(100)]}
+
+
+def values_page() -> Dict[str, Any]:
+    return {
+        "result": [
+            {
+                "id": 970000000 + n,
+                "value": f"Бренд {n}",
+                "info": "Автотовары",
+                "picture": f"https://cdn1.ozone.ru/s3/multimedia-p/{n}.jpg",
+            }
+            for n in range(5000)
+        ],
+        "has_next": True,
+    }
+
+
+def _per_mb(function: Callable[[], Any], size: int, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        function()
+    elapsed = (time.perf_counter() - started) / rounds
+    return elapsed / (size / 1024 / 1024) * 1000
+
+
+def available_codecs() -> List[JSONCodec]:
+    codecs = []
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            print(f"{name}: not installed")
+    return codecs
+
+
+def main(rounds: int) -> None:
+    payloads = {"product/import": import_payload(), "attribute/values": values_page()}
+    reference = get_codec("json")
+    codecs = available_codecs()
+    print(
+        f"{'payload':<18}{'codec':<10}{'MB':>7}{'encode ms/MB':>15}{'decode ms/MB':>15}"
+    )
+    for label, payload in payloads.items():
+        size = len(reference.dumps(payload))
+        for codec in codecs:
+            encoded = codec.dumps(payload)
+            encode = _per_mb(lambda: codec.dumps(payload), size, rounds)
+            decode = _per_mb(lambda: codec.loads(encoded), size, rounds)
+            print(
+                f"{label:<18}{codec.name:<10}{size / 1024 / 1024:>7.2f}{encode:>15.2f}{decode:>15.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    main(args.rounds)
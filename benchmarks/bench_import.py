@@ -0,0 +1,60 @@
+"""
+Import time of the package in a fresh interpreter, and which heavy dependencies it loads.
+
+Every statement is run in a new process, so nothing is cached between runs; the median
+of the runs is reported next to the bare interpreter start-up.
+
+    python -m benchmarks.bench_import [--runs 15]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+STATEMENTS = {
+    "python": "pass",
+    "import ozon_api": "import ozon_api",
+    "OzonAPI()": "from ozon_api import OzonAPI; OzonAPI('bench', 'bench')",
+    "ozon_api.models": "from ozon_api.models import ProductImport_Item",
+    "import aiohttp": "import aiohttp",
+}
+
+HEAVY = ("aiohttp", "pydantic", "loguru")
+
+
+def _run(statement: str, runs: int) -> float:
+    timings: List[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def _loaded(statement: str) -> List[str]:
+    probe = f"{statement}; import sys; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+    ).stdout
+    return output.split()
+
+
+def main(runs: int) -> None:
+    baseline = _run(STATEMENTS["python"], runs)
+    print(f"{'statement':<18}{'ms':>8}{'+ms':>8}  loads")
+    for label, statement in STATEMENTS.items():
+        elapsed = _run(statement, runs)
+        loads = ", ".join(_loaded(statement)) or "-"
+        print(
+            f"{label:<18}{elapsed * 1000:>8.1f}{(elapsed - baseline) * 1000:>8.1f}  {loads}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,61 @@
+"""
+Items/sec of validating and serializing ProductImport_Item batches: one model at a
+time, through the precompiled list TypeAdapter, and in trusted mode.
+
+    python -m benchmarks.bench_models [--items 20000]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from ozon_api.codec import get_codec
+from ozon_api.models.batch import items_payload
+from ozon_api.models.product_import import ProductImport_Item
+
+from benchmarks.bench_codec import import_payload
+
+
+def _items(count: int) -> List[Dict[str, Any]]:
+    template = import_payload()["items"][0]
+    return [{**template, "offer_id": f"offer-{n}"} for n in range(count)]
+
+
+def _rate(function: Callable[[], Any], count: int) -> float:
+    started = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - started)
+
+
+def main(count: int) -> None:
+    items = _items(count)
+    models = [ProductImport_Item.model_validate(item) for item in items]
+
+    def one_by_one() -> bytes:
+        validated = [ProductImport_Item.model_validate(item) for item in items]
+        return json.dumps(
+            {"items": [model.model_dump(mode="json") for model in validated]}
+        ).encode()
+
+    cases = {
+        "model_validate + json.dumps": one_by_one,
+        "TypeAdapter validate, dicts as given": lambda: items_payload(
+            ProductImport_Item, items
+        ),
+        "trusted models, dump_json": lambda: items_payload(
+            ProductImport_Item, models, trusted=True
+        ),
+        "trusted dicts, client codec": lambda: items_payload(
+            ProductImport_Item, items, trusted=True, dumps=get_codec().dumps
+        ),
+    }
+    for label, function in cases.items():
+        print(f"{label:<36}{_rate(function, count):>12.0f} items/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.items)
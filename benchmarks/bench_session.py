@@ -0,0 +1,58 @@
+"""
+Requests/sec of OzonAPI with a pooled keep-alive session compared to opening a new
+session for every call (the behaviour before the session became persistent).
+
+    python -m benchmarks.bench_session [--requests 2000] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from ozon_api import OzonAPI
+from ozon_api.ratelimit import RateLimiter
+
+from benchmarks.fake_server import run_server
+
+
+async def _run(api: OzonAPI, requests: int, concurrency: int, reopen: bool) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            if reopen:
+                # A private client per call reproduces a throwaway ClientSession.
+                client = OzonAPI(
+                    api.client_id, api.api_key, rate_limiter=api.rate_limiter
+                )
+                client.api_url = api.api_url
+                async with client:
+                    await client.get_description_category_tree()
+            else:
+                await api.get_description_category_tree()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    async with run_server() as url:
+        # The stub has no quota, so pacing is effectively switched off.
+        unlimited = RateLimiter(rate=1e9)
+        async with OzonAPI("bench", "bench", rate_limiter=unlimited) as api:
+            api.api_url = url
+            per_call = await _run(api, requests, concurrency, reopen=True)
+            pooled = await _run(api, requests, concurrency, reopen=False)
+
+    print(f"session per call: {per_call:10.1f} req/s")
+    print(f"pooled session:   {pooled:10.1f} req/s")
+    print(f"speedup:          {pooled / per_call:10.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,276 @@
+"""
+End-to-end benchmarks of the main OzonAPI workflows against the local stub server.
+
+For every workflow the suite reports operations/s, HTTP requests/s, p50/p99 latency of one
+operation and the peak memory allocated by the client. The stub runs in a child process,
+so its CPU time and memory are not counted.
+
+    python -m benchmarks.bench_suite [--latency 0.005] [--only tree values ...]
+    python -m benchmarks.bench_suite --output baseline.json
+    python -m benchmarks.bench_suite --baseline baseline.json --tolerance 0.15
+
+With --baseline the results are compared to a previous --output file and the command exits
+with status 1 when an operation rate dropped, or a latency or memory peak grew, by more than
+the tolerance. --history appends every run to a JSON Lines file to follow trends over time.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ozon_api import OzonAPI
+from ozon_api.ratelimit import RateLimiter
+
+from benchmarks.bench_codec import import_payload
+from benchmarks.fake_server import FakeOzonConfig, serve_in_process
+
+CATEGORY = {"description_category_id": 17100000, "type_id": 90000}
+DICTIONARY_ATTRIBUTE = 3
+
+
+@dataclass
+class Workflow:
+    """
+    A benchmarked operation.
+
+    run: performs the operation once with the given client.
+    operations: how many times it is performed in one measurement.
+    concurrency: how many operations run at the same time.
+    """
+
+    run: Callable[[OzonAPI], Awaitable[Any]]
+    operations: int
+    concurrency: int = 1
+
+
+@dataclass
+class Result:
+    operations_per_second: float
+    requests_per_second: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_mb: float
+
+
+async def _tree(api: OzonAPI) -> None:
+    await api.get_description_category_tree()
+
+
+async def _attribute(api: OzonAPI) -> None:
+    await api.get_description_category_attribute(**CATEGORY)
+
+
+async def _attribute_values(api: OzonAPI) -> None:
+    await api.get_description_category_attribute_values(
+        "Атрибут 3", attribute_id=DICTIONARY_ATTRIBUTE, limit=500, **CATEGORY
+    )
+
+
+async def _full_category_info(api: OzonAPI) -> None:
+    await api.get_full_category_info(**CATEGORY)
+
+
+_IMPORT_ITEMS = import_payload()["items"]
+
+
+async def _import(api: OzonAPI) -> None:
+    response = await api.product_import(_IMPORT_ITEMS)
+    task_id = response["result"]["task_id"]
+    while True:
+        info = await api.product_import_info(task_id)
+        if all(item["status"] != "pending" for item in info["result"]["items"]):
+            return
+
+
+async def _product_list(api: OzonAPI) -> None:
+    async for _ in api.iter_product_list(fields=("product_id", "offer_id")):
+        pass
+
+
+WORKFLOWS: Dict[str, Workflow] = {
+    "tree": Workflow(_tree, operations=300, concurrency=10),
+    "attribute": Workflow(_attribute, operations=1000, concurrency=20),
+    "values": Workflow(_attribute_values, operations=20, concurrency=2),
+    "full_category_info": Workflow(_full_category_info, operations=10),
+    "import": Workflow(_import, operations=100, concurrency=4),
+    "list": Workflow(_product_list, operations=10),
+}
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _measure(api: OzonAPI, workflow: Workflow) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(workflow.concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await workflow.run(api)
+            latencies.append(time.perf_counter() - started)
+
+    attempts = api.retry_stats.total().attempts
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(workflow.operations)))
+    elapsed = time.perf_counter() - started
+    return {
+        "elapsed": elapsed,
+        "requests": api.retry_stats.total().attempts - attempts,
+        "p50": _percentile(latencies, 0.5),
+        "p99": _percentile(latencies, 0.99),
+    }
+
+
+async def _run_workflow(url: str, workflow: Workflow) -> Result:
+    # The stub has no quota, so pacing is effectively switched off.
+    async with OzonAPI("bench", "bench", rate_limiter=RateLimiter(rate=1e9)) as api:
+        api.api_url = url
+        # Warm up the connection pool and the lazily built models.
+        await workflow.run(api)
+        timing = await _measure(api, workflow)
+
+        # Memory is measured in a separate pass, tracemalloc slows every allocation down.
+        tracemalloc.start()
+        try:
+            await _measure(
+                api, Workflow(workflow.run, workflow.concurrency, workflow.concurrency)
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return Result(
+        operations_per_second=workflow.operations / timing["elapsed"],
+        requests_per_second=timing["requests"] / timing["elapsed"],
+        p50_ms=timing["p50"] * 1000,
+        p99_ms=timing["p99"] * 1000,
+        peak_memory_mb=peak / 1024 / 1024,
+    )
+
+
+def _revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Returns:
+        List[str]: Descriptions of the metrics that regressed by more than the tolerance.
+    """
+    regressions = []
+    # The sign tells whether a larger value is better (1) or worse (-1).
+    metrics = {
+        "operations_per_second": 1,
+        "p50_ms": -1,
+        "p99_ms": -1,
+        "peak_memory_mb": -1,
+    }
+    print(
+        f"\n{'workflow':<20}{'metric':<24}{'baseline':>12}{'current':>12}{'change':>9}"
+    )
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric, sign in metrics.items():
+            before, after = previous[metric], result[metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            flag = ""
+            if sign * change < -tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}: {before:.2f} -> {after:.2f}")
+            print(
+                f"{name:<20}{metric:<24}{before:>12.2f}{after:>12.2f}{change:>+9.1%}{flag}"
+            )
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    config = FakeOzonConfig(latency=args.latency)
+    names = args.only or list(WORKFLOWS)
+    results: Dict[str, Dict[str, float]] = {}
+
+    print(
+        f"stub latency {args.latency * 1000:.1f} ms, {platform.python_implementation()} {platform.python_version()}"
+    )
+    print(
+        f"{'workflow':<20}{'ops/s':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}"
+    )
+    with serve_in_process(config) as url:
+        for name in names:
+            result = asyncio.run(_run_workflow(url, WORKFLOWS[name]))
+            results[name] = asdict(result)
+            print(
+                f"{name:<20}{result.operations_per_second:>10.1f}{result.requests_per_second:>10.1f}"
+                f"{result.p50_ms:>10.2f}{result.p99_ms:>10.2f}{result.peak_memory_mb:>10.2f}"
+            )
+
+    record = {
+        "timestamp": time.time(),
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "latency": args.latency,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(record, file, indent=2)
+    if args.history:
+        with open(args.history, "a") as file:
+            file.write(json.dumps(record) + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get("latency") != args.latency:
+            print(
+                f"warning: the baseline was measured with latency {baseline.get('latency')}"
+            )
+        regressions = _compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="stub response delay, s"
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=list(WORKFLOWS), help="workflows to run"
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--history", help="append the results to this JSON Lines file")
+    parser.add_argument("--baseline", help="compare to the results in this JSON file")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="allowed relative regression"
+    )
+    sys.exit(main(parser.parse_args()))
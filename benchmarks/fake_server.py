@@ -0,0 +1,281 @@
+"""
+Local stub of the Ozon Seller API used by the benchmarks.
+
+The stub emulates the endpoints the client is measured on, with deterministic data:
+
+- description-category/tree, description-category/attribute and
+  description-category/attribute/values (paged by last_value_id)
+- product/import (v3) and product/import/info, tasks finish after a number of polls
+- product/list, paged by last_id
+
+Every other POST request is answered with {"result": []}. All responses can be delayed
+by a fixed latency, so both client overhead (latency 0) and pipelining against a slow
+server can be measured. The stub can run in the current event loop or in a separate
+process, which keeps its CPU time and memory out of the client measurements.
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from aiohttp import web
+
+import asyncio
+import itertools
+import json
+import multiprocessing
+
+
+@dataclass
+class FakeOzonConfig:
+    """
+    Shape of the emulated seller account.
+
+    Attributes:
+        latency (float): Seconds every response is delayed by.
+        categories (int): Number of leaf product types in the category tree.
+        attributes (int): Attributes of every category.
+        dictionary_every (int): Every n-th attribute has a dictionary of values, the rest have none.
+        values (int): Values in every dictionary.
+        products (int): Products returned by product/list.
+        import_polls (int): product/import/info calls after which an import task is finished.
+    """
+
+    latency: float = 0.0
+    categories: int = 200
+    attributes: int = 60
+    dictionary_every: int = 3
+    values: int = 2000
+    products: int = 10_000
+    import_polls: int = 1
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FakeOzon:
+    """
+    Request handlers and state of the stub.
+    """
+
+    def __init__(self, config: Optional[FakeOzonConfig] = None) -> None:
+        self.config = config or FakeOzonConfig()
+        self.requests = 0
+        self.__task_ids = itertools.count(1)
+        self.__tasks: Dict[int, List[Dict[str, Any]]] = {}
+        self.__polls: Dict[int, int] = {}
+        self.__tree = _dumps({"result": self._tree()})
+        self.__attributes = _dumps({"result": self._attributes()})
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        routes = {
+            "/v1/description-category/tree": self.tree,
+            "/v1/description-category/attribute": self.attribute,
+            "/v1/description-category/attribute/values": self.attribute_values,
+            "/v3/product/import": self.product_import,
+            "/v1/product/import/info": self.product_import_info,
+            "/v1/product/list": self.product_list,
+        }
+        for path, handler in routes.items():
+            app.router.add_post(path, handler)
+        app.router.add_post("/{tail:.*}", self.echo)
+        return app
+
+    def _tree(self) -> List[Dict[str, Any]]:
+        types_per_category = 10
+        return [
+            {
+                "description_category_id": 17000000 + parent,
+                "category_name": f"Категория {parent}",
+                "disabled": False,
+                "children": [
+                    {
+                        "description_category_id": 17100000 + parent,
+                        "category_name": f"Подкатегория {parent}",
+                        "disabled": False,
+                        "children": [
+                            {
+                                "type_id": 90000 + parent * types_per_category + n,
+                                "type_name": f"Тип {parent}-{n}",
+                                "disabled": False,
+                                "children": [],
+                            }
+                            for n in range(types_per_category)
+                        ],
+                    }
+                ],
+            }
+            for parent in range(-(-self.config.categories // types_per_category))
+        ]
+
+    def _attributes(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": attribute_id,
+                "name": f"Атрибут {attribute_id}",
+                "description": "Описание характеристики",
+                "type": "String",
+                "is_collection": False,
+                "is_required": attribute_id % 4 == 0,
+                "is_aspect": False,
+                "group_id": 0,
+                "group_name": "",
+                "dictionary_id": (
+                    attribute_id
+                    if attribute_id % self.config.dictionary_every == 0
+                    else 0
+                ),
+                "category_dependent": False,
+            }
+            for attribute_id in range(1, self.config.attributes + 1)
+        ]
+
+    async def _respond(self, body: bytes, status: int = 200) -> web.Response:
+        self.requests += 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        return web.Response(body=body, status=status, content_type="application/json")
+
+    async def echo(self, request: web.Request) -> web.Response:
+        await request.read()
+        return await self._respond(b'{"result":[]}')
+
+    async def tree(self, request: web.Request) -> web.Response:
+        await request.read()
+        return await self._respond(self.__tree)
+
+    async def attribute(self, request: web.Request) -> web.Response:
+        await request.read()
+        return await self._respond(self.__attributes)
+
+    async def attribute_values(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        attribute_id = body["attribute_id"]
+        if attribute_id % self.config.dictionary_every:
+            return await self._respond(b'{"result":[],"has_next":false}')
+
+        first = attribute_id * 1_000_000
+        start = max(body.get("last_value_id", 0), first)
+        end = min(start + body.get("limit", 5000), first + self.config.values)
+        values = [
+            {"id": value_id, "value": f"Значение {value_id}", "info": "", "picture": ""}
+            for value_id in range(start + 1, end + 1)
+        ]
+        return await self._respond(
+            _dumps({"result": values, "has_next": end < first + self.config.values})
+        )
+
+    async def product_import(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        task_id = next(self.__task_ids)
+        self.__tasks[task_id] = [item.get("offer_id", "") for item in body["items"]]
+        self.__polls[task_id] = 0
+        return await self._respond(_dumps({"result": {"task_id": task_id}}))
+
+    async def product_import_info(self, request: web.Request) -> web.Response:
+        task_id = (await request.json())["task_id"]
+        if task_id not in self.__tasks:
+            return await self._respond(
+                _dumps({"code": 5, "message": "task not found"}), status=404
+            )
+        self.__polls[task_id] += 1
+        done = self.__polls[task_id] >= self.config.import_polls
+        offers = self.__tasks[task_id]
+        if done:
+            del self.__tasks[task_id], self.__polls[task_id]
+        items = [
+            {
+                "offer_id": offer_id,
+                "product_id": task_id * 1000 + n if done else 0,
+                "status": "imported" if done else "pending",
+                "errors": [],
+            }
+            for n, offer_id in enumerate(offers)
+        ]
+        return await self._respond(
+            _dumps({"result": {"items": items, "total": len(items)}})
+        )
+
+    async def product_list(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        start = int(body.get("last_id") or 0)
+        end = min(start + body.get("limit", 1000), self.config.products)
+        items = [
+            {"product_id": 100000 + n, "offer_id": f"offer-{n}"}
+            for n in range(start, end)
+        ]
+        last_id = str(end) if end < self.config.products else ""
+        return await self._respond(
+            _dumps(
+                {
+                    "result": {
+                        "items": items,
+                        "total": self.config.products,
+                        "last_id": last_id,
+                    }
+                }
+            )
+        )
+
+
+def make_app(config: Optional[FakeOzonConfig] = None) -> web.Application:
+    return FakeOzon(config).app()
+
+
+@asynccontextmanager
+async def run_server(
+    host: str = "127.0.0.1", port: int = 0, config: Optional[FakeOzonConfig] = None
+) -> AsyncIterator[str]:
+    """
+    Starts the stub server in the current event loop.
+
+    Yields:
+        str: The base URL of the running server, to be assigned to OzonAPI.api_url.
+    """
+    runner = web.AppRunner(make_app(config), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = runner.addresses[0][1]
+    try:
+        yield f"http://{host}:{bound_port}"
+    finally:
+        await runner.cleanup()
+
+
+def _serve(
+    host: str, config: Dict[str, Any], urls: "multiprocessing.Queue[str]"
+) -> None:
+    async def serve() -> None:
+        async with run_server(host, config=FakeOzonConfig(**config)) as url:
+            urls.put(url)
+            await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+@contextmanager
+def serve_in_process(
+    config: Optional[FakeOzonConfig] = None, host: str = "127.0.0.1"
+) -> Iterator[str]:
+    """
+    Starts the stub server in a child process.
+
+    Yields:
+        str: The base URL of the running server.
+    """
+    context = multiprocessing.get_context("spawn")
+    urls = context.Queue()
+    process = context.Process(
+        target=_serve,
+        args=(host, asdict(config or FakeOzonConfig()), urls),
+        daemon=True,
+    )
+    process.start()
+    try:
+        yield urls.get(timeout=30)
+    finally:
+        process.terminate()
+        process.join()
@@ -1,11 +1,56 @@
-from typing import Any, Dict, List, Literal, Optional, Type, Union
-from aiohttp import ClientSession
-from loguru import logger
-
-import sys
-
-logger.remove()
-logger.add(sys.stderr, level="INFO")
+from __future__ import annotations
+
+from functools import partial
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from ozon_api.category import CategoryView
+from ozon_api.codec import JSONCodec, LazyJSON, get_codec
+from ozon_api.exceptions import CircuitOpenError, OzonAPIError
+from ozon_api.log import logger
+from ozon_api.metrics import MetricsSink, RequestSample, RetryStats, trace_config
+from ozon_api.pagination import prefetched
+from ozon_api.poller import StatusPoller
+from ozon_api.quota import QuotaKind, QuotaScheduler
+from ozon_api.ratelimit import FairLimiter, RateLimiter, parse_retry_after
+from ozon_api.retry import READ_ENDPOINTS, CircuitBreaker, RetryPolicy, default_policy
+from ozon_api.singleflight import SingleFlight
+from ozon_api.utils import chunked, gather_or_cancel
+
+import asyncio
+import time
+
+# aiohttp and pydantic are imported on first use, so that importing the package stays cheap.
+if TYPE_CHECKING:
+    from aiohttp import ClientSession, TCPConnector
+
+    from ozon_api.cache import SQLiteCache
+    from ozon_api.models import (
+        ImportBySku,
+        ImportBySku_Item,
+        ProductAttributesUpdate,
+        ProductAttributesUpdate_Item,
+        ProductImport,
+        ProductImport_Item,
+    )
+    from ozon_api.search import AttributeValueIndex, ValueMatch
+    from ozon_api.snapshot import AttributeSnapshot
+    from ozon_api.tree import CategoryTree
+    from ozon_api.validation import ImportValidator
 
 
 class OzonAPI:
@@ -20,6 +65,10 @@ class OzonAPI:
     __language is the language to be used in the requests.
     __type_id is the type ID to be used in the requests.
 
+    The instance owns a single pooled ClientSession which is created lazily on the
+    first request and reused by every endpoint method. Use the instance as an async
+    context manager or call close() explicitly to release the connections.
+
     """
 
     __client_id: str
@@ -30,6 +79,18 @@ class OzonAPI:
     __language: Literal["DEFAULT", "RU", "EN", "TR", "ZH_HANS"] = "DEFAULT"
     __type_id: Union[int, None] = None
 
+    __session: Union[ClientSession, None] = None
+    __session_loop: Union[asyncio.AbstractEventLoop, None] = None
+    __connector: Union[TCPConnector, None] = None
+    __connector_owner: bool = True
+    __rate_limiter: Union[RateLimiter, None] = None
+    __circuit_breaker: Union[CircuitBreaker, None] = None
+    __cache: Union[SQLiteCache, None] = None
+    __import_poller: Union[StatusPoller, None] = None
+    __pictures_poller: Union[StatusPoller, None] = None
+    __singleflight: Union[SingleFlight, None] = None
+    __quota: Union[QuotaScheduler, None] = None
+
     @property
     def api_url(self) -> str:
         """
@@ -111,6 +172,110 @@ class OzonAPI:
         """
         self.__type_id = value
 
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """The rate limiter pacing the requests of this client.
+
+        Returns:
+            RateLimiter: The rate limiter.
+        """
+        return self.__rate_limiter
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """The circuit breaker guarding the requests of this client.
+
+        Returns:
+            CircuitBreaker: The circuit breaker.
+        """
+        return self.__circuit_breaker
+
+    @property
+    def cache(self) -> Union[SQLiteCache, None]:
+        """The persistent cache of category metadata, if any.
+
+        Returns:
+            Union[SQLiteCache, None]: The cache.
+        """
+        return self.__cache
+
+    @property
+    def json_codec(self) -> JSONCodec:
+        """The JSON codec encoding request and decoding response bodies.
+
+        Returns:
+            JSONCodec: The codec.
+        """
+        return self.__codec
+
+    @property
+    def import_poller(self) -> StatusPoller:
+        """The poller shared by all product import tasks of this client, created on first use.
+
+        Its intervals, concurrency and timeout (30 minutes) may be adjusted through its
+        attributes.
+
+        Returns:
+            StatusPoller: The poller of product_import_info.
+        """
+        if self.__import_poller is None:
+            self.__import_poller = StatusPoller(
+                check=self._check_import_tasks,
+                is_done=_import_task_done,
+                progress=_import_task_progress,
+                concurrency=8,
+                min_interval=2.0,
+                timeout=30 * 60,
+            )
+        return self.__import_poller
+
+    @property
+    def pictures_poller(self) -> StatusPoller:
+        """The poller shared by all picture imports of this client, created on first use.
+
+        Up to 1000 products are checked with one product_pictures_info request.
+
+        Returns:
+            StatusPoller: The poller of product_pictures_info.
+        """
+        if self.__pictures_poller is None:
+            self.__pictures_poller = StatusPoller(
+                check=self._check_product_pictures,
+                is_done=_pictures_done,
+                batch_size=1000,
+                concurrency=2,
+                min_interval=2.0,
+                timeout=30 * 60,
+            )
+        return self.__pictures_poller
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """Retry, throttling and timing counters by endpoint.
+
+        Returns:
+            RetryStats: The counters.
+        """
+        return self.__retry_stats
+
+    @property
+    def metrics(self) -> Union[MetricsSink, None]:
+        """The sink of per-attempt request metrics, None when instrumentation is off.
+
+        Returns:
+            Union[MetricsSink, None]: The sink.
+        """
+        return self.__metrics
+
+    @property
+    def quota(self) -> Union[QuotaScheduler, None]:
+        """The scheduler keeping product imports and updates within the daily quotas, if any.
+
+        Returns:
+            Union[QuotaScheduler, None]: The scheduler.
+        """
+        return self.__quota
+
     @property
     def client_id(self) -> str:
         """The client ID to be used in the requests.
@@ -147,25 +312,159 @@ class OzonAPI:
         """
         self.__api_key = value
 
-    def __init__(self: Type["OzonAPI"], client_id: str, api_key: str) -> None:
+    def __init__(
+        self: Type["OzonAPI"],
+        client_id: str,
+        api_key: str,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        ttl_dns_cache: Optional[int] = 300,
+        connector: Optional[TCPConnector] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        cache: Optional[SQLiteCache] = None,
+        json_codec: Union[str, JSONCodec] = "auto",
+        coalesce_reads: bool = False,
+        metrics: Optional[MetricsSink] = None,
+        fair_limiter: Optional[FairLimiter] = None,
+        quota: Optional[QuotaScheduler] = None,
+    ) -> None:
         """
         Initializes an instance of the OzonAPI class.
 
         Args:
             client_id (str): The client ID to be used in the requests.
             api_key (str): The API key to be used in the requests.
+            limit (int): Total number of simultaneous connections in the pool. Defaults to 100.
+            limit_per_host (int): Number of simultaneous connections to one host, 0 means no limit. Defaults to 0.
+            keepalive_timeout (float): Seconds an idle connection is kept open. Defaults to 30.0.
+            ttl_dns_cache (Optional[int]): Seconds to cache resolved DNS entries, None disables the cache. Defaults to 300.
+            connector (Optional[TCPConnector]): An external connector to share between several clients.
+                It is not closed by close(); the pool options above are ignored when it is given.
+            rate_limiter (Optional[RateLimiter]): Paces requests and handles HTTP 429. May be shared between
+                clients. Defaults to a RateLimiter with 50 requests per second for this instance.
+            retry_policies (Optional[Dict[str, RetryPolicy]]): Timeouts and retries by endpoint, e.g.
+                {"description-category/attribute/values": RetryPolicy(timeout=120)}. Endpoints not listed use
+                ozon_api.retry.READ_POLICY for reads and ozon_api.retry.WRITE_POLICY for writes.
+            circuit_breaker (Optional[CircuitBreaker]): Fails requests fast while the API is degraded.
+                Defaults to a CircuitBreaker with default settings for this instance.
+            cache (Optional[SQLiteCache]): Persistent cache of the category tree, attributes and
+                attribute dictionaries. Defaults to None (no caching).
+            json_codec (Union[str, JSONCodec]): The JSON library for request and response bodies:
+                "orjson", "msgspec", "json" or "auto" for the fastest installed one. Defaults to "auto".
+            coalesce_reads (bool): Send identical concurrent read requests (same endpoint, version and
+                body) only once and share the response between the callers. The shared response must
+                not be mutated. Defaults to False.
+            metrics (Optional[MetricsSink]): Receives the status, body sizes, latency and connection
+                phase timings of every HTTP attempt, e.g. ozon_api.metrics.InMemoryMetrics or
+                PrometheusExporter. Defaults to None (no instrumentation and no tracing hooks).
+            fair_limiter (Optional[FairLimiter]): Global in-flight and rate limits shared fairly with
+                the clients of other accounts, see ozon_api.pool.OzonAPIPool. Defaults to None.
+            quota (Optional[QuotaScheduler]): Holds back product imports and attribute updates that
+                exceed the daily quotas of product/info/limit until they are reset. Must not be shared
+                with the client of another account. Defaults to None (requests are sent right away).
         """
         self.client_id = client_id
         self.api_key = api_key
 
+        self.__connector_options = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": ttl_dns_cache,
+            "use_dns_cache": ttl_dns_cache is not None,
+        }
+        self.__connector = connector
+        self.__connector_owner = connector is None
+        self.__rate_limiter = (
+            rate_limiter if rate_limiter is not None else RateLimiter()
+        )
+        self.__retry_policies = {
+            endpoint.strip("/"): policy
+            for endpoint, policy in (retry_policies or {}).items()
+        }
+        self.__circuit_breaker = (
+            circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        )
+        self.__retry_stats = RetryStats()
+        self.__cache = cache
+        self.__codec = get_codec(json_codec)
+        self.__singleflight = SingleFlight() if coalesce_reads else None
+        self.__metrics = metrics
+        self.__fair_limiter = fair_limiter
+        self.__quota = quota
+        if quota is not None and quota.fetch is None:
+            quota.fetch = self.product_info_limit
+
         logger.info("Ozon API initialized successfully.")
 
+    async def __aenter__(self: Type["OzonAPI"]) -> "OzonAPI":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self: Type["OzonAPI"], *exc_info: Any) -> None:
+        await self.close()
+
+    async def _get_session(self: Type["OzonAPI"]) -> ClientSession:
+        """
+        Returns the pooled session, creating it (and the connector) on first use.
+
+        A session is bound to the event loop it was created in, so a new one is created
+        when the client is used from another loop, e.g. by consecutive asyncio.run() calls.
+
+        Returns:
+            ClientSession: The session shared by all requests of this instance.
+        """
+        from aiohttp import ClientSession, TCPConnector
+
+        loop = asyncio.get_running_loop()
+        if self.__session is not None and self.__session_loop is not loop:
+            # The previous loop is gone together with its transports, nothing to await.
+            self.__session.detach()
+            self.__session = None
+            if self.__connector_owner:
+                self.__connector = None
+
+        if self.__session is None or self.__session.closed:
+            if self.__connector is None or self.__connector.closed:
+                self.__connector = TCPConnector(**self.__connector_options)
+                self.__connector_owner = True
+            self.__session = ClientSession(
+                connector=self.__connector,
+                connector_owner=self.__connector_owner,
+                trace_configs=[trace_config()] if self.__metrics is not None else None,
+            )
+            self.__session_loop = loop
+
+        return self.__session
+
+    async def close(self: Type["OzonAPI"]) -> None:
+        """
+        Closes the pooled session. The connector is closed too unless it was passed in
+        from outside. The client can still be used afterwards, a new session is created
+        on the next request.
+        """
+        for poller in (self.__import_poller, self.__pictures_poller):
+            if poller is not None:
+                await poller.close()
+
+        session, self.__session = self.__session, None
+        self.__session_loop = None
+        if session is not None and not session.closed:
+            await session.close()
+        if self.__connector_owner:
+            self.__connector = None
+
     async def _request(
         self: Type["OzonAPI"],
         method: Literal["post", "get", "put", "delete"] = "post",
         api_version: str = "v1",
         endpoint: str = "",
         json: Optional[dict[str, Any]] = None,
+        data: Optional[bytes] = None,
+        decode: Literal["json", "lazy", "raw"] = "json",
     ) -> dict[str, Any]:
         """
         Helper method for making API requests.
@@ -176,26 +475,227 @@ class OzonAPI:
         api_version (str): The API version to be used. Defaults to "v1".
         endpoint (str): The API endpoint to be called. Defaults to an empty string.
         json (Optional[dict[str, Any]]): Optional JSON payload to be sent with the request. Defaults to None.
+        data (Optional[bytes]): An already encoded JSON payload, sent instead of `json`. Defaults to None.
+        decode (str): "json" decodes the response with the client's codec, "lazy" returns a LazyJSON
+            decoded on first access, "raw" returns the body bytes. Defaults to "json".
+
+        With coalesce_reads enabled, identical concurrent requests to read endpoints are sent
+        once and every caller receives the same response object.
+
+        Requests are paced by the rate limiter. A request rejected with HTTP 429 slows the
+        limiter down for the Retry-After period and is sent again, up to
+        RateLimiter.max_retries times. Timeouts, 5xx statuses and connection errors are
+        retried with jittered exponential backoff according to the endpoint's RetryPolicy.
 
         Returns:
         Dict[str, Any]: The JSON response from the API.
+
+        Raises:
+        CircuitOpenError: The circuit breaker is open, the request was not sent.
+        OzonAPIError: A retryable status persisted after the last attempt.
+        """
+        if data is None and json is not None:
+            data = self.__codec.dumps(json)
+
+        if self.__singleflight is not None and endpoint.strip("/") in READ_ENDPOINTS:
+            return await self.__singleflight.do(
+                (method, api_version, endpoint, data, decode),
+                partial(self._send, method, api_version, endpoint, data, decode),
+            )
+        return await self._send(method, api_version, endpoint, data, decode)
+
+    async def _send(
+        self: Type["OzonAPI"],
+        method: Literal["post", "get", "put", "delete"],
+        api_version: str,
+        endpoint: str,
+        data: Optional[bytes],
+        decode: Literal["json", "lazy", "raw"],
+    ) -> Any:
+        """
+        Sends an encoded request through the rate limiter, retries and circuit breaker of _request.
         """
+        from aiohttp import ClientConnectionError, ClientPayloadError, ClientTimeout
+
         url = f"{self.__api_url}/{api_version}/{endpoint}"
-        async with ClientSession(
-            headers={
-                "Client-Id": self.__client_id,
-                "Api-Key": self.__api_key,
-            }
-        ) as session:
-            async with getattr(session, method.lower())(url, json=json) as response:
-                return await response.json()
+        session = await self._get_session()
+        headers = {
+            "Client-Id": self.__client_id,
+            "Api-Key": self.__api_key,
+        }
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+        bucket = self.__rate_limiter.bucket(self.__client_id, endpoint)
+        policy = self.__retry_policies.get(endpoint.strip("/")) or default_policy(
+            endpoint
+        )
+        timeout = ClientTimeout(total=policy.timeout)
+        breaker = self.__circuit_breaker
+        fair_limiter = self.__fair_limiter
+        sink = self.__metrics
+        sample = None
+        stats = self.__retry_stats.endpoint(endpoint)
+        stats.requests += 1
+        started = time.monotonic()
+
+        attempt = throttled = 0
+        try:
+            while True:
+                try:
+                    breaker.before_request(endpoint)
+                except CircuitOpenError:
+                    stats.rejected += 1
+                    raise
+
+                await bucket.acquire()
+                if fair_limiter is not None:
+                    await fair_limiter.acquire(self.__client_id)
+                attempt += 1
+                stats.attempts += 1
+                if sink is not None:
+                    sample = RequestSample(
+                        endpoint,
+                        bytes_sent=len(data) if data else 0,
+                        started=time.perf_counter(),
+                    )
+                try:
+                    async with session.request(
+                        method.upper(),
+                        url,
+                        data=data,
+                        headers=headers,
+                        timeout=timeout,
+                        trace_request_ctx=sample,
+                    ) as response:
+                        status = response.status
+                        if sample is not None:
+                            sample.status = status
+                        if (
+                            status == 429
+                            and throttled < self.__rate_limiter.max_retries
+                        ):
+                            throttled += 1
+                            stats.throttled += 1
+                            attempt -= 1
+                            retry_after = parse_retry_after(
+                                response.headers.get("Retry-After")
+                            )
+                            bucket.throttle(retry_after)
+                            logger.debug(
+                                "Rate limited on {}, retry {} after {}s",
+                                endpoint,
+                                throttled,
+                                retry_after,
+                            )
+                            continue
+
+                        if status < 500:
+                            breaker.record_success()
+                        else:
+                            breaker.record_failure()
+
+                        if (
+                            status in policy.retry_statuses
+                            and attempt < policy.max_attempts
+                        ):
+                            reason = f"HTTP {status}"
+                        elif status >= 500:
+                            raise OzonAPIError(
+                                f"{endpoint} failed with HTTP {status} after {attempt} attempts",
+                                endpoint,
+                                status,
+                                await response.text(),
+                            )
+                        else:
+                            body = await response.read()
+                            bucket.recover()
+                            return self._decode(body, decode)
+                except (
+                    ClientConnectionError,
+                    ClientPayloadError,
+                    asyncio.TimeoutError,
+                ) as error:
+                    breaker.record_failure()
+                    if sample is not None:
+                        sample.error = type(error).__name__
+                    if attempt >= policy.max_attempts or not policy.should_retry_error(
+                        error
+                    ):
+                        raise
+                    reason = repr(error)
+                finally:
+                    if fair_limiter is not None:
+                        fair_limiter.release(self.__client_id)
+                    if sample is not None:
+                        sink.observe(sample.finish())
+
+                delay = policy.backoff(attempt)
+                stats.retries += 1
+                stats.retry_wait += delay
+                logger.debug(
+                    "Retrying {} after {}, attempt {} in {:.2f}s",
+                    endpoint,
+                    reason,
+                    attempt + 1,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+        except Exception:
+            stats.failures += 1
+            raise
+        finally:
+            stats.elapsed += time.monotonic() - started
+
+    def _decode(
+        self: Type["OzonAPI"], body: bytes, decode: Literal["json", "lazy", "raw"]
+    ) -> Any:
+        if decode == "raw":
+            return body
+        if decode == "lazy":
+            return LazyJSON(body, self.__codec.loads)
+        return self.__codec.loads(body) if body else None
+
+    async def request(
+        self: Type["OzonAPI"],
+        endpoint: str,
+        json: Optional[Any] = None,
+        api_version: str = "v1",
+        method: Literal["post", "get", "put", "delete"] = "post",
+        decode: Literal["json", "lazy", "raw"] = "json",
+    ) -> Any:
+        """
+        Calls any endpoint of the Ozon API through the client's session, rate limiter and retries.
+
+        Usage:
+            raw = await api.request("description-category/attribute/values", body, decode="raw")
+
+        Args:
+        endpoint (str): The endpoint path without the version, e.g. "product/list".
+        json (Optional[Any]): The JSON payload. Defaults to None.
+        api_version (str): The API version. Defaults to "v1".
+        method (str): The HTTP method. Defaults to "post".
+        decode (str): "json" for the decoded response, "lazy" for a LazyJSON that is decoded
+            on first access, "raw" for the undecoded bytes. Defaults to "json".
+
+        Returns:
+        Any: The response in the requested form.
+        """
+        return await self._request(
+            method=method,
+            api_version=api_version,
+            endpoint=endpoint,
+            json=json,
+            decode=decode,
+        )
 
     #############################
     # Атрибуты и характеристики #
     # Attributes and properties #
     #############################
 
-    async def get_description_category_tree(self: Type["OzonAPI"]) -> dict[str, Any]:
+    async def get_description_category_tree(
+        self: Type["OzonAPI"], refresh: bool = False
+    ) -> dict[str, Any]:
         """
         Method: https://api-seller.ozon.ru/v1/description-category/tree
         Documentation: https://docs.ozon.ru/api/seller/#operation/DescriptionCategoryAPI_GetTree
@@ -205,18 +705,118 @@ class OzonAPI:
         This method makes a POST request to the Ozon API endpoint for retrieving the description category tree.
         The request is authenticated using the Client-Id and Api-Key provided in the class headers.
 
+        Args:
+            refresh (bool): Ignore the cached tree and download it again. Defaults to False.
+
         Returns:
             dict[str, Any]: The JSON response from the API. The response contains the description category tree.
         """
+        if self.__cache is not None:
+            # Loaded already: whoever created the cache imported the module.
+            from ozon_api.cache import cache_key
+
+            key = cache_key("description-category/tree")
+            if not refresh:
+                cached = await self.__cache.aget(key)
+                if cached is not None:
+                    return cached
+
         response = await self._request(
             method="post",
             api_version="v1",
             endpoint="description-category/tree",
         )
+        if self.__cache is not None and "result" in response:
+            await self.__cache.aset(key, response)
         return response
 
+    async def get_category_tree(
+        self: Type["OzonAPI"], refresh: bool = False
+    ) -> CategoryTree:
+        """
+
+        Custom method, based on:
+            https://api-seller.ozon.ru/v1/description-category/tree
+
+        Returns the description category tree as an indexed CategoryTree, with lookups by
+        description_category_id and type_id, paths, leaves and name search.
+
+        Args:
+            refresh (bool): Ignore the cached tree and download it again. Defaults to False.
+
+        Returns:
+            CategoryTree: The tree, see ozon_api.tree.
+
+        Raises:
+            OzonAPIError: The response has no tree.
+        """
+        from ozon_api.tree import CategoryTree
+
+        response = await self.get_description_category_tree(refresh=refresh)
+        if "result" not in response:
+            raise OzonAPIError(
+                f"description-category/tree failed: {response}",
+                "description-category/tree",
+                body=response,
+            )
+        return CategoryTree.from_response(response)
+
+    def _category_params(
+        self: Type["OzonAPI"],
+        description_category_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Resolves per-call category parameters, falling back to the instance attributes.
+
+        Returns:
+            Dict[str, Any]: description_category_id, type_id and language for the request body.
+        """
+        return {
+            "description_category_id": (
+                description_category_id
+                if description_category_id is not None
+                else self.__description_category_id
+            ),
+            "type_id": type_id if type_id is not None else self.__type_id,
+            "language": language if language is not None else self.__language,
+        }
+
+    def category(
+        self: Type["OzonAPI"],
+        description_category_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> CategoryView:
+        """
+        Returns an immutable view of one category that shares this client's session.
+
+        The parameters that are not given are taken from the instance attributes once, now;
+        later changes of the attributes do not affect the view.
+
+        Usage:
+            views = [api.category(dcid, type_id) for dcid, type_id in pairs]
+            attributes = await asyncio.gather(*(view.attributes() for view in views))
+
+        Args:
+        description_category_id (int, optional): The category ID. Defaults to the instance attribute.
+        type_id (int, optional): The type ID. Defaults to the instance attribute.
+        language (str, optional): The response language. Defaults to the instance attribute.
+
+        Returns:
+        CategoryView: The view.
+        """
+        return CategoryView(
+            self, **self._category_params(description_category_id, type_id, language)
+        )
+
     async def get_description_category_attribute(
         self: Type["OzonAPI"],
+        description_category_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        language: Optional[str] = None,
+        refresh: bool = False,
     ) -> dict[str, Any]:
         """
         Method: https://api-seller.ozon.ru/v1/description-category/attribute
@@ -225,21 +825,33 @@ class OzonAPI:
         Retrieves the description category attributes from the Ozon API.
 
         Args:
-        type_id (int, optional): The type ID to be used in the request. Defaults to 94765.
+        description_category_id (int, optional): The category ID. Defaults to the instance attribute.
+        type_id (int, optional): The type ID. Defaults to the instance attribute.
+        language (str, optional): The response language. Defaults to the instance attribute.
+        refresh (bool): Ignore the cached attributes and download them again. Defaults to False.
 
         Returns:
         dict[str, Any]: The JSON response from the API. The response contains the description category attributes.
         """
-        return await self._request(
+        category = self._category_params(description_category_id, type_id, language)
+        if self.__cache is not None:
+            from ozon_api.cache import cache_key
+
+            key = cache_key("description-category/attribute", *category.values())
+            if not refresh:
+                cached = await self.__cache.aget(key)
+                if cached is not None:
+                    return cached
+
+        response = await self._request(
             method="post",
             api_version="v1",
             endpoint="description-category/attribute",
-            json={
-                "description_category_id": self.__description_category_id,
-                "type_id": self.__type_id,
-                "language": self.__language,
-            },
+            json=category,
         )
+        if self.__cache is not None and "result" in response:
+            await self.__cache.aset(key, response)
+        return response
 
     async def get_description_category_attribute_values(
         self: Type["OzonAPI"],
@@ -247,6 +859,10 @@ class OzonAPI:
         attribute_id: int = 0,
         last_value_id: int = 0,
         limit: int = 5000,
+        description_category_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        language: Optional[str] = None,
+        refresh: bool = False,
     ) -> List[Dict[str, Any]]:
         """
 
@@ -257,50 +873,209 @@ class OzonAPI:
 
         Parameters:
         self (class): The class instance calling this method. In this case, it should be `OzonAPI`.
-        type_id (int): The type ID to be used in the request. Defaults to 94765.
+        name (str): The attribute name, used for logging only.
         attribute_id (int): The attribute ID to be used in the request. Defaults to 0.
         last_value_id (int): The last value ID to be used in the request. Defaults to 0.
         limit (int): The limit of the number of records to be retrieved. Defaults to 5000.
+        description_category_id (int, optional): The category ID. Defaults to the instance attribute.
+        type_id (int, optional): The type ID. Defaults to the instance attribute.
+        language (str, optional): The response language. Defaults to the instance attribute.
+        refresh (bool): With a cache, download only the values added after the cached
+            last_value_id instead of returning the cached dictionary. Defaults to False.
 
         Returns:
         List[Dict[str, Any]]: The JSON response from the API. The response contains the description category attribute values.
         """
+        category = self._category_params(description_category_id, type_id, language)
+        fetch = partial(
+            self._fetch_attribute_values,
+            name,
+            attribute_id,
+            last_value_id,
+            limit,
+            category,
+            refresh,
+        )
+        if self.__singleflight is not None:
+            # The whole dictionary is shared, not only the single pages: concurrent callers
+            # drift apart while paging and would request later pages twice otherwise.
+            return await self.__singleflight.do(
+                (
+                    "description-category/attribute/values",
+                    *category.values(),
+                    attribute_id,
+                    last_value_id,
+                    limit,
+                    refresh,
+                ),
+                fetch,
+            )
+        return await fetch()
 
+    async def _fetch_attribute_values(
+        self: Type["OzonAPI"],
+        name: str,
+        attribute_id: int,
+        last_value_id: int,
+        limit: int,
+        category: Dict[str, Any],
+        refresh: bool,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Collects a whole attribute dictionary, going through the cache when there is one.
+        """
         result: List[Dict[str, Any]] = []
-        while True:
+        key = None
+        if self.__cache is not None and last_value_id == 0:
+            from ozon_api.cache import cache_key
+
+            key = cache_key(
+                "description-category/attribute/values",
+                category["description_category_id"],
+                category["type_id"],
+                category["language"],
+                attribute_id,
+            )
+            if refresh:
+                entry = await self.__cache.aget_entry(key)
+                if entry is not None:
+                    result = entry[0]["result"]
+                    last_value_id = entry[0]["last_value_id"]
+            else:
+                cached = await self.__cache.aget(key)
+                if cached is not None:
+                    return {"result": cached["result"]}
+
+        complete = True
+        pages = self._attribute_value_pages(
+            name, attribute_id, last_value_id, limit, category
+        )
+        async for data in prefetched(pages):
+            if "result" not in data:
+                complete = False
+            result.extend(data.get("result", []))
+
+        if result:
+            last_value_id = result[-1]["id"]
 
+        if key is not None and complete:
+            await self.__cache.aset(
+                key, {"result": result, "last_value_id": last_value_id}
+            )
+
+        return {"result": result}
+
+    async def iter_description_category_attribute_values(
+        self: Type["OzonAPI"],
+        attribute_id: int,
+        last_value_id: int = 0,
+        limit: int = 5000,
+        pages: bool = False,
+        prefetch: int = 1,
+        description_category_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        language: Optional[str] = None,
+        name: str = "",
+        strict: bool = False,
+    ) -> AsyncIterator[Any]:
+        """
+
+        Method: https://api-seller.ozon.ru/v1/description-category/attribute/values
+        Documentation: https://docs.ozon.ru/api/seller/#operation/DescriptionCategoryAPI_GetAttributeValues
+
+        Streams the description category attribute values page by page.
+
+        The next page is requested while the caller processes the current one, and at most
+        `prefetch` pages are buffered, so huge dictionaries never have to fit in memory.
+
+        Usage:
+            async for value in api.iter_description_category_attribute_values(attribute_id=85):
+                ...
+
+        Args:
+        attribute_id (int): The attribute ID to be used in the request.
+        last_value_id (int): The value ID to start after. Defaults to 0.
+        limit (int): The page size, at most 5000. Defaults to 5000.
+        pages (bool): Yield whole pages (lists of values) instead of single values. Defaults to False.
+        prefetch (int): Number of pages to request ahead, 0 disables prefetching. Defaults to 1.
+        description_category_id (int, optional): The category ID. Defaults to the instance attribute.
+        type_id (int, optional): The type ID. Defaults to the instance attribute.
+        language (str, optional): The response language. Defaults to the instance attribute.
+        name (str): The attribute name, used for logging only.
+        strict (bool): Raise OzonAPIError when a page request fails, instead of ending the stream
+            as if the dictionary was complete. Defaults to False.
+
+        Yields:
+        Dict[str, Any] | List[Dict[str, Any]]: Attribute values, or pages of them when `pages` is True.
+
+        Raises:
+        OzonAPIError: With `strict`, a page was answered without a result.
+        """
+        category = self._category_params(description_category_id, type_id, language)
+        source = self._attribute_value_pages(
+            name, attribute_id, last_value_id, limit, category
+        )
+        async for data in prefetched(source, prefetch):
+            if strict and "result" not in data:
+                raise OzonAPIError(
+                    f"description-category/attribute/values failed: {data}",
+                    "description-category/attribute/values",
+                    body=data,
+                )
+            values = data.get("result", [])
+            if pages:
+                if values:
+                    yield values
+            else:
+                for value in values:
+                    yield value
+
+    async def _attribute_value_pages(
+        self: Type["OzonAPI"],
+        name: str,
+        attribute_id: int,
+        last_value_id: int,
+        limit: int,
+        category: Dict[str, Any],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the raw responses of description-category/attribute/values, following last_value_id.
+        """
+        while True:
             data = await self._request(
                 method="post",
                 api_version="v1",
                 endpoint="description-category/attribute/values",
                 json={
                     "attribute_id": attribute_id,
-                    "description_category_id": self.__description_category_id,
-                    "language": self.__language,
                     "last_value_id": last_value_id,
                     "limit": limit,
-                    "type_id": self.__type_id,
+                    **category,
                 },
             )
 
-            try:
-                result.extend(data.get("result", []))
-                last_value_id = data["result"][-1]["id"]
-            except Exception as e:
+            values = data.get("result") or []
+            if values:
+                last_value_id = values[-1]["id"]
+            else:
                 logger.debug(
-                    f"Error getting attribute values for {name}: dictionary not found"
+                    "Error getting attribute values for {}: dictionary not found",
+                    name or attribute_id,
                 )
 
-            if not data.get("has_next"):
-                break
+            yield data
 
-        return {"result": result}
+            if not data.get("has_next") or not values:
+                break
 
     async def get_description_category_attribute_values_search(
         self: Type["OzonAPI"],
         attribute_id: int,
         value: str,
         limit: int = 100,
+        description_category_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        language: Optional[str] = None,
     ):
         """
 
@@ -311,9 +1086,11 @@ class OzonAPI:
 
         Args:
         attribute_id (int): The attribute ID to be used in the request.
-        type_id (int): The type ID to be used in the request.
         value (str): The search query.
         limit (int, optional): The limit of the number of records to be retrieved. Defaults to 100.
+        description_category_id (int, optional): The category ID. Defaults to the instance attribute.
+        type_id (int, optional): The type ID. Defaults to the instance attribute.
+        language (str, optional): The response language. Defaults to the instance attribute.
 
         Returns:
         List[Dict[str, Any]]: The JSON response from the API. The response contains the description category attribute values.
@@ -324,15 +1101,113 @@ class OzonAPI:
             endpoint="description-category/attribute/values/search",
             json={
                 "attribute_id": attribute_id,
-                "description_category_id": self.__description_category_id,
-                "language": self.__language,
                 "limit": limit,
-                "type_id": self.type_id,
                 "value": value,
+                **self._category_params(description_category_id, type_id, language),
             },
         )
 
-    async def get_full_category_info(self: Type["OzonAPI"]) -> List[Dict[str, Any]]:
+    async def get_attribute_value_index(
+        self: Type["OzonAPI"],
+        attribute_id: int,
+        description_category_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        language: Optional[str] = None,
+        name: str = "",
+        refresh: bool = False,
+    ) -> AttributeValueIndex:
+        """
+
+        Custom method, based on:
+            https://api-seller.ozon.ru/v1/description-category/attribute/values
+
+        Loads a whole attribute dictionary (through the cache when there is one) into a local
+        search index with exact, case-folded, prefix and fuzzy matching.
+
+        Args:
+        attribute_id (int): The attribute ID.
+        description_category_id (int, optional): The category ID. Defaults to the instance attribute.
+        type_id (int, optional): The type ID. Defaults to the instance attribute.
+        language (str, optional): The language. Defaults to the instance attribute.
+        name (str): The attribute name, used for logging only.
+        refresh (bool): Download the values added since the cached dictionary. Defaults to False.
+
+        Returns:
+        AttributeValueIndex: The index, see ozon_api.search.
+        """
+        from ozon_api.search import AttributeValueIndex
+
+        category = self._category_params(description_category_id, type_id, language)
+        response = await self.get_description_category_attribute_values(
+            name, attribute_id=attribute_id, refresh=refresh, **category
+        )
+        return AttributeValueIndex(
+            response.get("result") or [], attribute_id=attribute_id, **category
+        )
+
+    async def resolve_attribute_values(
+        self: Type["OzonAPI"],
+        index: AttributeValueIndex,
+        texts: Iterable[str],
+        threshold: Optional[float] = 0.7,
+        remote: bool = True,
+        concurrency: int = 8,
+    ) -> Dict[str, Optional[ValueMatch]]:
+        """
+
+        Custom method, based on:
+            https://api-seller.ozon.ru/v1/description-category/attribute/values/search
+
+        Maps many texts to dictionary values: every distinct text is matched in the local index
+        first, and only the misses are searched with the values/search endpoint. The values found
+        remotely are added to the index, so the same miss is not searched twice.
+
+        Usage:
+            brands = await api.get_attribute_value_index(85)
+            matches = await api.resolve_attribute_values(brands, [product["brand"] for product in products])
+
+        Args:
+        index (AttributeValueIndex): The dictionary, see get_attribute_value_index.
+        texts (Iterable[str]): The texts to map.
+        threshold (float, optional): The lowest fuzzy similarity, None for exact and case-folded
+            matches only. Defaults to 0.7.
+        remote (bool): Search the misses with the API. Defaults to True.
+        concurrency (int): Remote searches in flight. Defaults to 8.
+
+        Returns:
+        Dict[str, Optional[ValueMatch]]: The match of every text, None when there is none.
+        """
+        matches = index.resolve(texts, threshold)
+        misses = [
+            text for text, match in matches.items() if match is None and text.strip()
+        ]
+        if not remote or not misses:
+            return matches
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def search(text: str) -> None:
+            async with semaphore:
+                response = await self.get_description_category_attribute_values_search(
+                    index.attribute_id, text, **index.category
+                )
+            found = response.get("result") if isinstance(response, dict) else None
+            if found:
+                index.add(found)
+                match = index.match(text, threshold)
+                if match is not None:
+                    matches[text] = match._replace(method="remote")
+
+        await gather_or_cancel(search(text) for text in misses)
+        return matches
+
+    async def get_full_category_info(
+        self: Type["OzonAPI"],
+        concurrency: int = 10,
+        description_category_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """
 
         Custom method, based on:
@@ -342,50 +1217,213 @@ class OzonAPI:
 
         Get the full category info, including the description category attribute values.
 
+        The values of all attributes are fetched concurrently, at most `concurrency`
+        dictionaries at a time; the attributes keep the order returned by the API.
+
+        Args:
+            concurrency (int): Maximum number of dictionaries fetched at the same time, 1 fetches them
+                one by one. Defaults to 10.
+            description_category_id (int, optional): The category ID. Defaults to the instance attribute.
+            type_id (int, optional): The type ID. Defaults to the instance attribute.
+            language (str, optional): The response language. Defaults to the instance attribute.
+
         Returns:
             List[Dict[str, Any]]: The JSON response from the API. The response contains the description category attribute values.
         """
-        fields_response = await self.get_description_category_attribute()
-        fields = fields_response.get("result", [])
+        return await self._collect_category_info(
+            asyncio.Semaphore(concurrency),
+            **self._category_params(description_category_id, type_id, language),
+        )
 
-        category_info = []
+    async def get_full_categories_info(
+        self: Type["OzonAPI"],
+        categories: Iterable[Tuple[int, int]],
+        concurrency: int = 10,
+        language: Optional[str] = None,
+    ) -> Dict[Tuple[int, int], List[Dict[str, Any]]]:
+        """
 
-        for field in fields:
-            field_values = await self.get_description_category_attribute_values(
-                attribute_id=field["id"], name=field["name"]
+        Custom method, get_full_category_info for many categories in one call.
+
+        All requests of all categories share one limit of `concurrency` requests in flight.
+
+        Args:
+            categories (Iterable[Tuple[int, int]]): (description_category_id, type_id) pairs.
+            concurrency (int): Maximum number of requests in flight. Defaults to 10.
+            language (str, optional): The response language. Defaults to the instance attribute.
+
+        Returns:
+            Dict[Tuple[int, int], List[Dict[str, Any]]]: The full category info by
+            (description_category_id, type_id), in the order of `categories`.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        pairs = list(dict.fromkeys(categories))
+        results = await gather_or_cancel(
+            self._collect_category_info(
+                semaphore,
+                **self._category_params(description_category_id, type_id, language),
             )
+            for description_category_id, type_id in pairs
+        )
+        return dict(zip(pairs, results))
+
+    async def get_import_validator(
+        self: Type["OzonAPI"],
+        categories: Iterable[Tuple[int, int]],
+        concurrency: int = 10,
+        language: Optional[str] = None,
+        unchecked: Iterable[int] = (),
+    ) -> ImportValidator:
+        """
+
+        Custom method, based on get_full_categories_info.
+
+        Compiles the attributes and dictionaries of categories into an ImportValidator, which
+        checks product_import items locally, see ozon_api.validation.
+
+        Args:
+            categories (Iterable[Tuple[int, int]]): (description_category_id, type_id) pairs.
+            concurrency (int): Maximum number of requests in flight. Defaults to 10.
+            language (str, optional): The response language. Defaults to the instance attribute.
+            unchecked (Iterable[int]): Attributes whose dictionary values are not checked. Defaults to ().
+
+        Returns:
+            ImportValidator: The validator.
+        """
+        from ozon_api.validation import ImportValidator
+
+        info = await self.get_full_categories_info(categories, concurrency, language)
+        return ImportValidator.from_full_info(info, frozenset(unchecked))
+
+    async def _collect_category_info(
+        self: Type["OzonAPI"],
+        semaphore: asyncio.Semaphore,
+        description_category_id: Optional[int],
+        type_id: Optional[int],
+        language: str,
+    ) -> List[Dict[str, Any]]:
+        category = {
+            "description_category_id": description_category_id,
+            "type_id": type_id,
+            "language": language,
+        }
+        async with semaphore:
+            fields_response = await self.get_description_category_attribute(**category)
+        fields = fields_response.get("result", [])
+
+        async def field_info(field: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                field_values = await self.get_description_category_attribute_values(
+                    attribute_id=field["id"], name=field["name"], **category
+                )
 
-            category_field = {
+            return {
                 "id": field["id"],
                 "name": field["name"],
                 "description": field["description"],
                 "values": field_values,
                 "is_required": field["is_required"],
+                "is_collection": field.get("is_collection", False),
+                "type": field.get("type", ""),
+                "dictionary_id": field.get("dictionary_id", 0),
+                "max_value_count": field.get("max_value_count", 0),
             }
-            category_info.append(category_field)
 
-        return category_info
+        return await gather_or_cancel(field_info(field) for field in fields)
 
     #################################
     # Загрузка и обновление товаров #
     # Load and update products      #
     #################################
 
-    async def product_import(self: Type["OzonAPI"], items: List[dict]):
+    def _items_body(
+        self: Type["OzonAPI"], model: str, items: Any, trusted: bool
+    ) -> Dict[str, Any]:
+        """
+        Returns the _request keyword arguments for an {"items": [...]} body.
+
+        A dict is sent as it is. Lists of models or dicts and the wrapper models are
+        validated as one batch (unless trusted) and then encoded unchanged.
+        The item model is given by name and loaded only here, together with pydantic.
+        """
+        if isinstance(items, dict):
+            return {"json": items}
+        from ozon_api import models
+        from ozon_api.models.batch import items_payload
+
+        return {
+            "data": items_payload(
+                getattr(models, model), items, trusted, self.__codec.dumps
+            )
+        }
+
+    async def _items_request(
+        self: Type["OzonAPI"],
+        kind: QuotaKind,
+        model: str,
+        items: Any,
+        trusted: bool,
+        reserved: int = 0,
+        **request: Any,
+    ) -> Any:
+        """
+        Sends an {"items": [...]} request whose products count against a daily quota, see QuotaScheduler.
+
+        The items are validated first. Then the quota of the products is awaited, unless
+        `reserved` of them were taken already, and given back when the API does not accept
+        the request.
+        """
+        quota = self.__quota
+        count = reserved
+        try:
+            request.update(self._items_body(model, items, trusted))
+            if quota is None:
+                return await self._request(**request)
+            if not reserved:
+                await quota.acquire(kind, _items_count(items))
+                count = _items_count(items)
+            data = await self._request(**request)
+        except BaseException:
+            if quota is not None and count:
+                quota.release(kind, count)
+            raise
+        if isinstance(data, dict) and not (
+            data.get("task_id") or (data.get("result") or {}).get("task_id")
+        ):
+            quota.release(kind, count)
+        return data
+
+    async def product_import(
+        self: Type["OzonAPI"],
+        items: Union[ProductImport, List[Union[ProductImport_Item, dict]], dict],
+        trusted: bool = False,
+        quota_kind: QuotaKind = "create",
+    ):
         """
         Documentation: https://docs.ozon.ru/api/seller/#operation/ProductAPI_ImportProductsV3
 
         Imports products into the Ozon marketplace.
 
         Args:
-        products (List[dict]): A list of product dictionaries, each containing the product details.
+        items (ProductImport | List[ProductImport_Item | dict] | dict): The products. A list or a ProductImport
+            is validated as one batch and sent as {"items": [...]}; a dict is sent as the request body unchanged.
         Max length is 100 items
+        trusted (bool): Skip validation of the items, e.g. when they were validated before. Defaults to False.
+        quota_kind (QuotaKind): The daily quota the items count against when the client has a quota
+            scheduler: "create" for new products, "update" for changes of existing ones. Defaults to "create".
+
+        Raises:
+        pydantic.ValidationError: Some items do not match ProductImport_Item.
+        QuotaExceededError: The items can never fit the quota.
         """
-        data = await self._request(
+        data = await self._items_request(
+            quota_kind,
+            "ProductImport_Item",
+            items,
+            trusted,
             method="post",
             api_version="v3",
             endpoint="product/import",
-            json=items,
         )
 
         return data
@@ -411,47 +1449,404 @@ class OzonAPI:
 
         return data
 
+    async def product_import_bulk(
+        self: Type["OzonAPI"],
+        items: Union[
+            Iterable[Union[ProductImport_Item, dict]],
+            AsyncIterable[Union[ProductImport_Item, dict]],
+        ],
+        chunk_size: int = 100,
+        concurrency: int = 4,
+        trusted: bool = False,
+        quota_kind: QuotaKind = "create",
+        validator: Optional[ImportValidator] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+
+        Custom method, based on:
+            https://api-seller.ozon.ru/v3/product/import
+            https://api-seller.ozon.ru/v1/product/import/info
+
+        Imports any number of products and streams the per-item results as the import tasks finish.
+
+        The items are read lazily and split into chunks of `chunk_size` (the API accepts at most
+        100 per request). Up to `concurrency` chunks are submitted at the same time; every
+        resulting task is tracked by the shared import_poller until none of its items is pending.
+
+        With a quota scheduler, a chunk larger than what is left of the daily quota is split: the
+        part that fits is sent right away and the rest waits for the reset.
+
+        Usage:
+            async for result in api.product_import_bulk(items):
+                if result["status"] != "imported":
+                    ...
+
+        Args:
+        items (Iterable | AsyncIterable): ProductImport_Item models or product dictionaries, see product_import.
+        chunk_size (int): Items per product_import request, at most 100. Defaults to 100.
+        concurrency (int): Maximum number of chunks being submitted at the same time. Defaults to 4.
+        trusted (bool): Skip validation of the items. Defaults to False.
+        quota_kind (QuotaKind): The daily quota the items count against, see product_import. Defaults to "create".
+        validator (ImportValidator, optional): Checks the items against their categories first; the items
+            it rejects are not sent and use no quota. Defaults to None.
+
+        Yields:
+        Dict[str, Any]: An item of the product_import_info result (offer_id, product_id, status, errors)
+        with the task_id added. When a chunk is rejected, each of its items is reported with status
+        "failed", task_id None and the API response in errors. When the status of a task can not be
+        read, its items are reported with status "failed" (or "timeout" after import_poller.timeout)
+        and their task_id. An item rejected by the validator is reported with status "invalid",
+        task_id None and ItemError dictionaries in errors.
+
+        Raises:
+        pydantic.ValidationError: Some items of a chunk do not match ProductImport_Item.
+        QuotaExceededError: The remaining items can never fit the quota.
+        """
+        quota = self.__quota
+        results: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(concurrency)
+        running: set = set()
+        done = object()
+
+        def fail(
+            chunk: List[Union[ProductImport_Item, dict]],
+            status: str,
+            errors: List[Any],
+            task_id: Optional[int],
+        ) -> None:
+            for item in chunk:
+                results.put_nowait(
+                    {
+                        "offer_id": (
+                            item.get("offer_id")
+                            if isinstance(item, dict)
+                            else item.offer_id
+                        ),
+                        "product_id": 0,
+                        "status": status,
+                        "errors": errors,
+                        "task_id": task_id,
+                    }
+                )
+
+        async def submit(
+            chunk: List[Union[ProductImport_Item, dict]], reserved: int
+        ) -> None:
+            try:
+                try:
+                    response = await self._items_request(
+                        quota_kind,
+                        "ProductImport_Item",
+                        chunk,
+                        trusted,
+                        reserved=reserved,
+                        method="post",
+                        api_version="v3",
+                        endpoint="product/import",
+                    )
+                finally:
+                    semaphore.release()
+
+                task_id = (response.get("result") or {}).get("task_id")
+                if not task_id:
+                    fail(chunk, "failed", [response], None)
+                    return
+
+                try:
+                    info = await self.wait_import_task(task_id)
+                except OzonAPIError as error:
+                    fail(chunk, "failed", [error.body or str(error)], task_id)
+                    return
+                except asyncio.TimeoutError as error:
+                    fail(chunk, "timeout", [str(error)], task_id)
+                    return
+                for item in info["items"]:
+                    results.put_nowait({**item, "task_id": task_id})
+            except Exception as error:
+                # Stops the whole pipeline right away instead of after the input is read.
+                results.put_nowait((done, error))
+
+        async def feed() -> None:
+            # The position of the next chunk in `items`, so that ItemError.index points at
+            # the caller's item and not at its place in the chunk.
+            offset = 0
+            try:
+                async for chunk in chunked(items, chunk_size):
+                    if validator is not None:
+                        start, offset = offset, offset + len(chunk)
+                        chunk, invalid = validator.split(chunk, start=start)
+                        for errors in invalid.values():
+                            results.put_nowait(
+                                {
+                                    "offer_id": errors[0].offer_id,
+                                    "product_id": 0,
+                                    "status": "invalid",
+                                    "errors": [error.to_dict() for error in errors],
+                                    "task_id": None,
+                                }
+                            )
+                    while chunk:
+                        # Acquired here and released once the chunk is submitted, so the
+                        # source is only read as fast as chunks can be sent.
+                        await semaphore.acquire()
+                        reserved = 0
+                        if quota is not None:
+                            try:
+                                reserved = await quota.take(
+                                    quota_kind, len(chunk), partial=True
+                                )
+                            except BaseException:
+                                semaphore.release()
+                                raise
+                        size = reserved or len(chunk)
+                        part, chunk = chunk[:size], chunk[size:]
+                        task = asyncio.ensure_future(submit(part, reserved))
+                        running.add(task)
+                        task.add_done_callback(running.discard)
+                while running:
+                    await asyncio.gather(*running)
+            except Exception as error:
+                results.put_nowait((done, error))
+            else:
+                results.put_nowait((done, None))
+
+        feeder = asyncio.ensure_future(feed())
+        try:
+            while True:
+                result = await results.get()
+                if isinstance(result, tuple) and result[0] is done:
+                    if result[1] is not None:
+                        raise result[1]
+                    return
+                yield result
+        finally:
+            for task in (feeder, *running):
+                task.cancel()
+            await asyncio.gather(feeder, *running, return_exceptions=True)
+
+    async def wait_import_task(self: Type["OzonAPI"], task_id: int) -> Dict[str, Any]:
+        """
+
+        Custom method, based on:
+            https://api-seller.ozon.ru/v1/product/import/info
+
+        Waits until none of the items of an import task is pending. The task is polled by the
+        shared import_poller together with all other tasks, with adaptive intervals.
+
+        Args:
+        task_id (int): The ID of the product import task.
+
+        Returns:
+        Dict[str, Any]: The "result" of the final product_import_info response (items, total).
+
+        Raises:
+        OzonAPIError: product_import_info answered without a result, e.g. for an unknown task.
+        asyncio.TimeoutError: The task is not finished within import_poller.timeout.
+        """
+        return await self.import_poller.wait(task_id)
+
+    async def _check_import_tasks(
+        self: Type["OzonAPI"], task_ids: List[int]
+    ) -> Dict[int, Union[Dict[str, Any], OzonAPIError]]:
+        statuses = await gather_or_cancel(
+            self.product_import_info(task_id) for task_id in task_ids
+        )
+        # A response without a result (e.g. an unknown task) will not change by polling
+        # again, its waiters get the error instead of waiting for the timeout.
+        return {
+            task_id: (
+                response["result"]
+                if response.get("result")
+                else OzonAPIError(
+                    f"product/import/info failed: {response}",
+                    "product/import/info",
+                    body=response,
+                )
+            )
+            for task_id, response in zip(task_ids, statuses)
+        }
+
     async def product_import_by_sku(
-        self: Type["OzonAPI"], items: dict
+        self: Type["OzonAPI"],
+        items: Union[ImportBySku, List[Union[ImportBySku_Item, dict]], dict],
+        trusted: bool = False,
     ) -> dict[str, Any]:
         """
         Documentation: https://docs.ozon.ru/api/seller/#operation/ProductAPI_ImportProductsBySKU
 
         Imports products by SKU into the Ozon marketplace.
 
+        Args:
+        items (ImportBySku | List[ImportBySku_Item | dict] | dict): The products, see product_import.
+        trusted (bool): Skip validation of the items. Defaults to False.
+
         Returns:
         dict[str, Any]: The JSON response from the API. The response contains the import task status.
         """
 
-        data = await self._request(
+        data = await self._items_request(
+            "create",
+            "ImportBySku_Item",
+            items,
+            trusted,
             method="post",
             api_version="v1",
             endpoint="product/import-by-sku",
-            json=items,
         )
 
         return data
 
     async def product_attributes_update(
-        self: Type["OzonAPI"], items: dict
+        self: Type["OzonAPI"],
+        items: Union[
+            ProductAttributesUpdate,
+            List[Union[ProductAttributesUpdate_Item, dict]],
+            dict,
+        ],
+        trusted: bool = False,
     ) -> dict[str, int]:
         """
         Documentation: https://docs.ozon.ru/api/seller/#operation/ProductAPI_ProductUpdateAttributes
 
         Updates product attributes.
 
+        Args:
+        items (ProductAttributesUpdate | List[ProductAttributesUpdate_Item | dict] | dict): The products,
+            see product_import.
+        trusted (bool): Skip validation of the items. Defaults to False.
+
         Returns:
         dict[str, int]: The JSON response from the API. The response contains the updated product IDs.
         """
-        data = await self._request(
+        data = await self._items_request(
+            "update",
+            "ProductAttributesUpdate_Item",
+            items,
+            trusted,
             method="post",
             api_version="v1",
             endpoint="product/attributes/update",
-            json=items,
         )
 
         return data
 
+    async def product_attributes_update_diff(
+        self: Type["OzonAPI"],
+        items: Iterable[Union[ProductAttributesUpdate_Item, dict]],
+        snapshot: AttributeSnapshot,
+        chunk_size: int = 100,
+        concurrency: int = 4,
+        clear_missing: bool = False,
+        trusted: bool = False,
+    ) -> Dict[str, List[Any]]:
+        """
+
+        Custom method, based on:
+            https://api-seller.ozon.ru/v1/product/attributes/update
+
+        Sends only the attributes that differ from the snapshot of the last sent or fetched state.
+
+        Items without changes are skipped, the changed attributes of the others are sent in
+        chunks of `chunk_size` products, up to `concurrency` requests at a time. Every update task
+        is awaited with wait_import_task, and the snapshot is updated only for the products it
+        reports as imported: a product that Ozon rejected, or whose task could not be confirmed,
+        keeps its previous state and is sent again by the next sync.
+
+        Usage:
+            snapshot = AttributeSnapshot()
+            result = await api.product_attributes_update_diff(items, snapshot)
+
+        Args:
+        items (Iterable[ProductAttributesUpdate_Item | dict]): The desired attributes of the products.
+            When an offer_id occurs several times, the last item wins.
+        snapshot (AttributeSnapshot): The stored state, see ozon_api.snapshot.
+        chunk_size (int): Products per request. Defaults to 100.
+        concurrency (int): Requests in flight. Defaults to 4.
+        clear_missing (bool): Clear the stored attributes that an item does not contain. By default
+            an item only describes the attributes it contains. Defaults to False.
+        trusted (bool): Skip validation of the items. Defaults to False.
+
+        Returns:
+        Dict[str, List[Any]]: "task_ids" of the update tasks, the offer_ids that were "updated",
+            the offer_ids that were sent but not imported ("failed") and the offer_ids that
+            were "unchanged".
+
+        Raises:
+        pydantic.ValidationError: Some items do not match ProductAttributesUpdate_Item.
+        OzonAPIError: The API did not accept a chunk; the snapshot keeps its previous state for it.
+        """
+        from ozon_api.snapshot import diff_attributes
+
+        items = list(items)
+        if not trusted:
+            from ozon_api import models
+            from ozon_api.models.batch import validate_items
+
+            items = validate_items(models.ProductAttributesUpdate_Item, items)
+        desired = {}
+        for item in items:
+            item = item if isinstance(item, dict) else item.model_dump()
+            desired[item["offer_id"]] = item
+
+        stored = await snapshot.aget_many(self.__client_id, desired)
+        patches, states, unchanged = [], {}, []
+        for offer_id, item in desired.items():
+            patch, state = diff_attributes(item, stored.get(offer_id), clear_missing)
+            if patch:
+                patches.append({"offer_id": offer_id, "attributes": patch})
+                states[offer_id] = state
+            else:
+                unchanged.append(offer_id)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        imported: set = set()
+
+        async def submit(chunk: List[Dict[str, Any]]) -> Any:
+            async with semaphore:
+                response = await self.product_attributes_update(chunk, trusted=True)
+            task_id = response.get("task_id") if isinstance(response, dict) else None
+            if task_id is None:
+                raise OzonAPIError(
+                    f"product/attributes/update failed: {response}",
+                    "product/attributes/update",
+                    body=response,
+                )
+            try:
+                info = await self.wait_import_task(task_id)
+            except (OzonAPIError, asyncio.TimeoutError) as error:
+                logger.warning(
+                    "Attribute update task {} is not confirmed: {}", task_id, error
+                )
+                return task_id
+            sent = {patch["offer_id"] for patch in chunk}
+            done = {
+                item["offer_id"]
+                for item in info.get("items") or ()
+                if item.get("status") == "imported" and item.get("offer_id") in sent
+            }
+            await snapshot.aput_many(
+                self.__client_id, {offer_id: states[offer_id] for offer_id in done}
+            )
+            imported.update(done)
+            return task_id
+
+        task_ids = await gather_or_cancel(
+            submit(patches[start : start + chunk_size])
+            for start in range(0, len(patches), chunk_size)
+        )
+        return {
+            "task_ids": task_ids,
+            "updated": [
+                patch["offer_id"] for patch in patches if patch["offer_id"] in imported
+            ],
+            "failed": [
+                patch["offer_id"]
+                for patch in patches
+                if patch["offer_id"] not in imported
+            ],
+            "unchanged": unchanged,
+        }
+
     async def product_pictures_import(
         self: Type["OzonAPI"], items: dict
     ) -> dict[str, Any]:
@@ -492,6 +1887,158 @@ class OzonAPI:
 
         return data
 
+    async def wait_product_pictures(
+        self: Type["OzonAPI"], product_id: Union[int, str]
+    ) -> List[Dict[str, Any]]:
+        """
+
+        Custom method, based on:
+            https://api-seller.ozon.ru/v1/product/pictures/info
+
+        Waits until all pictures of a product are processed. Products are polled by the shared
+        pictures_poller, many of them per product_pictures_info request.
+
+        Args:
+        product_id (int | str): The product ID.
+
+        Returns:
+        List[Dict[str, Any]]: The pictures of the product with their final state.
+        """
+        return await self.pictures_poller.wait(int(product_id))
+
+    async def _check_product_pictures(
+        self: Type["OzonAPI"], product_ids: List[int]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        response = await self.product_pictures_info(
+            [str(product_id) for product_id in product_ids]
+        )
+        pictures: Dict[int, List[Dict[str, Any]]] = {}
+        for picture in (response.get("result") or {}).get("pictures") or []:
+            pictures.setdefault(int(picture["product_id"]), []).append(picture)
+        return pictures
+
+    async def product_pictures_import_bulk(
+        self: Type["OzonAPI"],
+        pictures: Union[
+            Iterable[Tuple[Union[int, str], Any]],
+            AsyncIterable[Tuple[Union[int, str], Any]],
+        ],
+        concurrency: int = 8,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+
+        Custom method, based on:
+            https://api-seller.ozon.ru/v1/product/pictures/import
+            https://api-seller.ozon.ru/v1/product/pictures/info
+
+        Imports the pictures of any number of products and streams the per-product outcomes as
+        Ozon finishes processing them.
+
+        product/pictures/import takes one product per request: up to `concurrency` of them are
+        submitted at the same time, and the pairs are read only as fast as they are sent. The
+        submitted products are tracked by the shared pictures_poller, which checks up to 1000 of
+        them per product_pictures_info request.
+
+        Usage:
+            async for outcome in api.product_pictures_import_bulk(
+                (product["product_id"], product["images"]) for product in products
+            ):
+                if outcome["status"] != "imported":
+                    ...
+
+        Args:
+        pictures (Iterable | AsyncIterable): (product_id, images) pairs. images is a list of picture
+            URLs, or a dictionary with "images", "images360" and "color_image".
+        concurrency (int): Maximum number of products being submitted at the same time. Defaults to 8.
+
+        Yields:
+        Dict[str, Any]: product_id, status, pictures (the product_pictures_info pictures of the product)
+        and errors. status is "imported" when every picture is imported, "failed" when one of them
+        failed or the request was rejected (the API response is in errors), "invalid" when the pictures
+        exceed the limits of the endpoint and were not sent, and "timeout" when the pictures are not
+        processed within pictures_poller.timeout.
+        """
+        results: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(concurrency)
+        running: set = set()
+        done = object()
+
+        def outcome(
+            product_id: int,
+            status: str,
+            pictures: Optional[List[Dict[str, Any]]] = None,
+            errors: Optional[List[Any]] = None,
+        ) -> Dict[str, Any]:
+            return {
+                "product_id": product_id,
+                "status": status,
+                "pictures": pictures or [],
+                "errors": errors or [],
+            }
+
+        async def submit(product_id: int, body: Dict[str, Any]) -> None:
+            try:
+                try:
+                    response = await self.product_pictures_import(body)
+                finally:
+                    semaphore.release()
+
+                if "result" not in response:
+                    results.put_nowait(outcome(product_id, "failed", errors=[response]))
+                    return
+                try:
+                    states = await self.wait_product_pictures(product_id)
+                except asyncio.TimeoutError as error:
+                    results.put_nowait(
+                        outcome(product_id, "timeout", errors=[str(error)])
+                    )
+                    return
+                failed = any(picture.get("state") == "failed" for picture in states)
+                results.put_nowait(
+                    outcome(product_id, "failed" if failed else "imported", states)
+                )
+            except Exception as error:
+                # Stops the whole pipeline right away instead of after the input is read.
+                results.put_nowait((done, error))
+
+        async def feed() -> None:
+            try:
+                async for chunk in chunked(pictures, concurrency):
+                    for product_id, images in chunk:
+                        product_id = int(product_id)
+                        body, error = _pictures_body(product_id, images)
+                        if error is not None:
+                            results.put_nowait(
+                                outcome(product_id, "invalid", errors=[error])
+                            )
+                            continue
+                        # Acquired here and released once the product is submitted, so the
+                        # source is only read as fast as products can be sent.
+                        await semaphore.acquire()
+                        task = asyncio.ensure_future(submit(product_id, body))
+                        running.add(task)
+                        task.add_done_callback(running.discard)
+                while running:
+                    await asyncio.gather(*running)
+            except Exception as error:
+                results.put_nowait((done, error))
+            else:
+                results.put_nowait((done, None))
+
+        feeder = asyncio.ensure_future(feed())
+        try:
+            while True:
+                result = await results.get()
+                if isinstance(result, tuple) and result[0] is done:
+                    if result[1] is not None:
+                        raise result[1]
+                    return
+                yield result
+        finally:
+            for task in (feeder, *running):
+                task.cancel()
+            await asyncio.gather(feeder, *running, return_exceptions=True)
+
     async def product_list(
         self: Type["OzonAPI"], body: dict[str, Any]
     ) -> dict[str, Any]:
@@ -513,6 +2060,80 @@ class OzonAPI:
 
         return data
 
+    async def iter_product_list(
+        self: Type["OzonAPI"],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 1000,
+        prefetch: int = 1,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Any]:
+        """
+
+        Custom method, based on:
+            https://api-seller.ozon.ru/v1/product/list
+
+        Iterates the whole product list, following last_id.
+
+        Up to `prefetch` pages are requested ahead while the caller processes the current one,
+        and only those pages are kept in memory.
+
+        Usage:
+            async for product_id, offer_id in api.iter_product_list(fields=("product_id", "offer_id")):
+                ...
+
+        Args:
+        filter (Optional[Dict[str, Any]]): The product/list filter, e.g. {"visibility": "ALL", "offer_id": [...]}.
+            Defaults to {"visibility": "ALL"}.
+        limit (int): The page size, at most 1000. Defaults to 1000.
+        prefetch (int): Number of pages to request ahead, 0 disables prefetching. Defaults to 1.
+        fields (Optional[Sequence[str]]): Yield only these fields of every product: a single value for
+            one field, a tuple for several. Defaults to None (the full dicts).
+
+        Yields:
+        Dict[str, Any] | Any: The products, or the requested fields of them.
+
+        Raises:
+        OzonAPIError: A page could not be retrieved.
+        """
+        source = self._product_list_pages(
+            filter if filter is not None else {"visibility": "ALL"}, limit
+        )
+        compact = itemgetter(*fields) if fields else None
+        async for items in prefetched(source, prefetch):
+            if compact is None:
+                for item in items:
+                    yield item
+            else:
+                for item in items:
+                    yield compact(item)
+
+    async def _product_list_pages(
+        self: Type["OzonAPI"], filter: Dict[str, Any], limit: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yields the items of product/list page by page, following last_id.
+        """
+        last_id = ""
+        while True:
+            data = await self.product_list(
+                {"filter": filter, "last_id": last_id, "limit": limit}
+            )
+            result = data.get("result")
+            if result is None:
+                raise OzonAPIError(
+                    f"product/list failed: {data.get('message', data)}",
+                    "product/list",
+                    body=data,
+                )
+
+            items = result.get("items") or []
+            if items:
+                yield items
+
+            last_id = result.get("last_id")
+            if not items or not last_id:
+                break
+
     async def product_info_limit(self: Type["OzonAPI"]):
         """
         Documentation: https://docs.ozon.ru/api/seller/#operation/ProductAPI_GetUploadQuota
@@ -530,3 +2151,74 @@ class OzonAPI:
         )
 
         return data
+
+
+# Picture states after which Ozon does not process the picture any further.
+PICTURE_FINAL_STATES = frozenset({"imported", "failed"})
+
+# The most pictures product/pictures/import accepts for one product.
+MAX_PICTURES = 30
+MAX_PICTURES_360 = 70
+
+
+def _items_count(items: Any) -> int:
+    if isinstance(items, dict):
+        return len(items.get("items") or ())
+    if isinstance(items, list):
+        return len(items)
+    return len(items.items)
+
+
+def _import_task_done(result: Dict[str, Any]) -> bool:
+    items = result.get("items") or []
+    return bool(items) and all(item.get("status") != "pending" for item in items)
+
+
+def _import_task_progress(result: Dict[str, Any]) -> Optional[float]:
+    items = result.get("items") or []
+    if not items:
+        return None
+    return sum(item.get("status") != "pending" for item in items) / len(items)
+
+
+def _pictures_done(pictures: List[Dict[str, Any]]) -> bool:
+    return all(picture.get("state") in PICTURE_FINAL_STATES for picture in pictures)
+
+
+def _pictures_body(
+    product_id: int, images: Any
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Returns:
+        Tuple[Dict[str, Any], Optional[str]]: The product/pictures/import body of a product, and
+        why it can not be sent, None when it can.
+    """
+    if isinstance(images, dict):
+        body = {
+            "product_id": product_id,
+            "images": list(images.get("images") or ()),
+            "images360": list(images.get("images360") or ()),
+            "color_image": images.get("color_image") or "",
+        }
+    else:
+        images = [images] if isinstance(images, str) else list(images)
+        body = {
+            "product_id": product_id,
+            "images": images,
+            "images360": [],
+            "color_image": "",
+        }
+
+    if not body["images"] and not body["images360"] and not body["color_image"]:
+        return body, "No pictures given"
+    if len(body["images"]) > MAX_PICTURES:
+        return (
+            body,
+            f"{len(body['images'])} images, at most {MAX_PICTURES} are accepted",
+        )
+    if len(body["images360"]) > MAX_PICTURES_360:
+        return (
+            body,
+            f"{len(body['images360'])} images360, at most {MAX_PICTURES_360} are accepted",
+        )
+    return body, None
@@ -0,0 +1,161 @@
+from pathlib import Path
+from typing import Any, Optional, Tuple, Type, Union
+
+from ozon_api.codec import JSONCodec, get_codec
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+
+class SQLiteCache:
+    """
+    A persistent key-value cache for API responses stored in a local SQLite file.
+
+    Entries older than `ttl` seconds are treated as missing by get(), but are kept
+    until evicted so that an incremental refresh can resume from them. When the
+    cache holds more than `max_entries` entries the least recently used are evicted.
+
+    The connection is shared between threads; every async method runs the blocking
+    SQLite call in a worker thread so the event loop is never stalled by large values.
+    """
+
+    def __init__(
+        self: Type["SQLiteCache"],
+        directory: Union[str, Path] = ".ozon_cache",
+        ttl: Optional[float] = 7 * 24 * 60 * 60,
+        max_entries: Optional[int] = 100_000,
+        filename: str = "cache.sqlite3",
+        json_codec: Union[str, JSONCodec] = "auto",
+    ) -> None:
+        """
+        Args:
+            directory (Union[str, Path]): Directory of the database file, created when missing. Defaults to ".ozon_cache".
+            ttl (Optional[float]): Seconds an entry stays fresh, None means forever. Defaults to one week.
+            max_entries (Optional[int]): Maximum number of entries, None means no limit. Defaults to 100000.
+            filename (str): The database file name. Defaults to "cache.sqlite3".
+            json_codec (Union[str, JSONCodec]): The codec of stored values, see ozon_api.codec.get_codec.
+                Defaults to "auto".
+        """
+        self.ttl = ttl
+        self.codec = get_codec(json_codec)
+        self.max_entries = max_entries
+
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path / filename
+
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.__lock, self.__connection:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self.__connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+
+    def _dumps(self: Type["SQLiteCache"], value: Any) -> bytes:
+        return self.codec.dumps(value)
+
+    def _loads(self: Type["SQLiteCache"], data: bytes) -> Any:
+        return self.codec.loads(data)
+
+    def get_entry(self: Type["SQLiteCache"], key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Returns an entry regardless of its age.
+
+        Returns:
+            Optional[Tuple[Any, float]]: The value and its creation time (UNIX seconds), or None.
+        """
+        with self.__lock, self.__connection:
+            row = self.__connection.execute(
+                "SELECT value, created FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.__connection.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return self._loads(row[0]), row[1]
+
+    def get(self: Type["SQLiteCache"], key: str) -> Optional[Any]:
+        """
+        Returns:
+            Optional[Any]: The cached value, or None when it is missing or expired.
+        """
+        entry = self.get_entry(key)
+        if entry is None:
+            return None
+        value, created = entry
+        if self.ttl is not None and time.time() - created > self.ttl:
+            return None
+        return value
+
+    def set(self: Type["SQLiteCache"], key: str, value: Any) -> None:
+        """
+        Stores a JSON-serializable value and evicts the least recently used entries
+        above max_entries.
+        """
+        data = self._dumps(value)
+        now = time.time()
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, data, now, now),
+            )
+            if self.max_entries is not None:
+                self.__connection.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def delete(self: Type["SQLiteCache"], key: str) -> None:
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def purge_expired(self: Type["SQLiteCache"]) -> int:
+        """
+        Deletes the expired entries.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        if self.ttl is None:
+            return 0
+        with self.__lock, self.__connection:
+            cursor = self.__connection.execute(
+                "DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,)
+            )
+        return cursor.rowcount
+
+    def clear(self: Type["SQLiteCache"]) -> None:
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM entries")
+
+    def close(self: Type["SQLiteCache"]) -> None:
+        with self.__lock:
+            self.__connection.close()
+
+    async def aget_entry(
+        self: Type["SQLiteCache"], key: str
+    ) -> Optional[Tuple[Any, float]]:
+        return await asyncio.to_thread(self.get_entry, key)
+
+    async def aget(self: Type["SQLiteCache"], key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self: Type["SQLiteCache"], key: str, value: Any) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+
+def cache_key(kind: str, *parts: Any) -> str:
+    """
+    Builds a cache key such as "attribute/values:17027949:94765:RU:85".
+    """
+    return ":".join([kind, *map(str, parts)])
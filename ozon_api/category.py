@@ -0,0 +1,133 @@
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Type
+
+if TYPE_CHECKING:
+    from ozon_api import OzonAPI
+    from ozon_api.search import AttributeValueIndex
+
+
+@dataclass(frozen=True)
+class CategoryView:
+    """
+    An immutable description category (category, type and language) bound to a client.
+
+    A view sends every request with its own parameters through the parent OzonAPI, so
+    any number of views over different categories may be used concurrently by one client,
+    sharing its session, rate limiter, cache and retries. Changing the client's
+    description_category_id, type_id or language does not affect existing views.
+
+    Usage:
+        shoes = api.category(17028922, 91248, language="RU")
+        attributes, brands = await asyncio.gather(
+            shoes.attributes(), shoes.attribute_values(85, name="Бренд")
+        )
+    """
+
+    api: "OzonAPI" = field(repr=False, compare=False)
+    description_category_id: int
+    type_id: int
+    language: str = "DEFAULT"
+
+    @property
+    def params(self: Type["CategoryView"]) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: The category fields of a request body.
+        """
+        return {
+            "description_category_id": self.description_category_id,
+            "type_id": self.type_id,
+            "language": self.language,
+        }
+
+    def with_language(self: Type["CategoryView"], language: str) -> "CategoryView":
+        """
+        Returns:
+            CategoryView: The same category in another language.
+        """
+        return replace(self, language=language)
+
+    async def attributes(
+        self: Type["CategoryView"], refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        See OzonAPI.get_description_category_attribute.
+        """
+        return await self.api.get_description_category_attribute(
+            refresh=refresh, **self.params
+        )
+
+    async def attribute_values(
+        self: Type["CategoryView"],
+        attribute_id: int,
+        name: str = "",
+        last_value_id: int = 0,
+        limit: int = 5000,
+        refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        See OzonAPI.get_description_category_attribute_values.
+        """
+        return await self.api.get_description_category_attribute_values(
+            name,
+            attribute_id=attribute_id,
+            last_value_id=last_value_id,
+            limit=limit,
+            refresh=refresh,
+            **self.params,
+        )
+
+    def iter_attribute_values(
+        self: Type["CategoryView"],
+        attribute_id: int,
+        last_value_id: int = 0,
+        limit: int = 5000,
+        pages: bool = False,
+        prefetch: int = 1,
+        name: str = "",
+    ) -> AsyncIterator[Any]:
+        """
+        See OzonAPI.iter_description_category_attribute_values.
+        """
+        return self.api.iter_description_category_attribute_values(
+            attribute_id,
+            last_value_id=last_value_id,
+            limit=limit,
+            pages=pages,
+            prefetch=prefetch,
+            name=name,
+            **self.params,
+        )
+
+    async def value_index(
+        self: Type["CategoryView"],
+        attribute_id: int,
+        name: str = "",
+        refresh: bool = False,
+    ) -> "AttributeValueIndex":
+        """
+        See OzonAPI.get_attribute_value_index.
+        """
+        return await self.api.get_attribute_value_index(
+            attribute_id, name=name, refresh=refresh, **self.params
+        )
+
+    async def search_attribute_values(
+        self: Type["CategoryView"], attribute_id: int, value: str, limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        See OzonAPI.get_description_category_attribute_values_search.
+        """
+        return await self.api.get_description_category_attribute_values_search(
+            attribute_id, value, limit=limit, **self.params
+        )
+
+    async def full_info(
+        self: Type["CategoryView"], concurrency: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        See OzonAPI.get_full_category_info.
+        """
+        return await self.api.get_full_category_info(
+            concurrency=concurrency, **self.params
+        )
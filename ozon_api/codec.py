@@ -0,0 +1,117 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Type, Union
+
+import json
+
+
+class JSONCodec:
+    """
+    Encodes request bodies to JSON bytes and decodes response bodies.
+
+    The base class uses the standard library; subclasses plug in faster libraries.
+    """
+
+    name = "json"
+
+    def dumps(self: Type["JSONCodec"], obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(self: Type["JSONCodec"], data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self: Type["OrjsonCodec"]) -> None:
+        import orjson
+
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self: Type["MsgspecCodec"]) -> None:
+        import msgspec
+
+        self.dumps = msgspec.json.Encoder().encode
+        self.loads = msgspec.json.Decoder().decode
+
+
+_CODECS: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+
+
+def get_codec(name: Union[str, JSONCodec] = "auto") -> JSONCodec:
+    """
+    Returns a JSON codec by name.
+
+    Args:
+        name (Union[str, JSONCodec]): "orjson", "msgspec", "json", or "auto" for the first
+            installed of them in this order. A JSONCodec instance is returned as is.
+
+    Returns:
+        JSONCodec: The codec.
+
+    Raises:
+        ImportError: The requested library is not installed.
+        ValueError: The name is unknown.
+    """
+    if isinstance(name, JSONCodec):
+        return name
+    if name == "auto":
+        for factory in _CODECS.values():
+            try:
+                return factory()
+            except ImportError:
+                continue
+    if name not in _CODECS:
+        raise ValueError(
+            f"Unknown JSON codec {name!r}, expected one of {list(_CODECS)} or 'auto'"
+        )
+    return _CODECS[name]()
+
+
+class LazyJSON(Mapping):
+    """
+    A response body that is decoded only when it is first accessed.
+
+    Behaves as a read-only mapping of the decoded JSON object; the undecoded bytes stay
+    available as `raw`, e.g. to be written to disk without ever being parsed.
+    """
+
+    __slots__ = ("raw", "_loads", "_value")
+
+    def __init__(
+        self: Type["LazyJSON"], raw: bytes, loads: Callable[[bytes], Any]
+    ) -> None:
+        self.raw = raw
+        self._loads = loads
+        self._value = None
+
+    def decode(self: Type["LazyJSON"]) -> Any:
+        """
+        Returns:
+            Any: The decoded body, parsed once and cached.
+        """
+        if self._value is None:
+            self._value = self._loads(self.raw) if self.raw else {}
+        return self._value
+
+    def __getitem__(self: Type["LazyJSON"], key: str) -> Any:
+        return self.decode()[key]
+
+    def __iter__(self: Type["LazyJSON"]) -> Iterator[str]:
+        return iter(self.decode())
+
+    def __len__(self: Type["LazyJSON"]) -> int:
+        return len(self.decode())
+
+    def __repr__(self: Type["LazyJSON"]) -> str:
+        state = "decoded" if self._value is not None else f"{len(self.raw)} bytes"
+        return f"<LazyJSON {state}>"
@@ -0,0 +1,38 @@
+from typing import Any, Optional
+
+
+class OzonAPIError(Exception):
+    """
+    Raised when a request to the Ozon API failed and could not be retried.
+
+    Attributes:
+        endpoint (str): The endpoint that was called.
+        status (Optional[int]): The HTTP status of the last response, if any.
+        body (Any): The last response body, decoded when possible.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        endpoint: str = "",
+        status: Optional[int] = None,
+        body: Any = None,
+    ) -> None:
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status = status
+        self.body = body
+
+
+class CircuitOpenError(OzonAPIError):
+    """
+    Raised without sending the request while the circuit breaker is open, i.e. the
+    Ozon API has recently failed too many times in a row.
+    """
+
+
+class QuotaExceededError(OzonAPIError):
+    """
+    Raised without sending the request when its products can never fit the product quota
+    of the account: more products than the daily limit at once, or the total limit is reached.
+    """
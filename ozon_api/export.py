@@ -0,0 +1,527 @@
+"""
+Export of the whole category catalog: the tree, the attributes of every type and the
+values of every dictionary, for every requested language.
+
+    python -m ozon_api.export --output catalog --language RU --language EN [--format parquet]
+
+The credentials are taken from --client-id/--api-key or the OZON_CLIENT_ID/OZON_API_KEY
+environment variables.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+import argparse
+import asyncio
+import importlib.util
+import os
+
+from aiohttp import ClientError
+
+from ozon_api.exceptions import OzonAPIError
+from ozon_api.log import logger
+from ozon_api.utils import gather_or_cancel
+
+if TYPE_CHECKING:
+    from ozon_api import OzonAPI
+    from ozon_api.tree import CategoryNode
+
+ExportFormat = Literal["jsonl", "parquet"]
+PartKind = Literal["categories", "attributes", "values"]
+
+# The errors of one category that are reported in ExportReport.failed instead of stopping
+# the export; the writers add their own.
+_FAILURES: Tuple[Type[BaseException], ...] = (
+    OzonAPIError,
+    asyncio.TimeoutError,
+    ClientError,
+)
+
+
+class _JSONLWriter:
+    suffix = ".jsonl"
+
+    def __init__(
+        self: Type["_JSONLWriter"], path: Path, kind: PartKind, dumps: Any
+    ) -> None:
+        self.__file = open(path, "wb")
+        self.__dumps = dumps
+
+    @staticmethod
+    def errors() -> Tuple[Type[BaseException], ...]:
+        return ()
+
+    def write(self: Type["_JSONLWriter"], rows: Sequence[Dict[str, Any]]) -> None:
+        dumps = self.__dumps
+        self.__file.write(b"".join(dumps(row) + b"\n" for row in rows))
+
+    def close(self: Type["_JSONLWriter"]) -> None:
+        self.__file.close()
+
+
+class _ParquetWriter:
+    suffix = ".parquet"
+
+    def __init__(
+        self: Type["_ParquetWriter"], path: Path, kind: PartKind, dumps: Any
+    ) -> None:
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError(
+                "The parquet format needs pyarrow: pip install 'ozon-api[parquet]'"
+            )
+        self.__path = path
+        self.__schema = _parquet_schema(kind)
+        self.__writer = None
+
+    @staticmethod
+    def errors() -> Tuple[Type[BaseException], ...]:
+        if importlib.util.find_spec("pyarrow") is None:
+            # The writer raises the ImportError naming the extra.
+            return ()
+        import pyarrow
+
+        return (pyarrow.ArrowException,)
+
+    def write(self: Type["_ParquetWriter"], rows: Sequence[Dict[str, Any]]) -> None:
+        import pyarrow
+        import pyarrow.parquet
+
+        if not rows:
+            return
+        if self.__writer is None:
+            self.__writer = pyarrow.parquet.ParquetWriter(self.__path, self.__schema)
+        # The schema is fixed rather than inferred from the first page, so that every part
+        # of a kind has the same columns and a key missing from a page is not a type error.
+        table = pyarrow.Table.from_pylist(list(rows), schema=self.__schema)
+        # Every page becomes a row group, so a large dictionary is never held in memory.
+        self.__writer.write_table(table)
+
+    def close(self: Type["_ParquetWriter"]) -> None:
+        import pyarrow.parquet
+
+        if self.__writer is None:
+            # No rows: an empty table still marks the part as done.
+            self.__writer = pyarrow.parquet.ParquetWriter(self.__path, self.__schema)
+        self.__writer.close()
+
+
+def _parquet_schema(kind: PartKind) -> Any:
+    """
+    Returns the pyarrow schema of a part: the columns of the rows written by CatalogExport,
+    with the fields of the description-category responses. Other keys are not written.
+    """
+    import pyarrow
+
+    integer, string, boolean = pyarrow.int64(), pyarrow.string(), pyarrow.bool_()
+    category = [
+        ("description_category_id", integer),
+        ("type_id", integer),
+    ]
+    if kind == "categories":
+        columns = [
+            *category,
+            ("name", string),
+            ("is_type", boolean),
+            ("disabled", boolean),
+            ("parent_description_category_id", integer),
+            ("path", string),
+        ]
+    elif kind == "attributes":
+        columns = [
+            *category,
+            ("language", string),
+            ("id", integer),
+            ("name", string),
+            ("description", string),
+            ("type", string),
+            ("is_collection", boolean),
+            ("is_required", boolean),
+            ("is_aspect", boolean),
+            ("max_value_count", integer),
+            ("group_id", integer),
+            ("group_name", string),
+            ("dictionary_id", integer),
+            ("category_dependent", boolean),
+            ("attribute_complex_id", integer),
+            ("complex_is_collection", boolean),
+        ]
+    else:
+        columns = [
+            ("dictionary_id", integer),
+            ("attribute_id", integer),
+            *category,
+            ("language", string),
+            ("id", integer),
+            ("value", string),
+            ("info", string),
+            ("picture", string),
+        ]
+    return pyarrow.schema(columns)
+
+
+_WRITERS = {"jsonl": _JSONLWriter, "parquet": _ParquetWriter}
+
+
+@dataclass
+class ExportReport:
+    """
+    What an export run did. Parts found on disk from an earlier run are counted as skipped.
+    """
+
+    categories: int = 0
+    categories_skipped: int = 0
+    dictionaries: int = 0
+    dictionaries_skipped: int = 0
+    values: int = 0
+    # (description_category_id, type_id, language, error message) of the failed categories.
+    failed: List[Tuple[int, int, str, str]] = field(default_factory=list)
+
+
+class CatalogExport:
+    """
+    Walks the category tree and writes the attributes of every type and the values of every
+    dictionary to files, in one pass for several languages.
+
+    Layout of the output directory (with the jsonl format):
+        categories.jsonl                             every node of the tree
+        attributes/<language>/<category>_<type>.jsonl  the attributes of a type, one per row
+        values/<language>/<dictionary>.jsonl         the values of a dictionary, one per row
+
+    Every part is written to a temporary file and renamed when complete, and the attributes
+    of a type only after all its dictionaries, so the parts on disk are the checkpoint: an
+    interrupted or failed run is resumed by running it again, finished parts are skipped.
+    Dictionaries shared by many types (brands, colors) are fetched and written once per
+    language; their values are streamed page by page.
+
+    Usage:
+        report = await CatalogExport(api, "catalog", languages=("RU", "EN")).run()
+    """
+
+    def __init__(
+        self: Type["CatalogExport"],
+        api: "OzonAPI",
+        directory: Union[str, Path],
+        languages: Iterable[str] = ("DEFAULT",),
+        format: ExportFormat = "jsonl",
+        concurrency: int = 8,
+        include_disabled: bool = False,
+    ) -> None:
+        """
+        Args:
+            api (OzonAPI): The client.
+            directory (Union[str, Path]): The output directory, created when missing.
+            languages (Iterable[str]): The languages to export. Defaults to ("DEFAULT",).
+            format (ExportFormat): "jsonl", or "parquet" (needs pyarrow). Defaults to "jsonl".
+            concurrency (int): Requests in flight, a dictionary being paged counts as one. Defaults to 8.
+            include_disabled (bool): Also export disabled types. Defaults to False.
+        """
+        if format not in _WRITERS:
+            raise ValueError(f"Unknown export format: {format}")
+        self.api = api
+        self.directory = Path(directory)
+        self.languages = tuple(languages)
+        self.format = format
+        self.concurrency = concurrency
+        self.include_disabled = include_disabled
+
+        self.__writer = _WRITERS[format]
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+        self.__failures: Tuple[Type[BaseException], ...] = _FAILURES
+        self.__dictionaries: Dict[Tuple[str, str], "asyncio.Future[None]"] = {}
+        self.__report = ExportReport()
+
+    def _part(self: Type["CatalogExport"], kind: str, language: str, name: str) -> Path:
+        return self.directory / kind / language / f"{name}{self.__writer.suffix}"
+
+    async def _write_part(
+        self: Type["CatalogExport"], path: Path, kind: PartKind, batches: Any
+    ) -> int:
+        """
+        Writes the row batches of an (async) iterable to a part and renames it when complete.
+
+        Returns:
+            int: The number of rows written.
+        """
+        temporary = path.with_name(path.name + ".tmp")
+        writer = await asyncio.to_thread(
+            self.__writer, temporary, kind, self.api.json_codec.dumps
+        )
+        rows = 0
+        try:
+            try:
+                if hasattr(batches, "__aiter__"):
+                    async for batch in batches:
+                        await asyncio.to_thread(writer.write, batch)
+                        rows += len(batch)
+                else:
+                    for batch in batches:
+                        await asyncio.to_thread(writer.write, batch)
+                        rows += len(batch)
+            finally:
+                await asyncio.to_thread(writer.close)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+        os.replace(temporary, path)
+        return rows
+
+    def _prepare(self: Type["CatalogExport"]) -> None:
+        for language in self.languages:
+            for kind in ("attributes", "values"):
+                directory = self.directory / kind / language
+                directory.mkdir(parents=True, exist_ok=True)
+                # Parts of an interrupted run are written again.
+                for temporary in directory.glob("*.tmp"):
+                    temporary.unlink()
+
+    async def run(
+        self: Type["CatalogExport"],
+        categories: Optional[Iterable[Tuple[int, int]]] = None,
+    ) -> ExportReport:
+        """
+        Exports the catalog, or resumes an earlier export into the same directory.
+
+        Args:
+            categories (Optional[Iterable[Tuple[int, int]]]): (description_category_id, type_id)
+                pairs to export. Defaults to every type of the tree.
+
+        Returns:
+            ExportReport: The counts of this run and the categories that failed; run again to retry them.
+        """
+        self.__semaphore = asyncio.Semaphore(self.concurrency)
+        self.__failures = _FAILURES + self.__writer.errors()
+        self.__dictionaries = {}
+        self.__report = ExportReport()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self._prepare)
+
+        tree = await self.api.get_category_tree()
+        await self._write_part(
+            self.directory / f"categories{self.__writer.suffix}",
+            "categories",
+            [[_node_row(node) for node in tree]],
+        )
+        if categories is None:
+            categories = [
+                node.key
+                for node in tree.leaves()
+                if node.is_type and (self.include_disabled or not node.disabled)
+            ]
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for description_category_id, type_id in dict.fromkeys(categories):
+            for language in self.languages:
+                queue.put_nowait((description_category_id, type_id, language))
+        total = queue.qsize()
+
+        async def worker() -> None:
+            while not queue.empty():
+                unit = queue.get_nowait()
+                await self._export_category(*unit)
+                done = self.__report.categories + self.__report.categories_skipped
+                if done % 100 == 0:
+                    logger.info("Catalog export: {}/{} categories", done, total)
+
+        try:
+            await gather_or_cancel(worker() for _ in range(max(self.concurrency, 1)))
+        except BaseException:
+            # The dictionaries are shielded from the categories waiting for them, so they
+            # are stopped here instead of running on after the export is aborted.
+            for export in self.__dictionaries.values():
+                export.cancel()
+            raise
+        finally:
+            # Also the dictionaries of failed categories that other types did not wait for.
+            await asyncio.gather(*self.__dictionaries.values(), return_exceptions=True)
+        return self.__report
+
+    async def _export_category(
+        self: Type["CatalogExport"],
+        description_category_id: int,
+        type_id: int,
+        language: str,
+    ) -> None:
+        path = self._part(
+            "attributes", language, f"{description_category_id}_{type_id}"
+        )
+        if path.exists():
+            self.__report.categories_skipped += 1
+            return
+
+        category = {
+            "description_category_id": description_category_id,
+            "type_id": type_id,
+            "language": language,
+        }
+        try:
+            async with self.__semaphore:
+                response = await self.api.get_description_category_attribute(**category)
+            if "result" not in response:
+                raise OzonAPIError(
+                    f"description-category/attribute failed: {response}",
+                    "description-category/attribute",
+                    body=response,
+                )
+            attributes = response["result"]
+            await gather_or_cancel(
+                self._dictionary(attribute, category)
+                for attribute in attributes
+                if attribute.get("dictionary_id")
+            )
+            rows = [{**category, **attribute} for attribute in attributes]
+            await self._write_part(path, "attributes", [rows])
+        except self.__failures as error:
+            message = str(error) or type(error).__name__
+            logger.warning(
+                "Catalog export of {}/{} ({}) failed: {}",
+                description_category_id,
+                type_id,
+                language,
+                message,
+            )
+            self.__report.failed.append(
+                (description_category_id, type_id, language, message)
+            )
+            return
+        self.__report.categories += 1
+
+    def _dictionary(
+        self: Type["CatalogExport"], attribute: Dict[str, Any], category: Dict[str, Any]
+    ) -> "asyncio.Future[None]":
+        """
+        Returns the export of a dictionary, started by the first type that uses it.
+        """
+        name = str(attribute["dictionary_id"])
+        if attribute.get("category_dependent"):
+            name = f"{name}_{category['description_category_id']}_{category['type_id']}"
+        key = (category["language"], name)
+        export = self.__dictionaries.get(key)
+        if export is None or (
+            export.done() and (export.cancelled() or export.exception() is not None)
+        ):
+            export = asyncio.ensure_future(
+                self._export_dictionary(name, attribute, category)
+            )
+            self.__dictionaries[key] = export
+        # A failed type must not cancel the export that other types are waiting for.
+        return asyncio.shield(export)
+
+    async def _export_dictionary(
+        self: Type["CatalogExport"],
+        name: str,
+        attribute: Dict[str, Any],
+        category: Dict[str, Any],
+    ) -> None:
+        path = self._part("values", category["language"], name)
+        if path.exists():
+            self.__report.dictionaries_skipped += 1
+            return
+
+        dependent = bool(attribute.get("category_dependent"))
+        base = {
+            "dictionary_id": attribute["dictionary_id"],
+            "attribute_id": attribute["id"],
+            "description_category_id": (
+                category["description_category_id"] if dependent else 0
+            ),
+            "type_id": category["type_id"] if dependent else 0,
+            "language": category["language"],
+        }
+
+        async def pages() -> Any:
+            # strict: a failed request must not end the part as if the dictionary was complete.
+            source = self.api.iter_description_category_attribute_values(
+                attribute["id"],
+                pages=True,
+                name=attribute.get("name", ""),
+                strict=True,
+                **category,
+            )
+            async for values in source:
+                yield [{**base, **value} for value in values]
+
+        async with self.__semaphore:
+            rows = await self._write_part(path, "values", pages())
+        self.__report.values += rows
+        self.__report.dictionaries += 1
+
+
+def _node_row(node: "CategoryNode") -> Dict[str, Any]:
+    parent = node.parent
+    return {
+        "description_category_id": node.description_category_id,
+        "type_id": node.type_id or 0,
+        "name": node.name,
+        "is_type": node.is_type,
+        "disabled": node.disabled,
+        "parent_description_category_id": (
+            parent.description_category_id if parent else 0
+        ),
+        "path": node.breadcrumb(),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--output", required=True, help="The output directory.")
+    parser.add_argument(
+        "--language",
+        action="append",
+        dest="languages",
+        help="A language to export, may be repeated. Defaults to DEFAULT.",
+    )
+    parser.add_argument("--format", choices=sorted(_WRITERS), default="jsonl")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--include-disabled", action="store_true")
+    parser.add_argument("--client-id", default=os.environ.get("OZON_CLIENT_ID"))
+    parser.add_argument("--api-key", default=os.environ.get("OZON_API_KEY"))
+    parser.add_argument("--api-url", help="Another base URL, e.g. of a test server.")
+    args = parser.parse_args(argv)
+    if not args.client_id or not args.api_key:
+        parser.error(
+            "--client-id and --api-key (or OZON_CLIENT_ID and OZON_API_KEY) are required"
+        )
+
+    from ozon_api import OzonAPI
+    from ozon_api.log import enable_logging
+
+    enable_logging()
+
+    async def export() -> ExportReport:
+        async with OzonAPI(args.client_id, args.api_key) as api:
+            if args.api_url:
+                api.api_url = args.api_url
+            return await CatalogExport(
+                api,
+                args.output,
+                languages=args.languages or ("DEFAULT",),
+                format=args.format,
+                concurrency=args.concurrency,
+                include_disabled=args.include_disabled,
+            ).run()
+
+    report = asyncio.run(export())
+    print(
+        f"categories: {report.categories} exported, {report.categories_skipped} skipped; "
+        f"dictionaries: {report.dictionaries} exported, {report.dictionaries_skipped} skipped; "
+        f"values: {report.values}; failed: {len(report.failed)}"
+    )
+    if report.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
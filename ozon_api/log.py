@@ -0,0 +1,68 @@
+"""
+Opt-in logging of the client.
+
+The library logs nothing and does not import or configure loguru until
+enable_logging() is called. After that the records go to loguru under the names of
+the ozon_api modules, so they are filtered and formatted by the application's own
+loguru handlers. Messages use "{}" placeholders and are only formatted when emitted.
+"""
+
+from typing import Any, Type
+
+
+class _Logger:
+    """
+    The subset of the loguru logger used by the library, a no-op while logging is disabled.
+    """
+
+    __slots__ = ("enabled",)
+
+    def __init__(self: Type["_Logger"]) -> None:
+        self.enabled = False
+
+    def _log(
+        self: Type["_Logger"], level: str, message: str, *args: Any, **kwargs: Any
+    ) -> None:
+        from loguru import logger
+
+        # depth=2 attributes the record to the caller of debug()/info()/...
+        logger.opt(depth=2).log(level, message, *args, **kwargs)
+
+    def debug(self: Type["_Logger"], message: str, *args: Any, **kwargs: Any) -> None:
+        if self.enabled:
+            self._log("DEBUG", message, *args, **kwargs)
+
+    def info(self: Type["_Logger"], message: str, *args: Any, **kwargs: Any) -> None:
+        if self.enabled:
+            self._log("INFO", message, *args, **kwargs)
+
+    def warning(self: Type["_Logger"], message: str, *args: Any, **kwargs: Any) -> None:
+        if self.enabled:
+            self._log("WARNING", message, *args, **kwargs)
+
+    def error(self: Type["_Logger"], message: str, *args: Any, **kwargs: Any) -> None:
+        if self.enabled:
+            self._log("ERROR", message, *args, **kwargs)
+
+
+logger = _Logger()
+
+
+def enable_logging() -> None:
+    """
+    Starts passing the library's log records to loguru.
+
+    The level and destination are whatever the application configured in loguru,
+    e.g. logger.add(sys.stderr, level="INFO").
+    """
+    from loguru import logger as loguru_logger
+
+    loguru_logger.enable("ozon_api")
+    logger.enabled = True
+
+
+def disable_logging() -> None:
+    """
+    Stops logging, the log calls of the library become no-ops again.
+    """
+    logger.enabled = False
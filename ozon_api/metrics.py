@@ -0,0 +1,425 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Type
+
+import math
+import time
+
+if TYPE_CHECKING:
+    from aiohttp import TraceConfig
+
+
+@dataclass
+class EndpointRetryStats:
+    """
+    Counters of the resilience layer for a single endpoint.
+
+    requests: calls of _request.
+    attempts: HTTP requests actually sent, including retries.
+    retries: attempts repeated after a 5xx status, a timeout or a connection error.
+    throttled: attempts repeated after HTTP 429.
+    failures: calls that ended with an error.
+    rejected: calls refused by the open circuit breaker.
+    retry_wait: seconds spent sleeping in backoff between retries.
+    elapsed: seconds spent in _request in total.
+    """
+
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    throttled: int = 0
+    failures: int = 0
+    rejected: int = 0
+    retry_wait: float = 0.0
+    elapsed: float = 0.0
+
+
+@dataclass
+class RetryStats:
+    """
+    Resilience counters of an OzonAPI instance, grouped by endpoint.
+    """
+
+    endpoints: Dict[str, EndpointRetryStats] = field(default_factory=dict)
+
+    def endpoint(self: Type["RetryStats"], endpoint: str) -> EndpointRetryStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointRetryStats()
+        return stats
+
+    def total(self: Type["RetryStats"]) -> EndpointRetryStats:
+        """
+        Returns:
+            EndpointRetryStats: The counters summed over all endpoints.
+        """
+        total = EndpointRetryStats()
+        for stats in self.endpoints.values():
+            for name, value in asdict(stats).items():
+                setattr(total, name, getattr(total, name) + value)
+        return total
+
+    def snapshot(self: Type["RetryStats"]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns:
+            Dict[str, Dict[str, Any]]: A plain dict copy of the counters by endpoint.
+        """
+        return {endpoint: asdict(stats) for endpoint, stats in self.endpoints.items()}
+
+    def reset(self: Type["RetryStats"]) -> None:
+        self.endpoints.clear()
+
+
+# Upper bounds of the latency histogram buckets in seconds.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Connection phases measured by the aiohttp tracing hooks.
+PHASES: Tuple[str, ...] = ("pool_wait", "dns", "connect", "server")
+
+
+@dataclass(slots=True)
+class RequestSample:
+    """
+    Measurements of a single HTTP attempt, passed to MetricsSink.observe().
+
+    endpoint: the endpoint path without the API version.
+    status: the HTTP status, None when no response was received.
+    error: the exception class name when the attempt failed without a response.
+    bytes_sent, bytes_received: request and response body sizes.
+    latency: seconds from sending the request to reading the whole response.
+    pool_wait: seconds spent waiting for a free connection in the pool.
+    dns: seconds spent resolving the host name.
+    connect: seconds spent opening a new connection (TCP and TLS), without DNS.
+    server: seconds from sending the request headers to receiving the response headers.
+    """
+
+    endpoint: str
+    status: Optional[int] = None
+    error: Optional[str] = None
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    latency: float = 0.0
+    pool_wait: float = 0.0
+    dns: float = 0.0
+    connect: float = 0.0
+    server: float = 0.0
+    started: float = 0.0
+    marks: Dict[str, float] = field(default_factory=dict)
+
+    def finish(self: Type["RequestSample"]) -> "RequestSample":
+        self.latency = time.perf_counter() - self.started
+        # Creating a connection includes resolving the host.
+        self.connect = max(0.0, self.connect - self.dns)
+        return self
+
+
+class MetricsSink(ABC):
+    """
+    Receives a RequestSample for every HTTP attempt made by an OzonAPI instance.
+
+    Subclass and implement observe() to forward samples elsewhere, e.g. to StatsD.
+    observe() runs in the event loop after every attempt and must not block.
+    """
+
+    @abstractmethod
+    def observe(self: Type["MetricsSink"], sample: RequestSample) -> None:
+        """
+        Records the measurements of one attempt.
+        """
+
+
+class Histogram:
+    """
+    A cumulative histogram with fixed bucket bounds, as used by Prometheus.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(
+        self: Type["Histogram"], bounds: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self: Type["Histogram"], value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self: Type["Histogram"]) -> List[Tuple[float, int]]:
+        """
+        Returns:
+            List[Tuple[float, int]]: (upper bound, observations up to it) pairs, the last bound is inf.
+        """
+        total = 0
+        buckets = []
+        for bound, count in zip((*self.bounds, math.inf), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+    def quantile(self: Type["Histogram"], q: float) -> Optional[float]:
+        """
+        Estimates a quantile by linear interpolation inside its bucket.
+
+        Args:
+            q (float): The quantile, 0..1.
+
+        Returns:
+            Optional[float]: The estimate in seconds, None without observations.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for bound, count in zip((*self.bounds, math.inf), self.counts):
+            if count and seen + count >= rank:
+                if bound == math.inf:
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return lower
+
+
+@dataclass
+class EndpointMetrics:
+    """
+    Aggregated request metrics of a single endpoint.
+    """
+
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+    phases: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+
+    @property
+    def requests(self: Type["EndpointMetrics"]) -> int:
+        return self.latency.count
+
+
+class InMemoryMetrics(MetricsSink):
+    """
+    Keeps request counts, statuses, body sizes, a latency histogram and the time spent
+    in every connection phase by endpoint.
+
+    Usage:
+        metrics = InMemoryMetrics()
+        api = OzonAPI(client_id, api_key, metrics=metrics)
+        ...
+        print(metrics.snapshot()["product/list"]["latency"]["p99"])
+    """
+
+    def __init__(
+        self: Type["InMemoryMetrics"], buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        """
+        Args:
+            buckets (Sequence[float]): Upper bounds of the latency histogram buckets in seconds.
+                Defaults to DEFAULT_BUCKETS.
+        """
+        self.buckets = tuple(buckets)
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+
+    def observe(self: Type["InMemoryMetrics"], sample: RequestSample) -> None:
+        metrics = self.endpoints.get(sample.endpoint)
+        if metrics is None:
+            metrics = self.endpoints[sample.endpoint] = EndpointMetrics(
+                latency=Histogram(self.buckets)
+            )
+        if sample.status is not None:
+            metrics.statuses[sample.status] += 1
+        else:
+            metrics.errors[sample.error or "error"] += 1
+        metrics.bytes_sent += sample.bytes_sent
+        metrics.bytes_received += sample.bytes_received
+        metrics.latency.observe(sample.latency)
+        phases = metrics.phases
+        phases["pool_wait"] += sample.pool_wait
+        phases["dns"] += sample.dns
+        phases["connect"] += sample.connect
+        phases["server"] += sample.server
+
+    def snapshot(self: Type["InMemoryMetrics"]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns:
+            Dict[str, Dict[str, Any]]: A plain dict copy of the metrics by endpoint.
+        """
+        return {
+            endpoint: {
+                "requests": metrics.requests,
+                "statuses": dict(metrics.statuses),
+                "errors": dict(metrics.errors),
+                "bytes_sent": metrics.bytes_sent,
+                "bytes_received": metrics.bytes_received,
+                "latency": {
+                    "count": metrics.latency.count,
+                    "sum": metrics.latency.sum,
+                    "p50": metrics.latency.quantile(0.5),
+                    "p99": metrics.latency.quantile(0.99),
+                },
+                **metrics.phases,
+            }
+            for endpoint, metrics in self.endpoints.items()
+        }
+
+    def reset(self: Type["InMemoryMetrics"]) -> None:
+        self.endpoints.clear()
+
+
+class PrometheusExporter(InMemoryMetrics):
+    """
+    InMemoryMetrics that renders itself in the Prometheus text exposition format.
+
+    Usage:
+        exporter = PrometheusExporter()
+        api = OzonAPI(client_id, api_key, metrics=exporter)
+        ...
+        body = exporter.render()  # serve it on /metrics
+    """
+
+    def __init__(
+        self: Type["PrometheusExporter"],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        namespace: str = "ozon_api",
+    ) -> None:
+        """
+        Args:
+            buckets (Sequence[float]): Upper bounds of the latency histogram buckets in seconds.
+                Defaults to DEFAULT_BUCKETS.
+            namespace (str): The prefix of the metric names. Defaults to "ozon_api".
+        """
+        super().__init__(buckets)
+        self.namespace = namespace
+
+    def render(self: Type["PrometheusExporter"]) -> str:
+        """
+        Returns:
+            str: The metrics in the Prometheus text format, version 0.0.4.
+        """
+        ns = self.namespace
+        endpoints = sorted(self.endpoints.items())
+        lines: List[str] = []
+
+        def header(name: str, kind: str, text: str) -> str:
+            lines.append(f"# HELP {ns}_{name} {text}")
+            lines.append(f"# TYPE {ns}_{name} {kind}")
+            return f"{ns}_{name}"
+
+        name = header(
+            "requests_total", "counter", "HTTP attempts by endpoint and status."
+        )
+        for endpoint, metrics in endpoints:
+            label = _escape(endpoint)
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f'{name}{{endpoint="{label}",status="{status}"}} {count}')
+            for error, count in sorted(metrics.errors.items()):
+                lines.append(
+                    f'{name}{{endpoint="{label}",status="error",error="{_escape(error)}"}} {count}'
+                )
+
+        for attribute, text in (
+            ("bytes_sent", "Request body bytes sent."),
+            ("bytes_received", "Response body bytes received."),
+        ):
+            name = header(f"{attribute}_total", "counter", text)
+            for endpoint, metrics in endpoints:
+                value = getattr(metrics, attribute)
+                lines.append(f'{name}{{endpoint="{_escape(endpoint)}"}} {value}')
+
+        name = header(
+            "request_duration_seconds", "histogram", "Latency of HTTP attempts."
+        )
+        for endpoint, metrics in endpoints:
+            label = _escape(endpoint)
+            for bound, count in metrics.latency.cumulative():
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'{name}_bucket{{endpoint="{label}",le="{le}"}} {count}')
+            lines.append(f'{name}_sum{{endpoint="{label}"}} {metrics.latency.sum!r}')
+            lines.append(f'{name}_count{{endpoint="{label}"}} {metrics.latency.count}')
+
+        name = header(
+            "phase_seconds_total",
+            "counter",
+            "Time spent in connection phases of HTTP attempts.",
+        )
+        for endpoint, metrics in endpoints:
+            label = _escape(endpoint)
+            for phase, seconds in metrics.phases.items():
+                lines.append(
+                    f'{name}{{endpoint="{label}",phase="{phase}"}} {seconds!r}'
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def trace_config() -> "TraceConfig":
+    """
+    Builds aiohttp tracing hooks that fill the RequestSample passed as trace_request_ctx.
+
+    Requests without a sample are ignored.
+
+    Returns:
+        TraceConfig: The hooks for ClientSession(trace_configs=[...]).
+    """
+    from aiohttp import TraceConfig
+
+    def mark_start(name: str):
+        async def hook(session: Any, context: SimpleNamespace, params: Any) -> None:
+            sample = context.trace_request_ctx
+            if sample is not None:
+                sample.marks[name] = time.perf_counter()
+
+        return hook
+
+    def mark_end(name: str, phase: str):
+        async def hook(session: Any, context: SimpleNamespace, params: Any) -> None:
+            sample = context.trace_request_ctx
+            if sample is not None and name in sample.marks:
+                elapsed = time.perf_counter() - sample.marks.pop(name)
+                setattr(sample, phase, getattr(sample, phase) + elapsed)
+
+        return hook
+
+    async def on_chunk(session: Any, context: SimpleNamespace, params: Any) -> None:
+        sample = context.trace_request_ctx
+        if sample is not None:
+            sample.bytes_received += len(params.chunk)
+
+    config = TraceConfig()
+    config.on_connection_queued_start.append(mark_start("queued"))
+    config.on_connection_queued_end.append(mark_end("queued", "pool_wait"))
+    config.on_dns_resolvehost_start.append(mark_start("dns"))
+    config.on_dns_resolvehost_end.append(mark_end("dns", "dns"))
+    config.on_connection_create_start.append(mark_start("connect"))
+    config.on_connection_create_end.append(mark_end("connect", "connect"))
+    config.on_request_headers_sent.append(mark_start("server"))
+    config.on_request_end.append(mark_end("server", "server"))
+    config.on_response_chunk_received.append(on_chunk)
+    return config
@@ -1,3 +1,37 @@
-from ozon_api.models.import_by_sku import *
-from ozon_api.models.product_import_info import *
-from ozon_api.models.product_attributes_update import *
\ No newline at end of file
+"""
+Pydantic models of the request bodies.
+
+The submodules import pydantic, so they are loaded on first access to a model,
+e.g. `from ozon_api.models import ProductImport_Item`, not when the package is imported.
+"""
+
+from importlib import import_module
+from typing import Any
+
+_MODELS = {
+    "ImportBySku_Item": "import_by_sku",
+    "ImportBySku": "import_by_sku",
+    "ProductImportInfo": "product_import_info",
+    "ProductAttributesUpdate_Item_Attribute_Value": "product_attributes_update",
+    "ProductAttributesUpdate_Item_Attribute": "product_attributes_update",
+    "ProductAttributesUpdate_Item": "product_attributes_update",
+    "ProductAttributesUpdate": "product_attributes_update",
+    "ProductImport_Item_Attribute": "product_import",
+    "ProductImport_Item": "product_import",
+    "ProductImport": "product_import",
+}
+
+__all__ = list(_MODELS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODELS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,89 @@
+from typing import Any, Iterable, List, Type, TypeVar, Union
+
+from pydantic import BaseModel, TypeAdapter
+
+from ozon_api.models.import_by_sku import ImportBySku, ImportBySku_Item
+from ozon_api.models.product_attributes_update import (
+    ProductAttributesUpdate,
+    ProductAttributesUpdate_Item,
+)
+from ozon_api.models.product_import import ProductImport, ProductImport_Item
+
+M = TypeVar("M", bound=BaseModel)
+
+# Compiled once: validating a whole list through one adapter is much faster than
+# calling model_validate item by item.
+ProductImportItems = TypeAdapter(List[ProductImport_Item])
+ImportBySkuItems = TypeAdapter(List[ImportBySku_Item])
+ProductAttributesUpdateItems = TypeAdapter(List[ProductAttributesUpdate_Item])
+
+_ADAPTERS = {
+    ProductImport_Item: ProductImportItems,
+    ImportBySku_Item: ImportBySkuItems,
+    ProductAttributesUpdate_Item: ProductAttributesUpdateItems,
+}
+
+_WRAPPERS = (ProductImport, ImportBySku, ProductAttributesUpdate)
+
+
+def validate_items(model: Type[M], items: Iterable[Union[M, dict]]) -> List[M]:
+    """
+    Validates a batch of dicts and/or model instances in one pass.
+
+    Args:
+        model (Type[M]): ProductImport_Item, ImportBySku_Item or ProductAttributesUpdate_Item.
+        items (Iterable[Union[M, dict]]): The items. Model instances are not validated again.
+
+    Returns:
+        List[M]: The validated models.
+
+    Raises:
+        pydantic.ValidationError: Some items are invalid; the error lists all of them.
+    """
+    return _ADAPTERS[model].validate_python(list(items))
+
+
+def items_payload(
+    model: Type[BaseModel],
+    items: Union[BaseModel, Iterable[Union[BaseModel, dict]]],
+    trusted: bool = False,
+    dumps: Any = None,
+) -> bytes:
+    """
+    Builds the {"items": [...]} JSON body of an import/update request.
+
+    The items are validated as a batch, but the validated models are not what is sent:
+    plain dicts go out as they were given, so keys the models do not declare (e.g.
+    promotions or service_type) and unset defaults never change the payload. Model
+    instances are serialized by pydantic. In trusted mode validation is skipped.
+
+    Args:
+        model (Type[BaseModel]): The item model, e.g. ProductImport_Item.
+        items: The items, or a ProductImport / ImportBySku / ProductAttributesUpdate wrapper.
+        trusted (bool): Skip validation. Defaults to False.
+        dumps (Callable[[Any], bytes]): Encoder of plain dicts. Defaults to the stdlib codec.
+
+    Returns:
+        bytes: The request body.
+    """
+    if isinstance(items, _WRAPPERS):
+        items = items.items
+    items = list(items)
+    adapter = _ADAPTERS[model]
+
+    if not trusted:
+        adapter.validate_python(items)
+    if all(isinstance(item, BaseModel) for item in items):
+        encoded = adapter.dump_json(items)
+    else:
+        if dumps is None:
+            from ozon_api.codec import get_codec
+
+            dumps = get_codec("json").dumps
+        encoded = dumps(
+            [
+                item.model_dump(mode="json") if isinstance(item, BaseModel) else item
+                for item in items
+            ]
+        )
+    return b'{"items":' + encoded + b"}"
@@ -4,8 +4,14 @@ from pydantic import BaseModel, Field
 
 class ProductImport_Item_Attribute(BaseModel):
     complex_id: int
-    id: int = Field(description="Идентификатор характеристики.", title="Идентификатор характеристики")
-    values: list = Field(description="Массив вложенных значений характеристики.", title="Массив вложенных значений характеристики.")
+    id: int = Field(
+        description="Идентификатор характеристики.",
+        title="Идентификатор характеристики",
+    )
+    values: list = Field(
+        description="Массив вложенных значений характеристики.",
+        title="Массив вложенных значений характеристики.",
+    )
 
 
 class ProductImport_Item(BaseModel):
@@ -20,6 +26,10 @@ class ProductImport_Item(BaseModel):
         description="Новый идентификатор категории.",
         title="Новый идентификатор категории",
     )
+    type_id: int = Field(
+        description="Идентификатор типа товара.",
+        title="Идентификатор типа товара",
+    )
     color_image: str = Field(
         description="Маркетинговый цвет.", title="Маркетинговый цвет"
     )
@@ -63,4 +73,4 @@ class ProductImport_Item(BaseModel):
 
 
 class ProductImport(BaseModel):
-    items: list[ProductImport_Item] = Field(description="Товары", title="Товары")
\ No newline at end of file
+    items: list[ProductImport_Item] = Field(description="Товары", title="Товары")
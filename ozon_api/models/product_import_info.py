@@ -2,4 +2,7 @@ from pydantic import BaseModel, Field
 
 
 class ProductImportInfo(BaseModel):
-    task_id: int = Field(description="Идентификатор задачи импорта.", title="Идентификатор задачи импорта")
\ No newline at end of file
+    task_id: int = Field(
+        description="Идентификатор задачи импорта.",
+        title="Идентификатор задачи импорта",
+    )
@@ -0,0 +1,60 @@
+from typing import AsyncIterator, Optional, Tuple, TypeVar
+
+import asyncio
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+async def prefetched(source: AsyncIterator[T], depth: int = 1) -> AsyncIterator[T]:
+    """
+    Iterates `source` in a background task that runs up to `depth` items ahead of
+    the consumer, so the next page is downloaded while the current one is processed.
+
+    At most `depth` items are buffered, which keeps memory bounded. Errors of the
+    source are re-raised in the consumer; leaving the loop early cancels the source.
+
+    Args:
+        source (AsyncIterator[T]): The iterator to read ahead, usually a page generator.
+        depth (int): Number of items to read ahead, 0 disables the background task. Defaults to 1.
+
+    Yields:
+        T: The items of `source` in order.
+    """
+    if depth < 1:
+        async for item in source:
+            yield item
+        return
+
+    queue: asyncio.Queue[Tuple[object, Optional[BaseException]]] = asyncio.Queue(depth)
+
+    async def produce() -> None:
+        try:
+            async for item in source:
+                await queue.put((item, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            await queue.put((_DONE, error))
+        else:
+            await queue.put((_DONE, None))
+        finally:
+            # Cancelled while waiting for room in the queue, the source is suspended at a
+            # yield and would only be finalized by the garbage collector.
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
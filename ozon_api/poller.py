@@ -0,0 +1,262 @@
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+import asyncio
+import itertools
+import time
+
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+
+
+@dataclass
+class _Watch:
+    started: float
+    polls: int = 0
+    progress: Optional[float] = None
+
+
+class StatusPoller(Generic[K, R]):
+    """
+    Polls the status of many asynchronous Ozon tasks from one background loop.
+
+    Every watched key (a task ID, a product ID, ...) gets a future that resolves with
+    the first status for which `is_done` returns True; the key is not polled after that.
+    Keys are polled with exponential backoff from `min_interval` to `max_interval`; when
+    `progress` reports that a task advanced since the previous poll, its interval is
+    reset, so active tasks are polled often and stalled ones rarely. Keys that become
+    due close to each other are checked together, up to `batch_size` per call.
+
+    The loop starts with the first watch() and stops by itself when nothing is left.
+    """
+
+    def __init__(
+        self: Type["StatusPoller"],
+        check: Callable[[List[K]], Awaitable[Dict[K, Union[R, BaseException]]]],
+        is_done: Callable[[R], bool],
+        progress: Optional[Callable[[R], Optional[float]]] = None,
+        batch_size: int = 1,
+        concurrency: int = 4,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            check (Callable[[List[K]], Awaitable[Dict[K, R]]]): Fetches the statuses of a batch of keys.
+                Keys missing from the returned dict are considered pending, a key mapped to an
+                exception fails its watch with that exception.
+            is_done (Callable[[R], bool]): Whether a status is final.
+            progress (Optional[Callable[[R], Optional[float]]]): The share of work done in a status, 0..1.
+            batch_size (int): Maximum keys per check call. Defaults to 1.
+            concurrency (int): Maximum check calls in flight. Defaults to 4.
+            min_interval (float): The first and the smallest poll interval in seconds. Defaults to 1.0.
+            max_interval (float): The largest poll interval in seconds. Defaults to 30.0.
+            backoff (float): The interval multiplier for a task without progress. Defaults to 1.5.
+            timeout (Optional[float]): Seconds after which a watch fails with asyncio.TimeoutError,
+                None waits forever. Defaults to None.
+        """
+        self.check = check
+        self.is_done = is_done
+        self.progress = progress
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.__futures: Dict[K, asyncio.Future] = {}
+        self.__waiters: Dict[K, int] = {}
+        self.__watches: Dict[K, _Watch] = {}
+        self.__schedule: List[Tuple[float, int, K]] = []
+        self.__sequence = itertools.count()
+        self.__wakeup: Optional[asyncio.Event] = None
+        self.__runner: Optional[asyncio.Task] = None
+        self.__polls: Set[asyncio.Task] = set()
+
+    def __len__(self: Type["StatusPoller"]) -> int:
+        return len(self.__futures)
+
+    def watch(self: Type["StatusPoller"], key: K) -> "asyncio.Future[R]":
+        """
+        Starts tracking a key. Watching a key that is already tracked returns the same future.
+
+        Returns:
+            asyncio.Future[R]: Resolves with the final status of the key.
+        """
+        future = self.__futures.get(key)
+        if future is not None:
+            return future
+
+        future = asyncio.get_running_loop().create_future()
+        now = time.monotonic()
+        self.__futures[key] = future
+        self.__watches[key] = _Watch(started=now)
+        self._schedule(key, now + self.min_interval)
+
+        if self.__runner is None or self.__runner.done():
+            self.__wakeup = asyncio.Event()
+            self.__runner = asyncio.ensure_future(self._run())
+        else:
+            self.__wakeup.set()
+        return future
+
+    async def wait(self: Type["StatusPoller"], key: K) -> R:
+        """
+        Waits for the final status of a key. Cancelling one waiter does not affect the
+        others; when the last waiter of a key is cancelled, the key is no longer polled.
+
+        Returns:
+            R: The final status of the key.
+        """
+        future = self.watch(key)
+        self.__waiters[key] = self.__waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self.__waiters[key] -= 1
+            if not self.__waiters[key]:
+                del self.__waiters[key]
+                if not future.done():
+                    future.cancel()
+                    if self.__futures.get(key) is future:
+                        self._finish(key)
+
+    async def close(self: Type["StatusPoller"]) -> None:
+        """
+        Stops polling and cancels the futures of all tracked keys.
+        """
+        for task in (self.__runner, *self.__polls):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(
+            *(task for task in (self.__runner, *self.__polls) if task is not None),
+            return_exceptions=True,
+        )
+        for future in self.__futures.values():
+            future.cancel()
+        self.__futures.clear()
+        self.__watches.clear()
+        self.__schedule.clear()
+        self.__runner = None
+
+    def _schedule(self: Type["StatusPoller"], key: K, due: float) -> None:
+        heappush(self.__schedule, (due, next(self.__sequence), key))
+
+    def _interval(self: Type["StatusPoller"], watch: _Watch) -> float:
+        return min(self.max_interval, self.min_interval * self.backoff**watch.polls)
+
+    def _finish(self: Type["StatusPoller"], key: K) -> Optional[asyncio.Future]:
+        self.__watches.pop(key, None)
+        return self.__futures.pop(key, None)
+
+    async def _run(self: Type["StatusPoller"]) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while self.__futures:
+            # Keys due within half of the smallest interval are taken along to fill batches.
+            now = time.monotonic()
+            horizon = now + (self.min_interval / 2 if self.batch_size > 1 else 0)
+            due: List[K] = []
+            while self.__schedule and self.__schedule[0][0] <= horizon:
+                _, _, key = heappop(self.__schedule)
+                future = self.__futures.get(key)
+                if future is None:
+                    continue
+                if future.done():
+                    # Cancelled from outside, nobody waits for the status any more.
+                    self._finish(key)
+                    continue
+                due.append(key)
+
+            for start in range(0, len(due), self.batch_size):
+                await semaphore.acquire()
+                task = asyncio.ensure_future(
+                    self._poll(due[start : start + self.batch_size], semaphore)
+                )
+                self.__polls.add(task)
+                task.add_done_callback(self.__polls.discard)
+
+            delay = (
+                self.__schedule[0][0] - time.monotonic() if self.__schedule else None
+            )
+            self.__wakeup.clear()
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self.__wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _poll(
+        self: Type["StatusPoller"], keys: List[K], semaphore: asyncio.Semaphore
+    ) -> None:
+        try:
+            statuses = await self.check(keys)
+        except Exception as error:
+            for key in keys:
+                future = self._finish(key)
+                if future is not None and not future.done():
+                    future.set_exception(error)
+            return
+        finally:
+            semaphore.release()
+            self.__wakeup.set()
+
+        now = time.monotonic()
+        for key in keys:
+            watch = self.__watches.get(key)
+            if watch is None:
+                continue
+
+            status = statuses.get(key)
+            if isinstance(status, BaseException):
+                future = self._finish(key)
+                if not future.done():
+                    future.set_exception(status)
+                continue
+
+            if status is not None and self.is_done(status):
+                future = self._finish(key)
+                if not future.done():
+                    future.set_result(status)
+                continue
+
+            if self.timeout is not None and now - watch.started >= self.timeout:
+                future = self._finish(key)
+                if not future.done():
+                    future.set_exception(
+                        asyncio.TimeoutError(
+                            f"{key!r} is not finished after {self.timeout}s"
+                        )
+                    )
+                continue
+
+            progress = (
+                self.progress(status) if self.progress and status is not None else None
+            )
+            if (
+                progress is not None
+                and watch.progress is not None
+                and progress > watch.progress
+            ):
+                watch.polls = 0
+            else:
+                watch.polls += 1
+            if progress is not None:
+                watch.progress = progress
+            self._schedule(key, now + self._interval(watch))
@@ -0,0 +1,188 @@
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+import asyncio
+
+from ozon_api import OzonAPI
+from ozon_api.ratelimit import FairLimiter, RateLimiter
+from ozon_api.utils import gather_or_cancel
+
+
+class OzonAPIPool:
+    """
+    Clients of many seller accounts sharing one connection pool and one scheduler.
+
+    Every account gets its own OzonAPI instance with its own credentials, retry counters and
+    circuit breaker. All of them send requests over a single TCPConnector and are paced by
+    a single RateLimiter, which keeps separate buckets per Client-Id, so per-account quotas
+    still hold. A FairLimiter caps the requests in flight per account and over all accounts,
+    and optionally the total request rate, and hands free slots to the accounts round-robin.
+
+    The clients are created on first access, inside the running event loop.
+
+    Usage:
+        async with OzonAPIPool([(client_id, api_key), ...], concurrency=50) as pool:
+            products = await pool.map(lambda api: api.product_list({"filter": {}, "limit": 1000}))
+    """
+
+    def __init__(
+        self: Type["OzonAPIPool"],
+        accounts: Optional[Iterable[Tuple[str, str]]] = None,
+        concurrency: int = 100,
+        per_account_concurrency: Optional[int] = 10,
+        rate: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        limit: int = 100,
+        keepalive_timeout: float = 30.0,
+        ttl_dns_cache: Optional[int] = 300,
+        **client_options: Any,
+    ) -> None:
+        """
+        Args:
+            accounts (Optional[Iterable[Tuple[str, str]]]): (client_id, api_key) pairs. More can be added with add().
+            concurrency (int): Requests in flight over all accounts. Defaults to 100.
+            per_account_concurrency (Optional[int]): Requests in flight per account. Defaults to 10.
+            rate (Optional[float]): Requests per second over all accounts, None for no global rate. Defaults to None.
+            rate_limiter (Optional[RateLimiter]): Per-account pacing shared by all clients, see
+                RateLimiter.set_rate(client_id=...). Defaults to a RateLimiter with default settings.
+            limit (int): Connections in the shared pool. Defaults to 100.
+            keepalive_timeout (float): Seconds an idle connection is kept open. Defaults to 30.0.
+            ttl_dns_cache (Optional[int]): Seconds to cache resolved DNS entries. Defaults to 300.
+            **client_options: Other OzonAPI arguments applied to every client, e.g. cache, metrics
+                or retry_policies.
+        """
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.fair_limiter = FairLimiter(concurrency, per_account_concurrency, rate)
+        self.__connector_options = {
+            "limit": limit,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": ttl_dns_cache,
+            "use_dns_cache": ttl_dns_cache is not None,
+        }
+        self.__client_options = client_options
+        self.__connector = None
+        self.__accounts: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self.__clients: Dict[str, OzonAPI] = {}
+        for client_id, api_key in accounts or ():
+            self.add(client_id, api_key)
+
+    async def __aenter__(self: Type["OzonAPIPool"]) -> "OzonAPIPool":
+        return self
+
+    async def __aexit__(self: Type["OzonAPIPool"], *exc_info: Any) -> None:
+        await self.close()
+
+    def __len__(self: Type["OzonAPIPool"]) -> int:
+        return len(self.__accounts)
+
+    def __iter__(self: Type["OzonAPIPool"]) -> Iterator[str]:
+        return iter(list(self.__accounts))
+
+    def __contains__(self: Type["OzonAPIPool"], client_id: object) -> bool:
+        return client_id in self.__accounts
+
+    def __getitem__(self: Type["OzonAPIPool"], client_id: str) -> OzonAPI:
+        return self.get(client_id)
+
+    def add(
+        self: Type["OzonAPIPool"], client_id: str, api_key: str, **options: Any
+    ) -> None:
+        """
+        Registers an account. Registering a Client-Id again replaces its key and options
+        for clients created afterwards.
+
+        Args:
+            client_id (str): The Client-Id of the account.
+            api_key (str): The Api-Key of the account.
+            **options: OzonAPI arguments for this account only, on top of the pool's client_options.
+        """
+        self.__accounts[client_id] = (api_key, options)
+
+    async def remove(self: Type["OzonAPIPool"], client_id: str) -> None:
+        """
+        Unregisters an account and closes its client.
+        """
+        self.__accounts.pop(client_id, None)
+        client = self.__clients.pop(client_id, None)
+        if client is not None:
+            await client.close()
+
+    def get(self: Type["OzonAPIPool"], client_id: str) -> OzonAPI:
+        """
+        Returns the client of an account, creating it on first access. Must be called
+        inside the running event loop.
+
+        Raises:
+            KeyError: The account is not registered.
+        """
+        client = self.__clients.get(client_id)
+        if client is None:
+            api_key, options = self.__accounts[client_id]
+            client = OzonAPI(
+                client_id,
+                api_key,
+                connector=self._connector(),
+                rate_limiter=self.rate_limiter,
+                fair_limiter=self.fair_limiter,
+                **{**self.__client_options, **options},
+            )
+            self.__clients[client_id] = client
+        return client
+
+    def _connector(self: Type["OzonAPIPool"]) -> Any:
+        from aiohttp import TCPConnector
+
+        if self.__connector is None or self.__connector.closed:
+            self.__connector = TCPConnector(**self.__connector_options)
+        return self.__connector
+
+    async def map(
+        self: Type["OzonAPIPool"],
+        function: Callable[[OzonAPI], Awaitable[Any]],
+        client_ids: Optional[Iterable[str]] = None,
+        return_exceptions: bool = True,
+    ) -> Dict[str, Union[Any, BaseException]]:
+        """
+        Runs a job for many accounts at once, e.g. to collect the product lists of all shops.
+
+        The jobs start together; their requests are throttled by the pool's limits, so the
+        number of accounts does not change how hard the API is hit.
+
+        Args:
+            function (Callable[[OzonAPI], Awaitable[Any]]): The job, called with the client of every account.
+            client_ids (Optional[Iterable[str]]): The accounts. Defaults to all registered accounts.
+            return_exceptions (bool): Put a failed job's exception into the result instead of
+                cancelling the other jobs and raising it. Defaults to True.
+
+        Returns:
+            Dict[str, Union[Any, BaseException]]: The job results by Client-Id.
+        """
+        ids = list(client_ids) if client_ids is not None else list(self.__accounts)
+        jobs = [function(self.get(client_id)) for client_id in ids]
+        if return_exceptions:
+            results = await asyncio.gather(*jobs, return_exceptions=True)
+        else:
+            results = await gather_or_cancel(jobs)
+        return dict(zip(ids, results))
+
+    async def close(self: Type["OzonAPIPool"]) -> None:
+        """
+        Closes the clients and the shared connector. The pool can still be used
+        afterwards; new clients and a new connector are created on next access.
+        """
+        clients, self.__clients = self.__clients, {}
+        for client in clients.values():
+            await client.close()
+        connector, self.__connector = self.__connector, None
+        if connector is not None and not connector.closed:
+            await connector.close()
@@ -0,0 +1,353 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Literal, Optional, Type
+
+import asyncio
+import math
+import time
+
+from ozon_api.exceptions import QuotaExceededError
+from ozon_api.log import logger
+
+QuotaKind = Literal["create", "update"]
+
+# The sections of the product/info/limit response by kind of work.
+SECTIONS: Dict[str, str] = {"create": "daily_create", "update": "daily_update"}
+
+# The daily limits are reset once a day at reset_at.
+WINDOW = timedelta(days=1)
+
+
+@dataclass
+class QuotaWindow:
+    """
+    One limit of product/info/limit: how many products may be created or updated.
+
+    A limit of 0 or less means that Ozon reported no limit.
+    """
+
+    limit: int
+    usage: int = 0
+    reset_at: Optional[datetime] = None
+
+    @property
+    def remaining(self: Type["QuotaWindow"]) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: Products left until the reset, None when there is no limit.
+        """
+        if self.limit <= 0:
+            return None
+        return max(self.limit - self.usage, 0)
+
+
+def parse_window(section: Optional[Dict[str, Any]]) -> QuotaWindow:
+    """
+    Returns:
+        QuotaWindow: A daily_create, daily_update or total section of product/info/limit.
+    """
+    section = section or {}
+    reset_at = section.get("reset_at")
+    if reset_at:
+        # fromisoformat() of Python 3.10 does not accept the "Z" suffix.
+        reset_at = datetime.fromisoformat(reset_at.replace("Z", "+00:00"))
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return QuotaWindow(
+        limit=int(section.get("limit") or 0),
+        usage=int(section.get("usage") or 0),
+        reset_at=reset_at or None,
+    )
+
+
+class QuotaScheduler:
+    """
+    Keeps product_import, product_import_by_sku and product_attributes_update within the
+    daily product quotas of an account (product/info/limit).
+
+    The limits are fetched on first use and refreshed every `refresh_interval` seconds and
+    after every reset. In between, every item sent is counted locally, so concurrent jobs
+    see each other's usage without asking the API. Work that does not fit the rest of the
+    day waits, in order, until the quota is reset instead of being rejected by Ozon, and
+    bulk imports are split so that the last free slots of a day are used too.
+
+    product_import and product_import_by_sku count against daily_create (and the total
+    limit), product_attributes_update against daily_update.
+
+    A scheduler belongs to one account; give every OzonAPI its own.
+
+    Usage:
+        api = OzonAPI(client_id, api_key, quota=QuotaScheduler())
+        print(await api.quota.estimate("create", 25000))
+        async for result in api.product_import_bulk(items):
+            ...
+    """
+
+    def __init__(
+        self: Type["QuotaScheduler"],
+        fetch: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+        refresh_interval: float = 300.0,
+        reserve: int = 0,
+        reset_grace: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            fetch (Optional[Callable[[], Awaitable[Dict[str, Any]]]]): Returns the product/info/limit
+                response. Defaults to product_info_limit of the OzonAPI the scheduler is given to.
+            refresh_interval (float): Seconds the fetched limits are trusted. Defaults to 300.
+            reserve (int): Products of every daily limit left free, e.g. for edits in the seller's
+                personal account. Defaults to 0.
+            reset_grace (float): Seconds to wait past reset_at before the limits are fetched again.
+                Defaults to 5.
+        """
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.reserve = reserve
+        self.reset_grace = reset_grace
+
+        self.__windows: Dict[str, QuotaWindow] = {}
+        self.__total: Optional[QuotaWindow] = None
+        self.__fetched_at: Optional[float] = None
+        self.__refresh_lock = asyncio.Lock()
+        self.__locks: Dict[str, asyncio.Lock] = {}
+        self.__queued: Dict[str, int] = {kind: 0 for kind in SECTIONS}
+        self.__sent: Dict[str, int] = {kind: 0 for kind in SECTIONS}
+
+    def _stale(self: Type["QuotaScheduler"]) -> bool:
+        if self.__fetched_at is None:
+            return True
+        if time.monotonic() - self.__fetched_at >= self.refresh_interval:
+            return True
+        now = datetime.now(timezone.utc)
+        return any(
+            window.reset_at is not None and window.reset_at <= now
+            for window in self.__windows.values()
+        )
+
+    async def refresh(self: Type["QuotaScheduler"], force: bool = False) -> None:
+        """
+        Fetches the limits when they are stale, or always with `force`.
+
+        Items counted locally that Ozon does not report yet are kept until the window is reset.
+        """
+        async with self.__refresh_lock:
+            if not force and not self._stale():
+                return
+            if self.fetch is None:
+                raise RuntimeError(
+                    "QuotaScheduler has no fetch function, pass it to an OzonAPI"
+                )
+            response = await self.fetch()
+            if isinstance(response, dict) and isinstance(response.get("result"), dict):
+                response = response["result"]
+            self.update(response)
+
+    def update(self: Type["QuotaScheduler"], response: Dict[str, Any]) -> None:
+        """
+        Applies a product/info/limit response fetched elsewhere.
+        """
+        for kind, section in SECTIONS.items():
+            window = parse_window(response.get(section))
+            previous = self.__windows.get(kind)
+            if previous is not None and previous.reset_at == window.reset_at:
+                window.usage = max(window.usage, previous.usage)
+            self.__windows[kind] = window
+        total = parse_window(response.get("total"))
+        if self.__total is not None:
+            total.usage = max(total.usage, self.__total.usage)
+        self.__total = total
+        self.__fetched_at = time.monotonic()
+
+    def _available(self: Type["QuotaScheduler"], kind: str) -> Optional[int]:
+        window = self.__windows.get(kind)
+        available = None
+        if window is not None and window.remaining is not None:
+            available = max(window.remaining - self.reserve, 0)
+        if (
+            kind == "create"
+            and self.__total is not None
+            and self.__total.remaining is not None
+        ):
+            total = self.__total.remaining
+            available = total if available is None else min(available, total)
+        return available
+
+    def _check_possible(self: Type["QuotaScheduler"], kind: str, count: int) -> None:
+        window = self.__windows.get(kind)
+        if (
+            window is not None
+            and window.limit > 0
+            and count > window.limit - self.reserve
+        ):
+            raise QuotaExceededError(
+                f"{count} products never fit the {SECTIONS[kind]} limit of {window.limit}",
+                "product/info/limit",
+                body=window,
+            )
+        total = self.__total
+        if kind == "create" and total is not None and total.remaining is not None:
+            if count > total.remaining:
+                raise QuotaExceededError(
+                    f"The total limit of {total.limit} products is reached",
+                    "product/info/limit",
+                    body=total,
+                )
+
+    def _count(self: Type["QuotaScheduler"], kind: str, count: int) -> None:
+        self.__windows[kind].usage += count
+        if kind == "create" and self.__total is not None:
+            self.__total.usage += count
+        self.__sent[kind] += count
+
+    async def take(
+        self: Type["QuotaScheduler"], kind: QuotaKind, count: int, partial: bool = False
+    ) -> int:
+        """
+        Waits until `count` products of a kind fit the quota and counts them as used.
+
+        Callers are served in order; while the quota of a day is exhausted, the first of them
+        sleeps until reset_at and the others queue behind it.
+
+        Args:
+            kind (QuotaKind): "create" or "update".
+            count (int): The number of products to send.
+            partial (bool): Grant what is left of the current day, at least one product, instead
+                of waiting for all of them to fit. Defaults to False.
+
+        Returns:
+            int: The number of products granted, `count` unless `partial`.
+
+        Raises:
+            QuotaExceededError: The products can never fit: more than the daily limit at once, or
+                the total limit of products is reached.
+        """
+        if count <= 0:
+            return 0
+        lock = self.__locks.setdefault(kind, asyncio.Lock())
+        self.__queued[kind] += count
+        try:
+            async with lock:
+                while True:
+                    await self.refresh()
+                    if kind not in self.__windows:
+                        # The response had no such section; there is nothing to keep to.
+                        self.__windows[kind] = QuotaWindow(limit=0)
+                    available = self._available(kind)
+                    needed = 1 if partial else count
+                    if available is None or available >= needed:
+                        granted = count if available is None else min(count, available)
+                        self._count(kind, granted)
+                        return granted
+
+                    self._check_possible(kind, needed)
+                    await self._wait_for_reset(kind, count)
+        finally:
+            self.__queued[kind] -= count
+
+    async def acquire(
+        self: Type["QuotaScheduler"], kind: QuotaKind, count: int
+    ) -> None:
+        """
+        Waits until all `count` products fit, see take().
+        """
+        await self.take(kind, count)
+
+    def release(self: Type["QuotaScheduler"], kind: QuotaKind, count: int) -> None:
+        """
+        Returns products that were counted but not accepted by the API.
+        """
+        window = self.__windows.get(kind)
+        if window is not None:
+            window.usage = max(window.usage - count, 0)
+        if kind == "create" and self.__total is not None:
+            self.__total.usage = max(self.__total.usage - count, 0)
+        self.__sent[kind] = max(self.__sent[kind] - count, 0)
+
+    async def _wait_for_reset(
+        self: Type["QuotaScheduler"], kind: str, count: int
+    ) -> None:
+        window = self.__windows[kind]
+        if window.reset_at is None:
+            delay = self.refresh_interval
+        else:
+            delay = (window.reset_at - datetime.now(timezone.utc)).total_seconds()
+            delay = max(delay, 0.0) + self.reset_grace
+        logger.info(
+            "The {} quota is exhausted ({}/{}), {} products wait until {}",
+            SECTIONS[kind],
+            window.usage,
+            window.limit,
+            self.__queued[kind],
+            window.reset_at,
+        )
+        await asyncio.sleep(delay)
+        await self.refresh(force=True)
+
+    def project(
+        self: Type["QuotaScheduler"], kind: QuotaKind, count: int, queued: bool = True
+    ) -> Optional[datetime]:
+        """
+        Projects when `count` more products of a kind can be sent, from the limits already fetched.
+
+        Args:
+            kind (QuotaKind): "create" or "update".
+            count (int): The number of products.
+            queued (bool): Count the products already waiting for the quota as sent first. Defaults to True.
+
+        Returns:
+            Optional[datetime]: The time (UTC) the last of them fits the quota: now when they fit today,
+            otherwise a future reset. None when they never fit, or the limits are not fetched yet.
+        """
+        window = self.__windows.get(kind)
+        if window is None:
+            return None
+        now = datetime.now(timezone.utc)
+        count += self.__queued[kind] if queued else 0
+        if (
+            kind == "create"
+            and self.__total is not None
+            and self.__total.remaining is not None
+        ):
+            if count > self.__total.remaining:
+                return None
+        available = self._available(kind)
+        if available is None or count <= available:
+            return now
+        per_window = window.limit - self.reserve
+        if per_window <= 0 or window.reset_at is None:
+            return None
+        windows = math.ceil((count - available) / per_window)
+        return window.reset_at + (windows - 1) * WINDOW
+
+    async def estimate(
+        self: Type["QuotaScheduler"], kind: QuotaKind, count: int
+    ) -> Optional[datetime]:
+        """
+        Fetches the limits when they are stale and projects when `count` products can be sent, see project().
+        """
+        await self.refresh()
+        return self.project(kind, count)
+
+    def status(self: Type["QuotaScheduler"]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns:
+            Dict[str, Dict[str, Any]]: By kind ("create", "update") and "total": limit, usage,
+            remaining, reset_at, the products queued for the quota and those sent by this scheduler.
+        """
+        status = {}
+        for kind, window in self.__windows.items():
+            status[kind] = {
+                "limit": window.limit,
+                "usage": window.usage,
+                "remaining": window.remaining,
+                "reset_at": window.reset_at,
+                "queued": self.__queued[kind],
+                "sent": self.__sent[kind],
+            }
+        if self.__total is not None:
+            status["total"] = {
+                "limit": self.__total.limit,
+                "usage": self.__total.usage,
+                "remaining": self.__total.remaining,
+            }
+        return status
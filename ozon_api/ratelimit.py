@@ -0,0 +1,349 @@
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, Optional, Tuple, Type, Union
+
+import asyncio
+import time
+
+DEFAULT_GROUP = "default"
+
+
+class TokenBucket:
+    """
+    An adaptive async token bucket.
+
+    The bucket refills at `rate` tokens per second up to `burst` tokens. When the API
+    answers with HTTP 429 the rate is cut by `decrease_factor` and the bucket is paused
+    for the Retry-After period; every successful request then raises the rate again by
+    `recovery_step` of the configured maximum (additive increase, multiplicative decrease).
+    """
+
+    def __init__(
+        self: Type["TokenBucket"],
+        rate: float,
+        burst: Optional[float] = None,
+        min_rate: float = 1.0,
+        decrease_factor: float = 0.5,
+        recovery_step: float = 0.05,
+    ) -> None:
+        """
+        Args:
+            rate (float): The maximum number of requests per second.
+            burst (Optional[float]): The bucket capacity. Defaults to `rate`.
+            min_rate (float): The rate is never lowered below this value. Defaults to 1.0.
+            decrease_factor (float): The rate multiplier applied on HTTP 429. Defaults to 0.5.
+            recovery_step (float): The share of the maximum rate restored per successful request. Defaults to 0.05.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.min_rate = min(min_rate, rate)
+        self.decrease_factor = decrease_factor
+        self.recovery_step = recovery_step
+
+        self.__tokens = self.burst
+        self.__updated = time.monotonic()
+        self.__blocked_until = 0.0
+        self.__lock: Optional[asyncio.Lock] = None
+        self.__lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _lock(self: Type["TokenBucket"]) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self.__lock is None or self.__lock_loop is not loop:
+            self.__lock = asyncio.Lock()
+            self.__lock_loop = loop
+        return self.__lock
+
+    def _refill(self: Type["TokenBucket"], now: float) -> None:
+        elapsed = now - self.__updated
+        self.__updated = now
+        self.__tokens = min(self.burst, self.__tokens + elapsed * self.rate)
+
+    async def acquire(self: Type["TokenBucket"]) -> None:
+        """
+        Waits until a request may be sent. Waiters are served in FIFO order.
+        """
+        async with self._lock():
+            while True:
+                now = time.monotonic()
+                if now < self.__blocked_until:
+                    await asyncio.sleep(self.__blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.__tokens) / self.rate)
+
+    def throttle(
+        self: Type["TokenBucket"], retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Slows the bucket down after the API answered with HTTP 429.
+
+        Concurrent 429 responses for the same pause only lower the rate once.
+
+        Args:
+            retry_after (Optional[float]): Seconds to pause, usually taken from the Retry-After header.
+        """
+        now = time.monotonic()
+        if now >= self.__blocked_until:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        pause = retry_after if retry_after is not None else 1 / self.rate
+        self.__blocked_until = max(self.__blocked_until, now + pause)
+        self.__tokens = 0.0
+        self.__updated = now
+
+    def recover(self: Type["TokenBucket"]) -> None:
+        """
+        Ramps the rate back up towards the maximum after a successful request.
+        """
+        if self.rate < self.max_rate:
+            self.rate = min(
+                self.max_rate, self.rate + self.max_rate * self.recovery_step
+            )
+
+
+class RateLimiter:
+    """
+    A set of token buckets, one per (Client-Id, endpoint group).
+
+    Endpoint groups are endpoint path prefixes such as "product/import" and match on
+    whole path segments, so "product/import" covers "product/import/info" but not
+    "product/import-by-sku". Endpoints matching no group fall into the default group.
+    One limiter may be shared by several OzonAPI instances; every Client-Id still gets
+    its own buckets, as Ozon counts quotas per seller account.
+    """
+
+    def __init__(
+        self: Type["RateLimiter"],
+        rate: float = 50.0,
+        groups: Optional[Dict[str, float]] = None,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        **bucket_options: float,
+    ) -> None:
+        """
+        Args:
+            rate (float): Requests per second for the default group. Defaults to 50.0.
+            groups (Optional[Dict[str, float]]): Requests per second by endpoint prefix, e.g. {"product/import": 10}.
+            burst (Optional[float]): The bucket capacity. Defaults to the rate of the bucket.
+            max_retries (int): How many times a request rejected with HTTP 429 is resent. Defaults to 5.
+            **bucket_options: min_rate, decrease_factor and recovery_step passed to every TokenBucket.
+        """
+        self.burst = burst
+        self.max_retries = max_retries
+        self.__bucket_options = bucket_options
+        self.__rates: Dict[Tuple[Optional[str], str], float] = {
+            (None, DEFAULT_GROUP): rate
+        }
+        for group, group_rate in (groups or {}).items():
+            self.__rates[(None, group.strip("/"))] = group_rate
+        self.__buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    def set_rate(
+        self: Type["RateLimiter"],
+        rate: float,
+        group: str = DEFAULT_GROUP,
+        client_id: Optional[str] = None,
+    ) -> None:
+        """
+        Sets the rate of an endpoint group, either for all accounts or for one Client-Id.
+
+        Args:
+            rate (float): Requests per second.
+            group (str): The endpoint prefix or "default". Defaults to "default".
+            client_id (Optional[str]): Limit the setting to this Client-Id. Defaults to None (all accounts).
+        """
+        group = group.strip("/")
+        self.__rates[(client_id, group)] = rate
+        for bucket_client, bucket_group in list(self.__buckets):
+            if bucket_group == group and client_id in (None, bucket_client):
+                del self.__buckets[(bucket_client, bucket_group)]
+
+    def group_of(
+        self: Type["RateLimiter"], endpoint: str, client_id: Optional[str] = None
+    ) -> str:
+        """
+        Returns the group an endpoint belongs to: the longest configured matching prefix.
+        """
+        endpoint = endpoint.strip("/")
+        best, best_length = DEFAULT_GROUP, -1
+        for owner, group in self.__rates:
+            if group == DEFAULT_GROUP or owner not in (None, client_id):
+                continue
+            matches = endpoint == group or endpoint.startswith(group + "/")
+            if matches and len(group) > best_length:
+                best, best_length = group, len(group)
+        return best
+
+    def bucket(self: Type["RateLimiter"], client_id: str, endpoint: str) -> TokenBucket:
+        """
+        Returns the bucket that paces requests of a Client-Id to an endpoint.
+        """
+        group = self.group_of(endpoint, client_id)
+        key = (client_id, group)
+        bucket = self.__buckets.get(key)
+        if bucket is None:
+            for candidate in (key, (None, group), (client_id, DEFAULT_GROUP)):
+                rate = self.__rates.get(candidate)
+                if rate is not None:
+                    break
+            else:
+                rate = self.__rates[(None, DEFAULT_GROUP)]
+            bucket = TokenBucket(rate, self.burst, **self.__bucket_options)
+            self.__buckets[key] = bucket
+        return bucket
+
+
+class FairLimiter:
+    """
+    Shares a global number of in-flight requests, and optionally a global request rate,
+    between several seller accounts.
+
+    Every account may have at most `per_account` requests in flight. When all
+    `concurrency` slots are busy, released slots are handed to the waiting accounts in
+    round-robin order, so an account with thousands of queued requests cannot starve
+    the others. Requests of one account are served in FIFO order.
+
+    One limiter is shared by all clients of an OzonAPIPool and is bound to one event loop.
+    """
+
+    def __init__(
+        self: Type["FairLimiter"],
+        concurrency: int = 100,
+        per_account: Optional[int] = 10,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            concurrency (int): Requests in flight over all accounts. Defaults to 100.
+            per_account (Optional[int]): Requests in flight per account, None means no own limit. Defaults to 10.
+            rate (Optional[float]): Requests per second over all accounts, None means no global rate.
+                Defaults to None.
+            burst (Optional[float]): The capacity of the global bucket. Defaults to `rate`.
+        """
+        self.concurrency = concurrency
+        self.per_account = per_account
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+
+        self.__in_flight: Dict[str, int] = {}
+        self.__total = 0
+        self.__waiters: Dict[str, Deque[asyncio.Future]] = {}
+        self.__ready: Deque[str] = deque()
+
+    @property
+    def in_flight(self: Type["FairLimiter"]) -> int:
+        """
+        Returns:
+            int: Requests currently holding a slot.
+        """
+        return self.__total
+
+    def waiting(self: Type["FairLimiter"], account: Optional[str] = None) -> int:
+        """
+        Returns:
+            int: Requests waiting for a slot, of one account or of all of them.
+        """
+        if account is not None:
+            return len(self.__waiters.get(account, ()))
+        return sum(map(len, self.__waiters.values()))
+
+    def _has_room(self: Type["FairLimiter"], account: str) -> bool:
+        if self.__total >= self.concurrency:
+            return False
+        return (
+            self.per_account is None
+            or self.__in_flight.get(account, 0) < self.per_account
+        )
+
+    def _grant(self: Type["FairLimiter"], account: str) -> None:
+        self.__in_flight[account] = self.__in_flight.get(account, 0) + 1
+        self.__total += 1
+
+    async def acquire(self: Type["FairLimiter"], account: str) -> None:
+        """
+        Waits for a request slot of an account and for the global rate.
+        Every successful acquire() must be followed by release().
+        """
+        if account not in self.__waiters and self._has_room(account):
+            self._grant(account)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            waiters = self.__waiters.get(account)
+            if waiters is None:
+                waiters = self.__waiters[account] = deque()
+                self.__ready.append(account)
+            waiters.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The slot was granted just before the cancellation.
+                    self.release(account)
+                raise
+
+        if self.bucket is not None:
+            try:
+                await self.bucket.acquire()
+            except BaseException:
+                self.release(account)
+                raise
+
+    def release(self: Type["FairLimiter"], account: str) -> None:
+        self.__in_flight[account] -= 1
+        if not self.__in_flight[account]:
+            del self.__in_flight[account]
+        self.__total -= 1
+        self._dispatch()
+
+    def _dispatch(self: Type["FairLimiter"]) -> None:
+        # One slot per account and pass, so free slots are spread round-robin.
+        progress = True
+        while progress and self.__ready and self.__total < self.concurrency:
+            progress = False
+            for _ in range(len(self.__ready)):
+                account = self.__ready.popleft()
+                waiters = self.__waiters[account]
+                while waiters and waiters[0].done():
+                    waiters.popleft()
+                if waiters and self._has_room(account):
+                    self._grant(account)
+                    waiters.popleft().set_result(None)
+                    progress = True
+                while waiters and waiters[0].done():
+                    waiters.popleft()
+                if waiters:
+                    self.__ready.append(account)
+                else:
+                    del self.__waiters[account]
+                if self.__total >= self.concurrency:
+                    break
+
+
+def parse_retry_after(value: Union[str, None]) -> Optional[float]:
+    """
+    Parses a Retry-After header given either in seconds or as an HTTP date.
+
+    Returns:
+        Optional[float]: The delay in seconds, or None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # HTTP dates are rare and email.utils is slow to import.
+    from email.utils import parsedate_to_datetime
+
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,146 @@
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional, Type
+
+import random
+import time
+
+from ozon_api.exceptions import CircuitOpenError
+
+# Endpoints that only read data and may be repeated freely.
+READ_ENDPOINTS: FrozenSet[str] = frozenset(
+    {
+        "description-category/tree",
+        "description-category/attribute",
+        "description-category/attribute/values",
+        "description-category/attribute/values/search",
+        "product/list",
+        "product/import/info",
+        "product/pictures/info",
+        "product/info/limit",
+    }
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How a request to an endpoint is timed out and retried.
+
+    Delays use exponential backoff with full jitter: the n-th retry (counted from 1) sleeps
+    a random time between 0 and min(max_delay, base_delay * 2 ** (n - 1)) seconds.
+
+    Attributes:
+        max_attempts (int): Attempts in total, 1 disables retries.
+        base_delay (float): The backoff base in seconds.
+        max_delay (float): The upper bound of a single backoff delay in seconds.
+        timeout (Optional[float]): The total timeout of one attempt in seconds, None for no timeout.
+        retry_statuses (FrozenSet[int]): HTTP statuses that are retried.
+        retry_sent (bool): Whether to retry errors after which the request may have
+            reached the server (timeouts, resets). When False only failures to connect are retried.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    timeout: Optional[float] = 60.0
+    retry_statuses: FrozenSet[int] = field(
+        default_factory=lambda: frozenset({500, 502, 503, 504})
+    )
+    retry_sent: bool = True
+
+    def backoff(self: Type["RetryPolicy"], retry: int) -> float:
+        """
+        Args:
+            retry (int): The number of the retry, starting from 1.
+
+        Returns:
+            float: Seconds to sleep before the retry.
+        """
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        )
+
+    def should_retry_error(self: Type["RetryPolicy"], error: BaseException) -> bool:
+        from aiohttp import ClientConnectorError
+
+        if isinstance(error, ClientConnectorError):
+            return True
+        return self.retry_sent
+
+
+# Idempotent reads: retried on 5xx, timeouts and connection errors.
+READ_POLICY = RetryPolicy()
+
+# Writes such as product/import create tasks on the Ozon side, so they are only
+# resent when the request certainly never reached the server.
+WRITE_POLICY = RetryPolicy(max_attempts=3, retry_statuses=frozenset(), retry_sent=False)
+
+
+def default_policy(endpoint: str) -> RetryPolicy:
+    """
+    Returns:
+        RetryPolicy: READ_POLICY for the endpoints in READ_ENDPOINTS, WRITE_POLICY otherwise.
+    """
+    return READ_POLICY if endpoint.strip("/") in READ_ENDPOINTS else WRITE_POLICY
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast while the Ozon API is degraded.
+
+    After `failure_threshold` consecutive failed attempts (5xx, timeouts, connection
+    errors) the breaker opens and every request raises CircuitOpenError without being
+    sent. After `recovery_timeout` seconds a single probe request is let through: its
+    success closes the breaker, its failure opens it again.
+    """
+
+    def __init__(
+        self: Type["CircuitBreaker"],
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ) -> None:
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker. Defaults to 5.
+            recovery_timeout (float): Seconds to wait before probing the API again. Defaults to 30.0.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.__failures = 0
+        self.__opened_at: Optional[float] = None
+
+    @property
+    def state(self: Type["CircuitBreaker"]) -> str:
+        """
+        Returns:
+            str: "closed", "open" or "half-open".
+        """
+        if self.__opened_at is None:
+            return "closed"
+        if time.monotonic() - self.__opened_at >= self.recovery_timeout:
+            return "half-open"
+        return "open"
+
+    def before_request(self: Type["CircuitBreaker"], endpoint: str = "") -> None:
+        """
+        Raises:
+            CircuitOpenError: When the breaker is open.
+        """
+        state = self.state
+        if state == "open":
+            raise CircuitOpenError(
+                f"Circuit breaker is open after {self.__failures} failures", endpoint
+            )
+        if state == "half-open":
+            # Let exactly one probe through: the breaker is open again for the others, which
+            # fail fast with CircuitOpenError until the probe succeeds and closes it.
+            self.__opened_at = time.monotonic()
+
+    def record_success(self: Type["CircuitBreaker"]) -> None:
+        self.__failures = 0
+        self.__opened_at = None
+
+    def record_failure(self: Type["CircuitBreaker"]) -> None:
+        self.__failures += 1
+        if self.__failures >= self.failure_threshold:
+            self.__opened_at = time.monotonic()
@@ -0,0 +1,295 @@
+from array import array
+from bisect import bisect_left
+from heapq import nlargest
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Type,
+)
+
+import math
+
+
+def normalize(text: str) -> str:
+    """
+    Returns:
+        str: The text case-folded, with "ё" as "е" and whitespace collapsed.
+    """
+    return " ".join(text.casefold().replace("ё", "е").split())
+
+
+def trigrams(key: str) -> Set[str]:
+    """
+    Returns:
+        Set[str]: The character trigrams of a normalized text, padded so that short
+        texts and word edges are represented too.
+    """
+    padded = f"  {key} "
+    return {padded[start : start + 3] for start in range(len(padded) - 2)}
+
+
+class ValueMatch(NamedTuple):
+    """
+    A dictionary value found for a text.
+
+    method is "exact", "casefold", "prefix", "fuzzy" or "remote" (found through the search
+    endpoint); score is the trigram similarity of a fuzzy match, 1.0 otherwise.
+    """
+
+    id: int
+    value: str
+    score: float
+    method: str
+
+
+class AttributeValueIndex:
+    """
+    A local search index over one attribute dictionary, e.g. brands or colors, to map
+    texts to dictionary_value_id without a values/search request per text.
+
+    Only the IDs and the values are kept. Exact and case-folded lookups are dict lookups;
+    the sorted keys for prefix search and the trigram postings for fuzzy search are built
+    on first use.
+
+    Usage:
+        index = await api.get_attribute_value_index(85, description_category_id=..., type_id=...)
+        index.match("adidas")              # ValueMatch(id=..., value="adidas", method="exact", ...)
+        index.prefix("adi", limit=10)
+        matches = await api.resolve_attribute_values(index, ["Adidas", "Nike inc"])
+    """
+
+    def __init__(
+        self: Type["AttributeValueIndex"],
+        values: Iterable[Mapping[str, Any]] = (),
+        attribute_id: Optional[int] = None,
+        description_category_id: Optional[int] = None,
+        type_id: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            values (Iterable[Mapping[str, Any]]): Dictionary values with "id" and "value".
+            attribute_id (Optional[int]): The attribute of the dictionary, for remote searches.
+            description_category_id (Optional[int]): The category of the dictionary, for remote searches.
+            type_id (Optional[int]): The type of the dictionary, for remote searches.
+            language (Optional[str]): The language of the values, for remote searches.
+        """
+        self.attribute_id = attribute_id
+        self.description_category_id = description_category_id
+        self.type_id = type_id
+        self.language = language
+
+        self._ids = array("q")
+        self._values: List[str] = []
+        self.__exact: Dict[str, int] = {}
+        self.__folded: Dict[str, int] = {}
+        self.__prefix_keys: Optional[List[str]] = None
+        self.__prefix_nodes: Optional["array[int]"] = None
+        # The trigram index, built on the first fuzzy search: an ID per trigram, the values
+        # containing each trigram by ID, and the trigram IDs of every value, concatenated,
+        # with the offset of each value's run in __gram_offsets.
+        self.__gram_ids: Optional[Dict[str, int]] = None
+        self.__postings: List["array[int]"] = []
+        self.__value_grams = array("i")
+        self.__gram_offsets = array("q", (0,))
+        self.add(values)
+
+    def __len__(self: Type["AttributeValueIndex"]) -> int:
+        return len(self._ids)
+
+    def __contains__(self: Type["AttributeValueIndex"], text: object) -> bool:
+        return isinstance(text, str) and (
+            text in self.__exact or normalize(text) in self.__folded
+        )
+
+    @property
+    def category(self: Type["AttributeValueIndex"]) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: The category fields of a request for this dictionary.
+        """
+        return {
+            "description_category_id": self.description_category_id,
+            "type_id": self.type_id,
+            "language": self.language,
+        }
+
+    def add(
+        self: Type["AttributeValueIndex"], values: Iterable[Mapping[str, Any]]
+    ) -> int:
+        """
+        Adds dictionary values; a value indexed already with the same ID is skipped.
+
+        Returns:
+            int: The number of values added.
+        """
+        added = 0
+        for item in values:
+            value_id = item["id"]
+            value = str(item.get("value", ""))
+            known = self.__exact.get(value)
+            if known is not None and self._ids[known] == value_id:
+                continue
+            index = len(self._ids)
+            self._ids.append(value_id)
+            self._values.append(value)
+            self.__exact.setdefault(value, index)
+            self.__folded.setdefault(normalize(value), index)
+            if self.__gram_ids is not None:
+                self._post(index)
+            added += 1
+        if added:
+            self.__prefix_keys = self.__prefix_nodes = None
+        return added
+
+    def _match(
+        self: Type["AttributeValueIndex"], index: int, score: float, method: str
+    ) -> ValueMatch:
+        return ValueMatch(self._ids[index], self._values[index], score, method)
+
+    def lookup(self: Type["AttributeValueIndex"], text: str) -> Optional[ValueMatch]:
+        """
+        Returns:
+            Optional[ValueMatch]: The value equal to the text, or equal after normalize().
+        """
+        index = self.__exact.get(text)
+        if index is not None:
+            return self._match(index, 1.0, "exact")
+        index = self.__folded.get(normalize(text))
+        if index is not None:
+            return self._match(index, 1.0, "casefold")
+        return None
+
+    def prefix(
+        self: Type["AttributeValueIndex"], text: str, limit: int = 10
+    ) -> List[ValueMatch]:
+        """
+        Returns:
+            List[ValueMatch]: Up to `limit` values starting with the text (case-insensitively),
+            in the order of their normalized values.
+        """
+        if self.__prefix_keys is None:
+            entries = sorted(self.__folded.items())
+            self.__prefix_keys = [key for key, _ in entries]
+            self.__prefix_nodes = array("i", (index for _, index in entries))
+        keys, nodes = self.__prefix_keys, self.__prefix_nodes
+        key = normalize(text)
+        found = []
+        position = bisect_left(keys, key)
+        while (
+            position < len(keys)
+            and len(found) < limit
+            and keys[position].startswith(key)
+        ):
+            found.append(self._match(nodes[position], 1.0, "prefix"))
+            position += 1
+        return found
+
+    def _post(self: Type["AttributeValueIndex"], index: int) -> None:
+        gram_ids, postings, value_grams = (
+            self.__gram_ids,
+            self.__postings,
+            self.__value_grams,
+        )
+        for gram in trigrams(normalize(self._values[index])):
+            gram_id = gram_ids.get(gram)
+            if gram_id is None:
+                gram_id = gram_ids[gram] = len(postings)
+                postings.append(array("i"))
+            postings[gram_id].append(index)
+            value_grams.append(gram_id)
+        self.__gram_offsets.append(len(value_grams))
+
+    def _build_postings(self: Type["AttributeValueIndex"]) -> None:
+        self.__gram_ids = {}
+        for index in range(len(self._values)):
+            self._post(index)
+
+    def fuzzy(
+        self: Type["AttributeValueIndex"],
+        text: str,
+        limit: int = 5,
+        threshold: float = 0.5,
+    ) -> List[ValueMatch]:
+        """
+        Finds the values most similar to the text by character trigrams (Dice coefficient),
+        tolerating typos, extra words and different word forms.
+
+        Args:
+            text (str): The text.
+            limit (int): Maximum number of values. Defaults to 5.
+            threshold (float): The lowest similarity, 0..1. Defaults to 0.5.
+
+        Returns:
+            List[ValueMatch]: The values, the most similar first.
+        """
+        if self.__gram_ids is None:
+            self._build_postings()
+        gram_ids, postings = self.__gram_ids, self.__postings
+        value_grams, offsets = self.__value_grams, self.__gram_offsets
+        grams = trigrams(normalize(text))
+        size = len(grams)
+        # Trigrams that no value has can not be shared, they only count in the size.
+        known = {gram_ids[gram] for gram in grams if gram in gram_ids}
+
+        # A value reaching the threshold shares at least `needed` trigrams with the text, so
+        # it contains one of the len(known) - needed + 1 rarest ones: only their postings are
+        # read, not the huge ones of trigrams like " gr" or "oup".
+        threshold = max(threshold, 0.01)
+        needed = max(math.ceil(threshold * size / (2 - threshold)), 1)
+        rarest = sorted(known, key=lambda gram_id: len(postings[gram_id]))
+        candidates: Set[int] = set()
+        for gram_id in rarest[: max(len(known) - needed + 1, 0)]:
+            candidates.update(postings[gram_id])
+
+        smallest, largest = needed, size * (2 - threshold) / threshold
+        scored = []
+        for index in candidates:
+            start, end = offsets[index], offsets[index + 1]
+            other = end - start
+            if smallest <= other <= largest:
+                common = len(known.intersection(value_grams[start:end]))
+                score = 2 * common / (size + other)
+                if score >= threshold:
+                    scored.append((score, -index))
+        return [
+            self._match(-index, score, "fuzzy")
+            for score, index in nlargest(limit, scored)
+        ]
+
+    def match(
+        self: Type["AttributeValueIndex"], text: str, threshold: Optional[float] = 0.7
+    ) -> Optional[ValueMatch]:
+        """
+        Returns:
+            Optional[ValueMatch]: The exact, then the case-folded, then the best fuzzy match
+            with a similarity of at least `threshold` (None disables fuzzy matching).
+        """
+        found = self.lookup(text)
+        if found is None and threshold is not None:
+            candidates = self.fuzzy(text, limit=1, threshold=threshold)
+            found = candidates[0] if candidates else None
+        return found
+
+    def resolve(
+        self: Type["AttributeValueIndex"],
+        texts: Iterable[str],
+        threshold: Optional[float] = 0.7,
+    ) -> Dict[str, Optional[ValueMatch]]:
+        """
+        Matches many texts at once; every distinct text is matched once.
+
+        Returns:
+            Dict[str, Optional[ValueMatch]]: The match of every text, None when there is none.
+        """
+        matches: Dict[str, Optional[ValueMatch]] = {}
+        for text in texts:
+            if text not in matches:
+                matches[text] = self.match(text, threshold)
+        return matches
@@ -0,0 +1,46 @@
+from typing import Awaitable, Callable, Dict, Hashable, Type, TypeVar
+
+import asyncio
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicates identical concurrent calls.
+
+    While a call for a key is in flight, further calls with the same key do not start
+    their own work but wait for the running one and receive the same result (or
+    exception). The key is forgotten as soon as the call finishes, so nothing is cached.
+    A cancelled waiter does not cancel the shared call for the others.
+    """
+
+    def __init__(self: Type["SingleFlight"]) -> None:
+        self.__calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self: Type["SingleFlight"]) -> int:
+        return len(self.__calls)
+
+    async def do(
+        self: Type["SingleFlight"], key: Hashable, call: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Args:
+            key (Hashable): Identifies identical calls.
+            call (Callable[[], Awaitable[T]]): Starts the work when no call for the key is in flight.
+
+        Returns:
+            T: The result of the shared call.
+        """
+        future = self.__calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self.__calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(future)
+
+    def _forget(
+        self: Type["SingleFlight"], key: Hashable, future: asyncio.Future
+    ) -> None:
+        if self.__calls.get(key) is future:
+            del self.__calls[key]
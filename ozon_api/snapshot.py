@@ -0,0 +1,221 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Type, Union
+
+from ozon_api.codec import JSONCodec, get_codec
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+# Attribute values of one product: "complex_id:id" -> sorted [dictionary_value_id, value] pairs.
+AttributeState = Dict[str, List[List[Any]]]
+
+
+def attribute_key(attribute: Mapping[str, Any]) -> str:
+    return f"{attribute.get('complex_id') or 0}:{attribute['id']}"
+
+
+def attribute_values(attribute: Mapping[str, Any]) -> List[List[Any]]:
+    """
+    Returns:
+        List[List[Any]]: The values of an attribute in a canonical, order-independent form.
+    """
+    return sorted(
+        [value.get("dictionary_value_id") or 0, str(value.get("value", ""))]
+        for value in attribute.get("values") or ()
+    )
+
+
+def attribute_state(item: Mapping[str, Any]) -> AttributeState:
+    """
+    Returns:
+        AttributeState: The canonical attribute values of a product, e.g. of a
+        ProductAttributesUpdate_Item dump or a product/info/attributes item.
+    """
+    return {
+        attribute_key(attribute): attribute_values(attribute)
+        for attribute in item.get("attributes") or ()
+    }
+
+
+def diff_attributes(
+    item: Mapping[str, Any],
+    stored: Optional[AttributeState],
+    clear_missing: bool = False,
+) -> Tuple[List[Dict[str, Any]], AttributeState]:
+    """
+    Compares the desired attributes of a product to its stored state.
+
+    Args:
+        item (Mapping[str, Any]): The desired product, {"offer_id": ..., "attributes": [...]}.
+        stored (Optional[AttributeState]): The last sent or fetched state, None when unknown.
+        clear_missing (bool): Treat attributes absent from the item as deleted and send them
+            with empty values. By default an item only describes the attributes it contains.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], AttributeState]: The attributes to send (empty when nothing
+        changed) and the state of the product after they are applied.
+    """
+    stored = stored or {}
+    state = dict(stored)
+    patch = []
+    desired_keys = set()
+    for attribute in item.get("attributes") or ():
+        key = attribute_key(attribute)
+        values = attribute_values(attribute)
+        desired_keys.add(key)
+        if stored.get(key) != values:
+            patch.append(
+                {
+                    "complex_id": attribute.get("complex_id") or 0,
+                    "id": attribute["id"],
+                    "values": [
+                        {
+                            "dictionary_value_id": value.get("dictionary_value_id")
+                            or 0,
+                            "value": str(value.get("value", "")),
+                        }
+                        for value in attribute.get("values") or ()
+                    ],
+                }
+            )
+            state[key] = values
+
+    if clear_missing:
+        for key in stored.keys() - desired_keys:
+            if stored[key]:
+                complex_id, attribute_id = map(int, key.split(":"))
+                patch.append(
+                    {"complex_id": complex_id, "id": attribute_id, "values": []}
+                )
+            del state[key]
+
+    return patch, state
+
+
+class AttributeSnapshot:
+    """
+    The last sent or fetched attribute values of products, by Client-Id and offer_id,
+    stored in a local SQLite file.
+
+    Used by OzonAPI.product_attributes_update_diff to send only the attributes that
+    changed. Seed it with record() from product/info/attributes responses to diff against
+    the state on Ozon rather than the last sent one.
+    """
+
+    def __init__(
+        self: Type["AttributeSnapshot"],
+        directory: Union[str, Path] = ".ozon_cache",
+        filename: str = "attributes.sqlite3",
+        json_codec: Union[str, JSONCodec] = "auto",
+    ) -> None:
+        """
+        Args:
+            directory (Union[str, Path]): Directory of the database file, created when missing. Defaults to ".ozon_cache".
+            filename (str): The database file name. Defaults to "attributes.sqlite3".
+            json_codec (Union[str, JSONCodec]): The codec of stored values. Defaults to "auto".
+        """
+        self.codec = get_codec(json_codec)
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path / filename
+
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.__lock, self.__connection:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS attributes ("
+                "client_id TEXT NOT NULL, offer_id TEXT NOT NULL, state BLOB NOT NULL, "
+                "updated REAL NOT NULL, PRIMARY KEY (client_id, offer_id))"
+            )
+
+    def get_many(
+        self: Type["AttributeSnapshot"], client_id: str, offer_ids: Iterable[str]
+    ) -> Dict[str, AttributeState]:
+        """
+        Returns:
+            Dict[str, AttributeState]: The stored states of the offers that are known.
+        """
+        offer_ids = list(offer_ids)
+        states = {}
+        with self.__lock:
+            # SQLite limits the number of bound parameters of a statement.
+            for start in range(0, len(offer_ids), 500):
+                chunk = offer_ids[start : start + 500]
+                rows = self.__connection.execute(
+                    "SELECT offer_id, state FROM attributes WHERE client_id = ? "
+                    f"AND offer_id IN ({','.join('?' * len(chunk))})",
+                    (client_id, *chunk),
+                ).fetchall()
+                for offer_id, state in rows:
+                    states[offer_id] = self.codec.loads(state)
+        return states
+
+    def put_many(
+        self: Type["AttributeSnapshot"],
+        client_id: str,
+        states: Mapping[str, AttributeState],
+    ) -> None:
+        now = time.time()
+        rows = [
+            (client_id, offer_id, self.codec.dumps(state), now)
+            for offer_id, state in states.items()
+        ]
+        with self.__lock, self.__connection:
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO attributes (client_id, offer_id, state, updated) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def record(
+        self: Type["AttributeSnapshot"],
+        client_id: str,
+        items: Iterable[Mapping[str, Any]],
+    ) -> None:
+        """
+        Stores the full attribute state of products, e.g. fetched from product/info/attributes.
+
+        Args:
+            client_id (str): The Client-Id of the account.
+            items (Iterable[Mapping[str, Any]]): Products with "offer_id" and "attributes".
+        """
+        self.put_many(
+            client_id, {item["offer_id"]: attribute_state(item) for item in items}
+        )
+
+    def delete(
+        self: Type["AttributeSnapshot"], client_id: str, offer_ids: Iterable[str]
+    ) -> None:
+        with self.__lock, self.__connection:
+            self.__connection.executemany(
+                "DELETE FROM attributes WHERE client_id = ? AND offer_id = ?",
+                [(client_id, offer_id) for offer_id in offer_ids],
+            )
+
+    def clear(self: Type["AttributeSnapshot"], client_id: Optional[str] = None) -> None:
+        with self.__lock, self.__connection:
+            if client_id is None:
+                self.__connection.execute("DELETE FROM attributes")
+            else:
+                self.__connection.execute(
+                    "DELETE FROM attributes WHERE client_id = ?", (client_id,)
+                )
+
+    def close(self: Type["AttributeSnapshot"]) -> None:
+        with self.__lock:
+            self.__connection.close()
+
+    async def aget_many(
+        self: Type["AttributeSnapshot"], client_id: str, offer_ids: Iterable[str]
+    ) -> Dict[str, AttributeState]:
+        return await asyncio.to_thread(self.get_many, client_id, list(offer_ids))
+
+    async def aput_many(
+        self: Type["AttributeSnapshot"],
+        client_id: str,
+        states: Mapping[str, AttributeState],
+    ) -> None:
+        await asyncio.to_thread(self.put_many, client_id, dict(states))
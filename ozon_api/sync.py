@@ -0,0 +1,299 @@
+from concurrent.futures import Future
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import asyncio
+import inspect
+import threading
+
+from ozon_api import OzonAPI
+from ozon_api.utils import gather_or_cancel
+
+T = TypeVar("T")
+
+_END = object()
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self: Type["_Failure"], error: BaseException) -> None:
+        self.error = error
+
+
+class SyncOzonAPI:
+    """
+    A blocking OzonAPI for threaded code such as Celery or Django workers.
+
+    One event loop runs in a background thread and owns an OzonAPI instance, so every
+    call reuses the same pooled session, rate limiter, cache and pollers. All methods of
+    OzonAPI are available under the same names: coroutine methods block until their
+    result is ready, async generators (iter_product_list, product_import_bulk, ...)
+    become ordinary iterators. The calls may be made from any number of threads at once.
+
+    Usage:
+        api = SyncOzonAPI(client_id, api_key)
+        info = api.get_full_category_info(description_category_id=17027949, type_id=94765)
+        for product_id in api.iter_product_list(fields=("product_id",)):
+            ...
+        statuses = api.map("product_import_info", task_ids, concurrency=10)
+        api.close()
+    """
+
+    def __init__(
+        self: Type["SyncOzonAPI"],
+        *args: Any,
+        timeout: Optional[float] = None,
+        iterator_buffer: int = 1000,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            *args, **kwargs: Passed to OzonAPI, e.g. client_id, api_key, cache, rate_limiter.
+            timeout (Optional[float]): Seconds a blocking call waits for its result before it
+                is cancelled with concurrent.futures.TimeoutError, None waits forever.
+                Defaults to None.
+            iterator_buffer (int): Items an iterator reads ahead in the background. Defaults to 1000.
+        """
+        object.__setattr__(self, "_api", OzonAPI(*args, **kwargs))
+        object.__setattr__(self, "timeout", timeout)
+        object.__setattr__(self, "iterator_buffer", iterator_buffer)
+        object.__setattr__(self, "_loop", None)
+        object.__setattr__(self, "_thread", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def __enter__(self: Type["SyncOzonAPI"]) -> "SyncOzonAPI":
+        return self
+
+    def __exit__(self: Type["SyncOzonAPI"], *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def api(self: Type["SyncOzonAPI"]) -> OzonAPI:
+        """
+        Returns:
+            OzonAPI: The wrapped client. Its coroutines must only run in the background loop, see run().
+        """
+        return self._api
+
+    def _ensure_loop(self: Type["SyncOzonAPI"]) -> asyncio.AbstractEventLoop:
+        loop = self._loop
+        if loop is not None:
+            return loop
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="ozon-api-loop", daemon=True
+                )
+                thread.start()
+                object.__setattr__(self, "_thread", thread)
+                object.__setattr__(self, "_loop", loop)
+            return self._loop
+
+    def _call(self: Type["SyncOzonAPI"], coroutine: Awaitable[T]) -> T:
+        future = self._submit(coroutine)
+        try:
+            return future.result(self.timeout)
+        except BaseException:
+            # A timeout or an interrupt of the waiting thread also stops the call in the
+            # loop, instead of leaving it to run with nobody waiting for its result.
+            future.cancel()
+            raise
+
+    def _submit(self: Type["SyncOzonAPI"], coroutine: Awaitable[T]) -> "Future[T]":
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError(
+                "SyncOzonAPI cannot be called from its own event loop, await the OzonAPI instead"
+            )
+        return asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+    def __getattr__(self: Type["SyncOzonAPI"], name: str) -> Any:
+        attribute = getattr(type(self._api), name, None)
+        if inspect.iscoroutinefunction(attribute):
+            method = getattr(self._api, name)
+
+            def call(*args: Any, **kwargs: Any) -> Any:
+                return self._call(method(*args, **kwargs))
+
+        elif inspect.isasyncgenfunction(attribute):
+            method = getattr(self._api, name)
+
+            def call(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                return self._iterate(method(*args, **kwargs))
+
+        else:
+            return getattr(self._api, name)
+
+        call.__name__ = name
+        call.__doc__ = attribute.__doc__
+        return call
+
+    def __setattr__(self: Type["SyncOzonAPI"], name: str, value: Any) -> None:
+        if isinstance(getattr(type(self._api), name, None), property):
+            # The request settings (language, description_category_id, ...) live on the client.
+            setattr(self._api, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __dir__(self: Type["SyncOzonAPI"]) -> List[str]:
+        public = (name for name in dir(self._api) if not name.startswith("_"))
+        return sorted({*super().__dir__(), *public})
+
+    def _iterate(self: Type["SyncOzonAPI"], source: AsyncIterator[T]) -> Iterator[T]:
+        """
+        Drains an async iterator from a background task into a bounded queue; the calling
+        thread takes everything that is ready in one hop instead of one item at a time.
+        """
+        size = self.iterator_buffer
+
+        async def start() -> Tuple[asyncio.Queue, asyncio.Task]:
+            queue: asyncio.Queue = asyncio.Queue(size)
+
+            async def produce() -> None:
+                try:
+                    async for item in source:
+                        await queue.put(item)
+                except Exception as error:
+                    await queue.put(_Failure(error))
+                else:
+                    await queue.put(_END)
+                finally:
+                    await source.aclose()
+
+            return queue, asyncio.ensure_future(produce())
+
+        async def take(queue: asyncio.Queue) -> List[Any]:
+            items = [await queue.get()]
+            while len(items) < size and not queue.empty():
+                items.append(queue.get_nowait())
+            return items
+
+        async def stop(task: asyncio.Task) -> None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        queue, task = self._call(start())
+        try:
+            while True:
+                for item in self._call(take(queue)):
+                    if item is _END:
+                        return
+                    if isinstance(item, _Failure):
+                        raise item.error
+                    yield item
+        finally:
+            if self._loop is not None and not self._loop.is_closed():
+                self._call(stop(task))
+
+    def run(
+        self: Type["SyncOzonAPI"], function: Callable[[OzonAPI], Awaitable[T]]
+    ) -> T:
+        """
+        Runs an async function with the wrapped client in the background loop, e.g. to
+        combine several calls without a thread hop between them.
+
+        Usage:
+            tree, limits = api.run(lambda api: asyncio.gather(
+                api.get_description_category_tree(), api.product_info_limit()
+            ))
+        """
+
+        async def call() -> T:
+            return await function(self._api)
+
+        return self._call(call())
+
+    def submit(
+        self: Type["SyncOzonAPI"], method: str, *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        """
+        Starts a call without waiting for it.
+
+        Args:
+            method (str): The name of an OzonAPI coroutine method, e.g. "product_import".
+            *args, **kwargs: The arguments of the method.
+
+        Returns:
+            concurrent.futures.Future: Resolves with the result of the call.
+        """
+        return self._submit(getattr(self._api, method)(*args, **kwargs))
+
+    def map(
+        self: Type["SyncOzonAPI"],
+        method: str,
+        items: Iterable[Any],
+        concurrency: int = 10,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Calls a method once per item, up to `concurrency` calls at a time, and waits for all of them.
+
+        Usage:
+            infos = api.map("product_import_info", task_ids)
+
+        Args:
+            method (str): The name of an OzonAPI coroutine method.
+            items (Iterable[Any]): The first argument of every call; a tuple is unpacked as all arguments.
+            concurrency (int): Maximum calls in flight. Defaults to 10.
+            return_exceptions (bool): Return the exceptions of failed calls in place of their results
+                instead of raising the first one. Defaults to False.
+
+        Returns:
+            List[Any]: The results in the order of the items.
+        """
+        function = getattr(self._api, method)
+        calls = [item if isinstance(item, tuple) else (item,) for item in items]
+
+        async def run_all() -> List[Any]:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def one(args: tuple) -> Any:
+                async with semaphore:
+                    return await function(*args)
+
+            if return_exceptions:
+                return list(
+                    await asyncio.gather(*map(one, calls), return_exceptions=True)
+                )
+            return await gather_or_cancel(map(one, calls))
+
+        return self._call(run_all())
+
+    def close(self: Type["SyncOzonAPI"]) -> None:
+        """
+        Closes the client and stops the background loop. Calls still running are cancelled,
+        their callers get concurrent.futures.CancelledError. A later call starts a new loop.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            object.__setattr__(self, "_loop", None)
+            object.__setattr__(self, "_thread", None)
+        if loop is None:
+            return
+
+        async def shutdown() -> None:
+            pending = asyncio.all_tasks() - {asyncio.current_task()}
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await self._api.close()
+            await loop.shutdown_asyncgens()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
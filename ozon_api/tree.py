@@ -0,0 +1,442 @@
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+import hashlib
+import os
+import struct
+import sys
+
+# A node of the tree: (description_category_id, type_id), type_id is 0 for a category.
+NodeKey = Tuple[int, int]
+
+_TYPE = 1
+_DISABLED = 2
+
+_MAGIC = b"OZCT\x01"
+_HEADER = struct.Struct("<5sII")
+
+
+class CategoryNode:
+    """
+    A category or a type of a CategoryTree. Nodes are light views over the tree's arrays
+    and are created on access.
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self: Type["CategoryNode"], tree: "CategoryTree", index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    def __eq__(self: Type["CategoryNode"], other: object) -> bool:
+        if not isinstance(other, CategoryNode):
+            return NotImplemented
+        return other.tree is self.tree and other.index == self.index
+
+    def __hash__(self: Type["CategoryNode"]) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self: Type["CategoryNode"]) -> str:
+        kind = "type" if self.is_type else "category"
+        return f"<CategoryNode {kind} {self.key} {self.name!r}>"
+
+    @property
+    def is_type(self: Type["CategoryNode"]) -> bool:
+        return bool(self.tree._flags[self.index] & _TYPE)
+
+    @property
+    def disabled(self: Type["CategoryNode"]) -> bool:
+        return bool(self.tree._flags[self.index] & _DISABLED)
+
+    @property
+    def name(self: Type["CategoryNode"]) -> str:
+        """
+        Returns:
+            str: category_name of a category, type_name of a type.
+        """
+        return self.tree._names[self.index]
+
+    @property
+    def description_category_id(self: Type["CategoryNode"]) -> int:
+        """
+        Returns:
+            int: The ID of the category, or of the category a type belongs to.
+        """
+        if self.is_type:
+            return self.tree._ids[self.tree._parents[self.index]]
+        return self.tree._ids[self.index]
+
+    @property
+    def type_id(self: Type["CategoryNode"]) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: The ID of a type, None for a category.
+        """
+        return self.tree._ids[self.index] if self.is_type else None
+
+    @property
+    def key(self: Type["CategoryNode"]) -> NodeKey:
+        return self.description_category_id, self.type_id or 0
+
+    @property
+    def parent(self: Type["CategoryNode"]) -> Optional["CategoryNode"]:
+        parent = self.tree._parents[self.index]
+        return CategoryNode(self.tree, parent) if parent >= 0 else None
+
+    @property
+    def children(self: Type["CategoryNode"]) -> List["CategoryNode"]:
+        return [
+            CategoryNode(self.tree, index) for index in self.tree._children(self.index)
+        ]
+
+    @property
+    def path(self: Type["CategoryNode"]) -> List["CategoryNode"]:
+        """
+        Returns:
+            List[CategoryNode]: The nodes from the root down to this one.
+        """
+        path = []
+        index = self.index
+        while index >= 0:
+            path.append(CategoryNode(self.tree, index))
+            index = self.tree._parents[index]
+        path.reverse()
+        return path
+
+    def breadcrumb(self: Type["CategoryNode"], separator: str = " / ") -> str:
+        return separator.join(node.name for node in self.path)
+
+    def leaves(self: Type["CategoryNode"]) -> Iterator["CategoryNode"]:
+        """
+        Yields:
+            CategoryNode: The nodes without children under this one (usually types).
+        """
+        return self.tree.leaves(self)
+
+
+@dataclass(frozen=True)
+class CategoryTreeDiff:
+    """
+    The changes between two versions of the category tree, by NodeKey.
+    """
+
+    added: List[NodeKey] = field(default_factory=list)
+    removed: List[NodeKey] = field(default_factory=list)
+    # Renamed, moved, enabled or disabled.
+    changed: List[NodeKey] = field(default_factory=list)
+
+    def __bool__(self: Type["CategoryTreeDiff"]) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class CategoryTree:
+    """
+    The description category tree flattened into arrays, with indexes for fast lookups.
+
+    The nodes are stored in depth-first order: the subtree of a node is the range from the
+    node up to its end, so subtrees, leaves and paths need no nested dicts. Lookups by
+    description_category_id and by (description_category_id, type_id) are dict lookups;
+    the same type_id may occur in several categories.
+
+    A tree is saved to and loaded from a compact binary snapshot, and its digest tells
+    whether the content changed, e.g. to skip remapping products when it did not.
+
+    Usage:
+        tree = await api.get_category_tree()
+        node = tree.get_type(17028922, 91248)
+        node.breadcrumb()  # "Обувь / Мужская обувь / Кроссовки"
+        tree.save("tree.bin")
+        if CategoryTree.load("tree.bin").digest != tree.digest:
+            ...
+    """
+
+    def __init__(
+        self: Type["CategoryTree"],
+        ids: "array[int]",
+        parents: "array[int]",
+        ends: "array[int]",
+        flags: bytearray,
+        names: List[str],
+    ) -> None:
+        """
+        Use from_response() or load() instead.
+        """
+        self._ids = ids
+        self._parents = parents
+        self._ends = ends
+        self._flags = flags
+        self._names = names
+        self.__digest: Optional[str] = None
+        self.__search_keys: Optional[List[str]] = None
+        self.__search_nodes: Optional["array[int]"] = None
+
+        self.__categories: Dict[int, int] = {}
+        self.__types: Dict[NodeKey, int] = {}
+        self.__type_ids: Dict[int, List[int]] = {}
+        for index, (node_id, flag) in enumerate(zip(ids, flags)):
+            if flag & _TYPE:
+                self.__types[ids[parents[index]], node_id] = index
+                self.__type_ids.setdefault(node_id, []).append(index)
+            else:
+                self.__categories[node_id] = index
+
+    @classmethod
+    def from_response(
+        cls: Type["CategoryTree"], response: Union[Dict[str, Any], List[Dict[str, Any]]]
+    ) -> "CategoryTree":
+        """
+        Args:
+            response (Union[Dict[str, Any], List[Dict[str, Any]]]): The description-category/tree
+                response, or its "result" list.
+        """
+        roots = (
+            (response.get("result") or []) if isinstance(response, dict) else response
+        )
+        ids, parents, ends = array("q"), array("i"), array("i")
+        flags, names = bytearray(), []
+
+        # (node, parent index) to visit, or (None, index) to close the subtree of a node.
+        stack: List[Tuple[Optional[Dict[str, Any]], int]] = [
+            (node, -1) for node in reversed(roots)
+        ]
+        while stack:
+            node, parent = stack.pop()
+            if node is None:
+                ends[parent] = len(ids)
+                continue
+            index = len(ids)
+            if node.get("type_id"):
+                ids.append(node["type_id"])
+                names.append(node.get("type_name") or "")
+                flag = _TYPE
+            else:
+                ids.append(node.get("description_category_id") or 0)
+                names.append(node.get("category_name") or "")
+                flag = 0
+            flags.append(flag | (_DISABLED if node.get("disabled") else 0))
+            parents.append(parent)
+            ends.append(index + 1)
+            stack.append((None, index))
+            stack.extend(
+                (child, index) for child in reversed(node.get("children") or ())
+            )
+        return cls(ids, parents, ends, flags, names)
+
+    def __len__(self: Type["CategoryTree"]) -> int:
+        return len(self._ids)
+
+    def __iter__(self: Type["CategoryTree"]) -> Iterator[CategoryNode]:
+        return (CategoryNode(self, index) for index in range(len(self._ids)))
+
+    def __repr__(self: Type["CategoryTree"]) -> str:
+        return (
+            f"<CategoryTree {len(self.__categories)} categories, {len(self.__types)} types, "
+            f"{self.digest[:12]}>"
+        )
+
+    def _children(self: Type["CategoryTree"], index: int) -> Iterator[int]:
+        child, end = index + 1, self._ends[index]
+        while child < end:
+            yield child
+            child = self._ends[child]
+
+    @property
+    def roots(self: Type["CategoryTree"]) -> List[CategoryNode]:
+        roots, index = [], 0
+        while index < len(self._ids):
+            roots.append(CategoryNode(self, index))
+            index = self._ends[index]
+        return roots
+
+    def get_category(
+        self: Type["CategoryTree"], description_category_id: int
+    ) -> Optional[CategoryNode]:
+        index = self.__categories.get(description_category_id)
+        return CategoryNode(self, index) if index is not None else None
+
+    def get_type(
+        self: Type["CategoryTree"], description_category_id: int, type_id: int
+    ) -> Optional[CategoryNode]:
+        index = self.__types.get((description_category_id, type_id))
+        return CategoryNode(self, index) if index is not None else None
+
+    def find_types(self: Type["CategoryTree"], type_id: int) -> List[CategoryNode]:
+        """
+        Returns:
+            List[CategoryNode]: The type in every category it belongs to.
+        """
+        return [CategoryNode(self, index) for index in self.__type_ids.get(type_id, ())]
+
+    def leaves(
+        self: Type["CategoryTree"], node: Optional[CategoryNode] = None
+    ) -> Iterator[CategoryNode]:
+        """
+        Yields:
+            CategoryNode: The nodes without children, of the whole tree or under `node`.
+        """
+        start, end = (
+            (node.index, self._ends[node.index]) if node else (0, len(self._ids))
+        )
+        ends = self._ends
+        for index in range(start, end):
+            if ends[index] == index + 1:
+                yield CategoryNode(self, index)
+
+    def _build_search(self: Type["CategoryTree"]) -> None:
+        entries = []
+        for index, name in enumerate(self._names):
+            folded = name.casefold()
+            entries.append((folded, index))
+            # Words inside a name are prefixes too: "мужские" finds "Кроссовки мужские".
+            position = folded.find(" ")
+            while position >= 0:
+                entries.append((folded[position + 1 :], index))
+                position = folded.find(" ", position + 1)
+        entries.sort()
+        self.__search_keys = [key for key, _ in entries]
+        self.__search_nodes = array("i", (index for _, index in entries))
+
+    def search(
+        self: Type["CategoryTree"],
+        prefix: str,
+        types_only: bool = False,
+        include_disabled: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[CategoryNode]:
+        """
+        Finds the nodes with a name, or a word of it, starting with `prefix`, case-insensitively.
+
+        Args:
+            prefix (str): The beginning of the name.
+            types_only (bool): Only return types. Defaults to False.
+            include_disabled (bool): Also return disabled nodes. Defaults to True.
+            limit (Optional[int]): Maximum number of nodes. Defaults to None (all).
+
+        Returns:
+            List[CategoryNode]: The nodes in the order of their names.
+        """
+        if self.__search_keys is None:
+            self._build_search()
+        keys, nodes = self.__search_keys, self.__search_nodes
+        prefix = prefix.casefold()
+        found, seen = [], set()
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            index = nodes[position]
+            position += 1
+            flag = self._flags[index]
+            if index in seen or (types_only and not flag & _TYPE):
+                continue
+            if not include_disabled and flag & _DISABLED:
+                continue
+            seen.add(index)
+            found.append(CategoryNode(self, index))
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+
+    def to_bytes(self: Type["CategoryTree"]) -> bytes:
+        """
+        Returns:
+            bytes: The binary snapshot of the tree, see from_bytes().
+        """
+        arrays = [self._ids, self._parents, self._ends]
+        if sys.byteorder == "big":
+            arrays = [array(values.typecode, values) for values in arrays]
+            for values in arrays:
+                values.byteswap()
+        names = "\x00".join(self._names).encode()
+        return b"".join(
+            (
+                _HEADER.pack(_MAGIC, len(self._ids), len(names)),
+                *(values.tobytes() for values in arrays),
+                bytes(self._flags),
+                names,
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls: Type["CategoryTree"], data: bytes) -> "CategoryTree":
+        """
+        Raises:
+            ValueError: The data is not a snapshot of this format.
+        """
+        magic, count, names_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a category tree snapshot")
+        view = memoryview(data)[_HEADER.size :]
+        arrays = []
+        for typecode in ("q", "i", "i"):
+            values = array(typecode)
+            size = count * values.itemsize
+            values.frombytes(view[:size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays.append(values)
+            view = view[size:]
+        flags = bytearray(view[:count])
+        names = (
+            bytes(view[count : count + names_size]).decode().split("\x00")
+            if count
+            else []
+        )
+        tree = cls(*arrays, flags, names)
+        tree.__digest = hashlib.sha256(data).hexdigest()
+        return tree
+
+    def save(self: Type["CategoryTree"], path: Union[str, Path]) -> None:
+        """
+        Writes the binary snapshot to a file, replacing it atomically.
+        """
+        path = Path(path)
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_bytes(self.to_bytes())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls: Type["CategoryTree"], path: Union[str, Path]) -> "CategoryTree":
+        return cls.from_bytes(Path(path).read_bytes())
+
+    @property
+    def digest(self: Type["CategoryTree"]) -> str:
+        """
+        Returns:
+            str: The SHA-256 of the snapshot; equal trees have equal digests.
+        """
+        if self.__digest is None:
+            self.__digest = hashlib.sha256(self.to_bytes()).hexdigest()
+        return self.__digest
+
+    def _entries(
+        self: Type["CategoryTree"],
+    ) -> Dict[NodeKey, Tuple[str, bool, NodeKey]]:
+        entries = {}
+        for node in self:
+            parent = node.parent
+            entries[node.key] = (
+                node.name,
+                node.disabled,
+                parent.key if parent else (0, 0),
+            )
+        return entries
+
+    def diff(self: Type["CategoryTree"], other: "CategoryTree") -> CategoryTreeDiff:
+        """
+        Compares this tree to a newer one.
+
+        Returns:
+            CategoryTreeDiff: The nodes added in `other`, removed from it and changed in it.
+        """
+        if self.digest == other.digest:
+            return CategoryTreeDiff()
+        old, new = self._entries(), other._entries()
+        return CategoryTreeDiff(
+            added=[key for key in new if key not in old],
+            removed=[key for key in old if key not in new],
+            changed=[
+                key for key, entry in new.items() if key in old and old[key] != entry
+            ],
+        )
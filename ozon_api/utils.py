@@ -0,0 +1,59 @@
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Iterable,
+    List,
+    TypeVar,
+    Union,
+)
+
+import asyncio
+
+T = TypeVar("T")
+
+
+async def gather_or_cancel(aws: Iterable[Awaitable[Any]]) -> List[Any]:
+    """
+    Like asyncio.gather(), but cancels the remaining awaitables as soon as one of them
+    fails, so no orphaned requests keep running in the background.
+
+    Returns:
+        List[Any]: The results in the order of the awaitables.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def chunked(
+    items: Union[Iterable[T], AsyncIterable[T]], size: int
+) -> AsyncIterator[List[T]]:
+    """
+    Splits a sync or async iterable into lists of at most `size` items, reading the
+    source lazily so arbitrarily large inputs never have to be held in memory.
+
+    Yields:
+        List[T]: The next chunk.
+    """
+    chunk: List[T] = []
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
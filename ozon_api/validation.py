@@ -0,0 +1,407 @@
+from dataclasses import asdict, dataclass, field
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    get_args,
+)
+
+from ozon_api.models.product_import import ProductImport_Item
+
+# The values accepted by ProductImport_Item.vat and ProductImport_Item.currency_code.
+VAT_RATES = frozenset(get_args(ProductImport_Item.model_fields["vat"].annotation))
+CURRENCIES = frozenset(
+    get_args(ProductImport_Item.model_fields["currency_code"].annotation)
+)
+
+BOOLEAN_VALUES = frozenset({"true", "false"})
+
+# The attribute types whose values are checked to parse.
+PARSED_TYPES = frozenset({"Integer", "Decimal", "Boolean"})
+
+
+@dataclass(frozen=True, slots=True)
+class ItemError:
+    """
+    A problem of one import item that would make Ozon reject it.
+
+    code is one of: "missing_field", "invalid_vat", "invalid_currency", "invalid_price",
+    "unknown_category", "required", "unknown_attribute", "unknown_value",
+    "dictionary_value_required", "too_many_values", "invalid_value".
+    """
+
+    index: int
+    offer_id: Optional[str]
+    code: str
+    message: str
+    # "vat", "price", "attributes.85", ...
+    field: str = ""
+    attribute_id: Optional[int] = None
+
+    def to_dict(self: Type["ItemError"]) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class AttributeRule:
+    """
+    What Ozon accepts for one attribute of a category.
+    """
+
+    id: int
+    name: str
+    required: bool = False
+    collection: bool = False
+    type: str = ""
+    max_values: int = 0
+    # The allowed dictionary_value_id, None when the attribute has no dictionary
+    # or its values are not checked.
+    dictionary: Optional[FrozenSet[int]] = None
+
+
+@dataclass(slots=True)
+class CategoryRules:
+    """
+    The attribute rules of one (description_category_id, type_id).
+    """
+
+    description_category_id: int
+    type_id: int
+    attributes: Dict[int, AttributeRule] = field(default_factory=dict)
+    required: Tuple[int, ...] = ()
+
+    @classmethod
+    def from_full_info(
+        cls: Type["CategoryRules"],
+        description_category_id: int,
+        type_id: int,
+        info: Iterable[Mapping[str, Any]],
+        unchecked: Collection[int] = (),
+        dictionaries: Optional[Dict[Any, FrozenSet[int]]] = None,
+    ) -> "CategoryRules":
+        """
+        Args:
+            description_category_id (int): The category.
+            type_id (int): The type.
+            info (Iterable[Mapping[str, Any]]): The get_full_category_info result of the category.
+            unchecked (Collection[int]): Attributes whose dictionary values are not checked.
+            dictionaries (Optional[Dict[Any, FrozenSet[int]]]): Value sets by dictionary_id, shared
+                between categories so that a dictionary used by many of them is stored once.
+        """
+        dictionaries = dictionaries if dictionaries is not None else {}
+        attributes = {}
+        for attribute in info:
+            values = attribute.get("values") or {}
+            if isinstance(values, Mapping):
+                values = values.get("result") or []
+            dictionary = None
+            if values and attribute["id"] not in unchecked:
+                key = attribute.get("dictionary_id") or ("attribute", attribute["id"])
+                dictionary = dictionaries.get(key)
+                if dictionary is None:
+                    dictionary = dictionaries[key] = frozenset(
+                        value["id"] for value in values
+                    )
+            attributes[attribute["id"]] = AttributeRule(
+                id=attribute["id"],
+                name=attribute.get("name", ""),
+                required=bool(attribute.get("is_required")),
+                collection=bool(attribute.get("is_collection")),
+                type=attribute.get("type") or "",
+                max_values=attribute.get("max_value_count") or 0,
+                dictionary=dictionary,
+            )
+        required = tuple(rule.id for rule in attributes.values() if rule.required)
+        return cls(description_category_id, type_id, attributes, required)
+
+
+def _fields(item: Any) -> Mapping[str, Any]:
+    if isinstance(item, Mapping):
+        return item
+    return item.__dict__
+
+
+def _attribute_fields(attribute: Any) -> Tuple[int, Sequence[Any]]:
+    if isinstance(attribute, Mapping):
+        return attribute.get("id"), attribute.get("values") or ()
+    return attribute.id, attribute.values or ()
+
+
+def _is_number(value: Any, integer: bool = False) -> bool:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return False
+    return not integer or number.is_integer()
+
+
+def _parses(kind: str, value: Any) -> bool:
+    if kind == "Integer":
+        return _is_number(value, integer=True)
+    if kind == "Decimal":
+        return _is_number(value)
+    return str(value).lower() in BOOLEAN_VALUES
+
+
+class ImportValidator:
+    """
+    Checks product_import items locally against the attribute metadata of their categories,
+    to find the items that Ozon would reject before they cost quota and an import round trip.
+
+    The rules are compiled once per (description_category_id, type_id) from the result of
+    get_full_category_info; an item is checked with a few dict and set lookups per attribute.
+    Every problem is reported as an ItemError, nothing is raised.
+
+    Checked: offer_id and name are set, vat and currency_code are allowed values, price is a
+    number, the category is known, required attributes have values, attributes belong to the
+    category, dictionary_value_id exist in the dictionary, single-value attributes have one
+    value, and Integer, Decimal and Boolean values parse.
+
+    Usage:
+        validator = await api.get_import_validator([(17027949, 94765)])
+        valid, errors = validator.split(items)
+    """
+
+    def __init__(
+        self: Type["ImportValidator"],
+        rules: Iterable[CategoryRules] = (),
+        require_category: bool = True,
+    ) -> None:
+        """
+        Args:
+            rules (Iterable[CategoryRules]): The rules of the categories.
+            require_category (bool): Report items of categories without rules as "unknown_category";
+                when False their attributes are not checked. Defaults to True.
+        """
+        self.require_category = require_category
+        self.__rules: Dict[Tuple[int, int], CategoryRules] = {}
+        self.__by_category: Dict[int, List[CategoryRules]] = {}
+        for category_rules in rules:
+            self.add(category_rules)
+
+    @classmethod
+    def from_full_info(
+        cls: Type["ImportValidator"],
+        categories: Mapping[Tuple[int, int], Iterable[Mapping[str, Any]]],
+        unchecked: Collection[int] = (),
+        require_category: bool = True,
+    ) -> "ImportValidator":
+        """
+        Args:
+            categories (Mapping[Tuple[int, int], Iterable[Mapping[str, Any]]]): get_full_category_info
+                results by (description_category_id, type_id), e.g. of get_full_categories_info.
+            unchecked (Collection[int]): Attributes whose dictionary values are not checked, e.g.
+                dictionaries that were not downloaded completely.
+            require_category (bool): See __init__.
+        """
+        dictionaries: Dict[Any, FrozenSet[int]] = {}
+        return cls(
+            (
+                CategoryRules.from_full_info(
+                    description_category_id, type_id, info, unchecked, dictionaries
+                )
+                for (description_category_id, type_id), info in categories.items()
+            ),
+            require_category=require_category,
+        )
+
+    def add(self: Type["ImportValidator"], rules: CategoryRules) -> None:
+        key = (rules.description_category_id, rules.type_id)
+        previous = self.__rules.get(key)
+        self.__rules[key] = rules
+        same_category = self.__by_category.setdefault(rules.description_category_id, [])
+        if previous is not None:
+            same_category.remove(previous)
+        same_category.append(rules)
+
+    def rules(
+        self: Type["ImportValidator"],
+        description_category_id: int,
+        type_id: Optional[int] = None,
+    ) -> Optional[CategoryRules]:
+        """
+        Returns:
+            Optional[CategoryRules]: The rules of a category and type; without a type_id, the rules
+            of the category when it has only one type.
+        """
+        if type_id:
+            return self.__rules.get((description_category_id, type_id))
+        candidates = self.__by_category.get(description_category_id) or ()
+        return candidates[0] if len(candidates) == 1 else None
+
+    def check(
+        self: Type["ImportValidator"], item: Any, index: int = 0
+    ) -> List[ItemError]:
+        """
+        Args:
+            item (Any): A ProductImport_Item or a product dictionary.
+            index (int): The position of the item, reported in the errors. Defaults to 0.
+
+        Returns:
+            List[ItemError]: The problems of the item, empty when it is valid.
+        """
+        fields = _fields(item)
+        offer_id = fields.get("offer_id")
+        errors: List[ItemError] = []
+
+        def error(
+            code: str, message: str, name: str = "", attribute_id: Optional[int] = None
+        ) -> None:
+            errors.append(ItemError(index, offer_id, code, message, name, attribute_id))
+
+        for name in ("offer_id", "name"):
+            if not fields.get(name):
+                error("missing_field", f"{name} is empty", name)
+        vat = fields.get("vat")
+        if vat is None:
+            error("missing_field", "vat is not set", "vat")
+        elif str(vat) not in VAT_RATES:
+            error(
+                "invalid_vat", f"vat {vat!r} is not one of {sorted(VAT_RATES)}", "vat"
+            )
+        currency = fields.get("currency_code", "RUB")
+        if currency not in CURRENCIES:
+            error(
+                "invalid_currency",
+                f"currency_code {currency!r} is not supported",
+                "currency_code",
+            )
+        for name in ("price", "old_price"):
+            price = fields.get(name)
+            if price not in (None, "") and not _is_number(price):
+                error("invalid_price", f"{name} {price!r} is not a number", name)
+        if fields.get("price") in (None, ""):
+            error("missing_field", "price is not set", "price")
+
+        description_category_id = fields.get("description_category_id")
+        type_id = fields.get("type_id")
+        rules = self.rules(description_category_id, type_id)
+        if rules is None:
+            if self.require_category:
+                error(
+                    "unknown_category",
+                    f"No rules for category {description_category_id}, type {type_id}",
+                    "description_category_id",
+                )
+            return errors
+
+        # The hot loop: field names and messages are only built for actual errors.
+        attribute_rules = rules.attributes
+        given = set()
+        for attribute in fields.get("attributes") or ():
+            attribute_id, values = _attribute_fields(attribute)
+            rule = attribute_rules.get(attribute_id)
+            if rule is None:
+                error(
+                    "unknown_attribute",
+                    f"Attribute {attribute_id} does not belong to the category",
+                    f"attributes.{attribute_id}",
+                    attribute_id,
+                )
+                continue
+            if not values:
+                continue
+            given.add(attribute_id)
+            if len(values) > 1 and (
+                not rule.collection
+                or (rule.max_values and len(values) > rule.max_values)
+            ):
+                limit = (
+                    f"at most {rule.max_values} values"
+                    if rule.collection
+                    else "one value"
+                )
+                error(
+                    "too_many_values",
+                    f"{rule.name} takes {limit}",
+                    f"attributes.{attribute_id}",
+                    attribute_id,
+                )
+            dictionary = rule.dictionary
+            for value in values:
+                value = _fields(value)
+                dictionary_value_id = value.get("dictionary_value_id")
+                if dictionary is not None:
+                    if dictionary_value_id in dictionary:
+                        continue
+                    if dictionary_value_id:
+                        error(
+                            "unknown_value",
+                            f"{dictionary_value_id} is not a value of {rule.name}",
+                            f"attributes.{attribute_id}",
+                            attribute_id,
+                        )
+                    else:
+                        error(
+                            "dictionary_value_required",
+                            f"{rule.name} takes a dictionary_value_id",
+                            f"attributes.{attribute_id}",
+                            attribute_id,
+                        )
+                elif (
+                    rule.type in PARSED_TYPES
+                    and not dictionary_value_id
+                    and not _parses(rule.type, value.get("value"))
+                ):
+                    error(
+                        "invalid_value",
+                        f"{value.get('value')!r} is not a valid {rule.type} for {rule.name}",
+                        f"attributes.{attribute_id}",
+                        attribute_id,
+                    )
+
+        if len(given) < len(rules.required) or not given.issuperset(rules.required):
+            for attribute_id in rules.required:
+                if attribute_id not in given:
+                    error(
+                        "required",
+                        f"Required attribute {attribute_rules[attribute_id].name} has no value",
+                        f"attributes.{attribute_id}",
+                        attribute_id,
+                    )
+        return errors
+
+    def validate(
+        self: Type["ImportValidator"], items: Iterable[Any], start: int = 0
+    ) -> List[ItemError]:
+        """
+        Args:
+            items (Iterable[Any]): ProductImport_Item models or product dictionaries.
+            start (int): The index of the first item, e.g. the offset of a chunk. Defaults to 0.
+
+        Returns:
+            List[ItemError]: The problems of all items, in the order of the items.
+        """
+        errors: List[ItemError] = []
+        for index, item in enumerate(items, start):
+            errors.extend(self.check(item, index))
+        return errors
+
+    def split(
+        self: Type["ImportValidator"], items: Iterable[Any], start: int = 0
+    ) -> Tuple[List[Any], Dict[int, List[ItemError]]]:
+        """
+        Args:
+            items (Iterable[Any]): ProductImport_Item models or product dictionaries.
+            start (int): The index of the first item, e.g. the offset of a chunk. Defaults to 0.
+
+        Returns:
+            Tuple[List[Any], Dict[int, List[ItemError]]]: The valid items, and the problems of the
+            others by their index.
+        """
+        valid, invalid = [], {}
+        for index, item in enumerate(items, start):
+            errors = self.check(item, index)
+            if errors:
+                invalid[index] = errors
+            else:
+                valid.append(item)
+        return valid, invalid
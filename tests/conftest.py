@@ -0,0 +1,42 @@
+from typing import Any, Awaitable, Callable, Dict, List
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ozon_api import OzonAPI
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def json_response(body: Any, status: int = 200) -> web.Response:
+    return web.json_response(body, status=status)
+
+
+@pytest.fixture
+async def ozon_stub():
+    """
+    Starts a local aiohttp server with the given handlers by path, e.g.
+    {"/v1/description-category/tree": handler}, and returns an OzonAPI pointed at it.
+    """
+    servers: List[TestServer] = []
+    clients: List[OzonAPI] = []
+
+    async def start(routes: Dict[str, Handler], **options: Any) -> OzonAPI:
+        app = web.Application()
+        for path, handler in routes.items():
+            app.router.add_post(path, handler)
+        server = TestServer(app)
+        await server.start_server()
+        servers.append(server)
+
+        api = OzonAPI("client", "key", **options)
+        api.api_url = str(server.make_url("")).rstrip("/")
+        clients.append(api)
+        return api
+
+    yield start
+    for api in clients:
+        await api.close()
+    for server in servers:
+        await server.close()
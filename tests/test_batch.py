@@ -0,0 +1,43 @@
+from typing import Any, Dict, List
+
+import json
+
+import pytest
+from aiohttp import web
+from pydantic import ValidationError
+
+from ozon_api.models import ProductImport_Item
+from ozon_api.models.batch import items_payload
+from tests.conftest import json_response
+from tests.test_validation import product
+
+
+def extended() -> Dict[str, Any]:
+    # Fields of the API the models do not declare, they must reach Ozon unchanged.
+    return product(
+        promotions=[{"operation": "ENABLE", "type": "REVIEWS_PROMO"}],
+        service_type="IS_CODE_SERVICE",
+    )
+
+
+def test_validated_dicts_are_sent_unchanged():
+    items = [extended(), product(offer_id="A-2")]
+    payload = items_payload(ProductImport_Item, items)
+    assert json.loads(payload) == {"items": items}
+
+
+def test_validation_still_rejects_invalid_items():
+    with pytest.raises(ValidationError):
+        items_payload(ProductImport_Item, [product(vat="0.18")])
+
+
+async def test_product_import_body_round_trip(ozon_stub):
+    bodies: List[Dict[str, Any]] = []
+
+    async def product_import(request: web.Request) -> web.Response:
+        bodies.append(await request.json())
+        return json_response({"result": {"task_id": 1}})
+
+    api = await ozon_stub({"/v3/product/import": product_import})
+    await api.product_import([extended()])
+    assert bodies == [{"items": [extended()]}]
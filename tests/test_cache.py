@@ -0,0 +1,160 @@
+from typing import Any, Dict, List
+
+import pytest
+from aiohttp import web
+
+from ozon_api import cache as cache_module
+from ozon_api.cache import SQLiteCache
+from tests.conftest import json_response
+
+
+class Clock:
+    """
+    A stand-in for the time module of ozon_api.cache, moved forward by hand.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+class Dictionary:
+    """
+    A description-category/attribute/values stand-in paging through `values` ids.
+    """
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.requests: List[Dict[str, Any]] = []
+
+    async def handler(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests.append(body)
+        start = body["last_value_id"]
+        end = min(start + body["limit"], self.count)
+        return json_response(
+            {
+                "result": [
+                    {"id": value_id, "value": str(value_id)}
+                    for value_id in range(start + 1, end + 1)
+                ],
+                "has_next": end < self.count,
+            }
+        )
+
+
+async def test_tree_and_attributes_are_served_from_the_cache(ozon_stub, tmp_path):
+    calls = []
+
+    async def handler(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        return json_response({"result": [{"id": 1}]})
+
+    cache = SQLiteCache(tmp_path)
+    api = await ozon_stub(
+        {
+            "/v1/description-category/tree": handler,
+            "/v1/description-category/attribute": handler,
+        },
+        cache=cache,
+    )
+    for _ in range(2):
+        assert (await api.get_description_category_tree())["result"] == [{"id": 1}]
+        await api.get_description_category_attribute(
+            description_category_id=1, type_id=2, language="RU"
+        )
+    assert calls == [
+        "/v1/description-category/tree",
+        "/v1/description-category/attribute",
+    ]
+
+    await api.get_description_category_tree(refresh=True)
+    assert len(calls) == 3
+    cache.close()
+
+
+async def attribute_values(api, **options: Any) -> List[int]:
+    response = await api.get_description_category_attribute_values(
+        "Бренд",
+        attribute_id=85,
+        limit=2,
+        description_category_id=1,
+        type_id=2,
+        language="RU",
+        **options,
+    )
+    return [value["id"] for value in response["result"]]
+
+
+async def test_attribute_values_are_cached_and_refreshed_from_the_last_id(
+    ozon_stub, tmp_path
+):
+    dictionary = Dictionary(5)
+    cache = SQLiteCache(tmp_path)
+    api = await ozon_stub(
+        {"/v1/description-category/attribute/values": dictionary.handler}, cache=cache
+    )
+    assert await attribute_values(api) == [1, 2, 3, 4, 5]
+    assert [body["last_value_id"] for body in dictionary.requests] == [0, 2, 4]
+
+    assert await attribute_values(api) == [1, 2, 3, 4, 5]
+    assert len(dictionary.requests) == 3
+
+    # A refresh asks only for the values after the cached last_value_id.
+    dictionary.count = 7
+    dictionary.requests.clear()
+    assert await attribute_values(api, refresh=True) == [1, 2, 3, 4, 5, 6, 7]
+    assert [body["last_value_id"] for body in dictionary.requests] == [5]
+    assert await attribute_values(api) == [1, 2, 3, 4, 5, 6, 7]
+    assert len(dictionary.requests) == 1
+    cache.close()
+
+
+async def test_expired_values_are_downloaded_again(ozon_stub, tmp_path, clock):
+    dictionary = Dictionary(3)
+    cache = SQLiteCache(tmp_path, ttl=60)
+    api = await ozon_stub(
+        {"/v1/description-category/attribute/values": dictionary.handler}, cache=cache
+    )
+    await attribute_values(api)
+    clock.now += 60
+    await attribute_values(api)
+    assert len(dictionary.requests) == 2
+
+    clock.now += 1
+    assert await attribute_values(api) == [1, 2, 3]
+    assert [body["last_value_id"] for body in dictionary.requests[2:]] == [0, 2]
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = SQLiteCache(tmp_path, max_entries=2)
+    cache.set("a", 1)
+    clock.now += 1
+    cache.set("b", 2)
+    clock.now += 1
+    assert cache.get("a") == 1
+    clock.now += 1
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    cache.close()
+
+
+def test_expired_entries_are_kept_for_refreshes(tmp_path, clock):
+    cache = SQLiteCache(tmp_path, ttl=10)
+    cache.set("a", {"last_value_id": 5})
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.get_entry("a") == ({"last_value_id": 5}, clock.now - 11)
+    assert cache.purge_expired() == 1
+    assert cache.get_entry("a") is None
+    cache.close()
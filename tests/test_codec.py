@@ -0,0 +1,89 @@
+from typing import Any, List
+
+import importlib.util
+import sys
+
+import pytest
+from aiohttp import web
+
+from ozon_api.codec import JSONCodec, LazyJSON, get_codec
+from tests.conftest import json_response
+
+BODY = {
+    "result": [
+        {"id": 1, "value": "Ёлочка", "info": "", "picture": None},
+        {"id": 2**53, "value": 'кавычки " и \\ слэш', "price": 1.5, "ok": True},
+    ],
+    "has_next": False,
+}
+
+BACKENDS = [
+    pytest.param(
+        name,
+        marks=pytest.mark.skipif(
+            name != "json" and importlib.util.find_spec(name) is None,
+            reason=f"{name} is not installed",
+        ),
+    )
+    for name in ("orjson", "msgspec", "json")
+]
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_every_backend_round_trips_the_same(name):
+    codec = get_codec(name)
+    assert codec.name == name
+    encoded = codec.dumps(BODY)
+    assert isinstance(encoded, bytes)
+    # Whatever encoded it, every backend decodes the same value.
+    assert codec.loads(encoded) == BODY
+    assert JSONCodec().loads(encoded) == BODY
+    assert codec.loads(JSONCodec().dumps(BODY)) == BODY
+
+
+def test_auto_falls_back_in_order(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    expected = "msgspec" if importlib.util.find_spec("msgspec") else "json"
+    assert get_codec("auto").name == expected
+
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    assert get_codec("auto").name == "json"
+    with pytest.raises(ImportError):
+        get_codec("orjson")
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+def test_lazy_json_decodes_once():
+    calls: List[bytes] = []
+    raw = JSONCodec().dumps(BODY)
+
+    def loads(data: bytes) -> Any:
+        calls.append(data)
+        return JSONCodec().loads(data)
+
+    lazy = LazyJSON(raw, loads)
+    assert repr(lazy) == f"<LazyJSON {len(raw)} bytes>"
+    assert lazy.raw == raw and calls == []
+
+    assert lazy["has_next"] is False
+    assert len(lazy) == 2 and set(lazy) == {"result", "has_next"}
+    assert dict(lazy) == BODY
+    assert calls == [raw]
+    assert repr(lazy) == "<LazyJSON decoded>"
+    assert LazyJSON(b"", loads) == {}
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+async def test_responses_decode_alike(ozon_stub, name):
+    async def tree(request: web.Request) -> web.Response:
+        return json_response(BODY)
+
+    api = await ozon_stub({"/v1/description-category/tree": tree}, json_codec=name)
+    assert api.json_codec.name == name
+    assert await api.request("description-category/tree") == BODY
+
+    lazy = await api.request("description-category/tree", decode="lazy")
+    assert isinstance(lazy, LazyJSON) and dict(lazy) == BODY
+    raw = await api.request("description-category/tree", decode="raw")
+    assert JSONCodec().loads(raw) == BODY
@@ -0,0 +1,278 @@
+from collections import Counter
+from typing import Any, Dict, List, Set
+
+import asyncio
+import importlib.util
+import json
+
+import pytest
+from aiohttp import web
+
+from ozon_api.export import CatalogExport
+from ozon_api.retry import RetryPolicy
+from tests.conftest import json_response
+
+CATEGORY = 17027949
+TYPES = (94765, 94766, 94767)
+BRANDS = 28732849
+PAGE = 3
+VALUES = 7
+
+
+def tree() -> List[Dict[str, Any]]:
+    return [
+        {
+            "description_category_id": CATEGORY,
+            "category_name": "Шины",
+            "disabled": False,
+            "children": [
+                {
+                    "type_id": type_id,
+                    "type_name": f"Тип {type_id}",
+                    "disabled": disabled,
+                }
+                for type_id, disabled in [
+                    *((type_id, False) for type_id in TYPES),
+                    (1, True),
+                ]
+            ],
+        }
+    ]
+
+
+def attributes(type_id: int) -> List[Dict[str, Any]]:
+    found = [
+        {
+            "id": 85,
+            "name": "Бренд",
+            "dictionary_id": BRANDS,
+            "category_dependent": False,
+        },
+        {
+            "id": 4180,
+            "name": "Название",
+            "dictionary_id": 0,
+            "category_dependent": False,
+        },
+    ]
+    if type_id == TYPES[2]:
+        found.append(
+            {
+                "id": 8229,
+                "name": "Тип",
+                "dictionary_id": 1960,
+                "category_dependent": True,
+            }
+        )
+    return found
+
+
+class Catalog:
+    """
+    The stub endpoints of the catalog, counting the values requests by dictionary.
+    """
+
+    def __init__(self) -> None:
+        self.values_requests: Counter = Counter()
+        self.failing: Set[int] = set()
+        self.delay = 0.0
+        # The types whose attribute request is slow or whose connection is dropped.
+        self.slow: Set[int] = set()
+        self.dropped: Set[int] = set()
+
+    def routes(self) -> Dict[str, Any]:
+        return {
+            "/v1/description-category/tree": self.tree,
+            "/v1/description-category/attribute": self.attribute,
+            "/v1/description-category/attribute/values": self.values,
+        }
+
+    async def tree(self, request: web.Request) -> web.Response:
+        return json_response({"result": tree()})
+
+    async def attribute(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if body["type_id"] in self.slow:
+            await asyncio.sleep(1)
+        if body["type_id"] in self.dropped:
+            request.transport.close()
+        return json_response({"result": attributes(body["type_id"])})
+
+    async def values(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        attribute_id = body["attribute_id"]
+        self.values_requests[attribute_id, body["language"]] += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if attribute_id in self.failing:
+            return json_response({"code": 13, "message": "internal"})
+        start = body["last_value_id"] or attribute_id * 1000
+        end = min(start + PAGE, attribute_id * 1000 + VALUES)
+        return json_response(
+            {
+                "result": [
+                    {"id": value_id, "value": f"{body['language']} {value_id}"}
+                    for value_id in range(start + 1, end + 1)
+                ],
+                "has_next": end < attribute_id * 1000 + VALUES,
+            }
+        )
+
+
+def rows(path) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def files(directory) -> List[str]:
+    return sorted(
+        str(path.relative_to(directory))
+        for path in directory.rglob("*")
+        if path.is_file()
+    )
+
+
+async def test_export_layout_and_shared_dictionaries(ozon_stub, tmp_path):
+    catalog = Catalog()
+    api = await ozon_stub(catalog.routes())
+    report = await CatalogExport(
+        api, tmp_path, languages=("RU", "EN"), concurrency=4
+    ).run()
+
+    assert (report.categories, report.categories_skipped, report.failed) == (6, 0, [])
+    # The brands once per language, the category dependent dictionary of one type.
+    assert report.dictionaries == 4
+    assert report.values == 4 * VALUES
+    assert catalog.values_requests == {
+        (85, "RU"): 3,
+        (85, "EN"): 3,
+        (8229, "RU"): 3,
+        (8229, "EN"): 3,
+    }
+
+    assert files(tmp_path) == sorted(
+        ["categories.jsonl"]
+        + [
+            f"attributes/{language}/{CATEGORY}_{type_id}.jsonl"
+            for language in ("EN", "RU")
+            for type_id in TYPES
+        ]
+        + [f"values/{language}/{BRANDS}.jsonl" for language in ("EN", "RU")]
+        + [
+            f"values/{language}/1960_{CATEGORY}_{TYPES[2]}.jsonl"
+            for language in ("EN", "RU")
+        ]
+    )
+
+    nodes = rows(tmp_path / "categories.jsonl")
+    assert [node["type_id"] for node in nodes if node["is_type"]] == [*TYPES, 1]
+
+    brands = rows(tmp_path / "values" / "EN" / f"{BRANDS}.jsonl")
+    assert [value["id"] for value in brands] == list(range(85001, 85001 + VALUES))
+    assert brands[0] == {
+        "dictionary_id": BRANDS,
+        "attribute_id": 85,
+        "description_category_id": 0,
+        "type_id": 0,
+        "language": "EN",
+        "id": 85001,
+        "value": "EN 85001",
+    }
+    dependent = rows(tmp_path / "values" / "RU" / f"1960_{CATEGORY}_{TYPES[2]}.jsonl")
+    assert {
+        (value["description_category_id"], value["type_id"]) for value in dependent
+    } == {(CATEGORY, TYPES[2])}
+
+    attributes_rows = rows(
+        tmp_path / "attributes" / "RU" / f"{CATEGORY}_{TYPES[0]}.jsonl"
+    )
+    assert [row["id"] for row in attributes_rows] == [85, 4180]
+    assert attributes_rows[0]["type_id"] == TYPES[0]
+
+
+async def test_failed_dictionaries_are_resumed(ozon_stub, tmp_path):
+    catalog = Catalog()
+    catalog.failing.add(8229)
+    api = await ozon_stub(catalog.routes())
+
+    report = await CatalogExport(api, tmp_path, concurrency=2).run()
+    assert report.categories == 2
+    assert [failed[:3] for failed in report.failed] == [(CATEGORY, TYPES[2], "DEFAULT")]
+    assert not (
+        tmp_path / "attributes" / "DEFAULT" / f"{CATEGORY}_{TYPES[2]}.jsonl"
+    ).exists()
+    assert not list(tmp_path.rglob("*.tmp"))
+
+    catalog.failing.clear()
+    catalog.values_requests.clear()
+    report = await CatalogExport(api, tmp_path, concurrency=2).run()
+    assert (report.categories, report.categories_skipped, report.failed) == (1, 2, [])
+    assert (report.dictionaries, report.dictionaries_skipped) == (1, 1)
+    # Only the dictionary that failed is downloaded again.
+    assert catalog.values_requests == {(8229, "DEFAULT"): 3}
+
+
+async def test_cancelled_export_stops_its_dictionaries(ozon_stub, tmp_path):
+    catalog = Catalog()
+    catalog.delay = 0.05
+    api = await ozon_stub(catalog.routes())
+
+    export = asyncio.ensure_future(CatalogExport(api, tmp_path, concurrency=4).run())
+    while not catalog.values_requests:
+        await asyncio.sleep(0.01)
+    export.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await export
+
+    requests = sum(catalog.values_requests.values())
+    await asyncio.sleep(0.3)
+    assert sum(catalog.values_requests.values()) == requests
+    assert not list(tmp_path.rglob("*.tmp"))
+    assert not list((tmp_path / "values").rglob("*.jsonl"))
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("pyarrow") is not None, reason="pyarrow installed"
+)
+async def test_parquet_names_the_extra(ozon_stub, tmp_path):
+    api = await ozon_stub(Catalog().routes())
+    with pytest.raises(ImportError, match=r"ozon-api\[parquet\]"):
+        await CatalogExport(api, tmp_path, format="parquet").run()
+
+
+@pytest.mark.parametrize("failure", ["slow", "dropped"])
+async def test_timeouts_and_connection_errors_fail_one_category(
+    ozon_stub, tmp_path, failure
+):
+    catalog = Catalog()
+    getattr(catalog, failure).add(TYPES[1])
+    api = await ozon_stub(
+        catalog.routes(),
+        retry_policies={
+            "description-category/attribute": RetryPolicy(timeout=0.2, max_attempts=1)
+        },
+    )
+    report = await CatalogExport(api, tmp_path, concurrency=2).run()
+    assert report.categories == 2
+    assert [failed[:3] for failed in report.failed] == [(CATEGORY, TYPES[1], "DEFAULT")]
+    assert report.failed[0][3]
+
+
+async def test_parquet_parts_have_a_fixed_schema(ozon_stub, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    api = await ozon_stub(Catalog().routes())
+    report = await CatalogExport(api, tmp_path, format="parquet").run()
+    assert (report.categories, report.failed) == (3, [])
+
+    first = parquet.read_table(
+        tmp_path / "attributes" / "DEFAULT" / f"{CATEGORY}_{TYPES[0]}.parquet"
+    )
+    last = parquet.read_table(
+        tmp_path / "attributes" / "DEFAULT" / f"{CATEGORY}_{TYPES[2]}.parquet"
+    )
+    assert first.schema == last.schema
+    # Columns missing from the responses are still there, as nulls.
+    assert first.column("is_required").to_pylist() == [None, None]
+
+    brands = parquet.read_table(tmp_path / "values" / "DEFAULT" / f"{BRANDS}.parquet")
+    assert brands.column("id").to_pylist() == list(range(85001, 85001 + VALUES))
+    assert str(brands.schema.field("value").type) == "string"
@@ -0,0 +1,193 @@
+from typing import Any, Dict, List
+
+import asyncio
+import subprocess
+import sys
+
+from aiohttp import web
+
+from tests.conftest import json_response
+
+
+def test_import_loads_no_optional_modules():
+    # A fresh interpreter: the modules of this test run are loaded already.
+    code = (
+        "import sys, ozon_api\n"
+        "heavy = {'aiohttp', 'pydantic', 'sqlite3', 'ozon_api.cache', 'ozon_api.models.batch'}\n"
+        "print(sorted(heavy & set(sys.modules)))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+class Imports:
+    """
+    The stub endpoints of product import, finishing a task after `polls` status requests.
+    """
+
+    def __init__(self, polls: Dict[str, int]) -> None:
+        # The polls needed by the task of the chunk starting with this offer_id.
+        self.polls = polls
+        self.chunks: List[List[str]] = []
+        self.info_calls: List[int] = []
+        self.offers: Dict[int, List[str]] = {}
+
+    def routes(self) -> Dict[str, Any]:
+        return {
+            "/v3/product/import": self.product_import,
+            "/v1/product/import/info": self.product_import_info,
+        }
+
+    async def product_import(self, request: web.Request) -> web.Response:
+        offers = [item["offer_id"] for item in (await request.json())["items"]]
+        self.chunks.append(offers)
+        task_id = len(self.chunks)
+        self.offers[task_id] = offers
+        return json_response({"result": {"task_id": task_id}})
+
+    async def product_import_info(self, request: web.Request) -> web.Response:
+        task_id = (await request.json())["task_id"]
+        self.info_calls.append(task_id)
+        offers = self.offers[task_id]
+        if offers[0] == "unknown":
+            return json_response({"code": 5, "message": "task not found"})
+        done = self.info_calls.count(task_id) >= self.polls.get(offers[0], 1)
+        status = "imported" if done else "pending"
+        items = [{"offer_id": offer, "status": status} for offer in offers]
+        return json_response({"result": {"items": items, "total": len(items)}})
+
+
+def offers(*names: str) -> List[Dict[str, Any]]:
+    return [{"offer_id": name} for name in names]
+
+
+async def collect(api, items, **options: Any) -> List[Dict[str, Any]]:
+    return [
+        result
+        async for result in api.product_import_bulk(items, trusted=True, **options)
+    ]
+
+
+async def test_bulk_import_is_sent_in_chunks(ozon_stub):
+    imports = Imports({})
+    api = await ozon_stub(imports.routes())
+    api.import_poller.min_interval = 0.01
+
+    items = offers(*(str(index) for index in range(250)))
+    results = await collect(api, iter(items), chunk_size=100)
+    assert sorted(len(chunk) for chunk in imports.chunks) == [50, 100, 100]
+    assert sorted(chunk[0] for chunk in imports.chunks) == ["0", "100", "200"]
+    assert sorted(result["offer_id"] for result in results) == sorted(
+        item["offer_id"] for item in items
+    )
+    assert {result["status"] for result in results} == {"imported"}
+
+
+async def test_bulk_results_follow_the_tasks_as_they_finish(ozon_stub):
+    # The first chunk takes longer than the second, its results come last.
+    imports = Imports({"a1": 4, "b1": 1})
+    api = await ozon_stub(imports.routes())
+    api.import_poller.min_interval = 0.01
+    api.import_poller.backoff = 1
+
+    results = await collect(api, offers("a1", "a2", "b1", "b2"), chunk_size=2)
+    assert [result["offer_id"] for result in results] == ["b1", "b2", "a1", "a2"]
+    tasks = {result["offer_id"]: result["task_id"] for result in results}
+    assert tasks["a1"] == tasks["a2"] != tasks["b1"] == tasks["b2"]
+
+
+async def test_bulk_reports_a_lost_task_without_stopping(ozon_stub):
+    imports = Imports({})
+    api = await ozon_stub(imports.routes())
+    api.import_poller.min_interval = 0.01
+
+    results = await collect(api, offers("unknown", "x", "b1"), chunk_size=2)
+    statuses = {result["offer_id"]: result["status"] for result in results}
+    assert statuses == {"unknown": "failed", "x": "failed", "b1": "imported"}
+
+
+async def test_breaking_early_stops_polling(ozon_stub):
+    imports = Imports({"a1": 1, "b1": 1000})
+    api = await ozon_stub(imports.routes())
+    api.import_poller.min_interval = 0.01
+    api.import_poller.backoff = 1
+
+    bulk = api.product_import_bulk(offers("a1", "b1"), chunk_size=1, trusted=True)
+    async for result in bulk:
+        assert result["offer_id"] == "a1"
+        break
+    await bulk.aclose()
+
+    assert len(api.import_poller) == 0
+    calls = len(imports.info_calls)
+    await asyncio.sleep(0.1)
+    assert len(imports.info_calls) == calls
+
+
+class Pictures:
+    """
+    The stub endpoints of picture import; the pictures are pending for the first
+    status request of their product.
+    """
+
+    def __init__(self, failing: int = 0) -> None:
+        # The product whose first picture fails.
+        self.failing = failing
+        self.imported: Dict[int, List[str]] = {}
+        self.info_calls: List[List[int]] = []
+
+    def routes(self) -> Dict[str, Any]:
+        return {
+            "/v1/product/pictures/import": self.product_pictures_import,
+            "/v1/product/pictures/info": self.product_pictures_info,
+        }
+
+    async def product_pictures_import(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.imported[body["product_id"]] = body["images"]
+        return json_response({"result": {"pictures": []}})
+
+    async def product_pictures_info(self, request: web.Request) -> web.Response:
+        product_ids = [
+            int(product_id) for product_id in (await request.json())["product_id"]
+        ]
+        self.info_calls.append(product_ids)
+        pictures = []
+        for product_id in product_ids:
+            polls = sum(product_id in call for call in self.info_calls)
+            for index, url in enumerate(self.imported[product_id]):
+                state = "imported" if polls > 1 else "pending"
+                if product_id == self.failing and index == 0 and polls > 1:
+                    state = "failed"
+                pictures.append({"product_id": product_id, "url": url, "state": state})
+        return json_response({"result": {"pictures": pictures}})
+
+
+async def test_bulk_pictures_end_in_one_final_outcome_per_product(ozon_stub):
+    pictures = Pictures(failing=3)
+    api = await ozon_stub(pictures.routes())
+    api.pictures_poller.min_interval = 0.01
+
+    products = [
+        (1, ["https://example.com/1a.jpg", "https://example.com/1b.jpg"]),
+        ("2", "https://example.com/2.jpg"),
+        (3, {"images": ["https://example.com/3.jpg"]}),
+        (4, []),
+    ]
+    outcomes = [outcome async for outcome in api.product_pictures_import_bulk(products)]
+    statuses = {outcome["product_id"]: outcome["status"] for outcome in outcomes}
+    assert len(outcomes) == 4
+    assert statuses == {1: "imported", 2: "imported", 3: "failed", 4: "invalid"}
+
+    by_product = {outcome["product_id"]: outcome for outcome in outcomes}
+    assert [picture["state"] for picture in by_product[1]["pictures"]] == [
+        "imported",
+        "imported",
+    ]
+    # The product without pictures is not sent.
+    assert by_product[4]["errors"] and sorted(pictures.imported) == [1, 2, 3]
+    # The products are checked together, not with one request each.
+    assert len(pictures.info_calls) < 3 * 2
+    assert len(api.pictures_poller) == 0
@@ -0,0 +1,39 @@
+from typing import List
+
+import pytest
+from loguru import logger as loguru_logger
+
+from ozon_api import log
+from ozon_api.log import disable_logging, enable_logging, logger
+
+
+@pytest.fixture
+def records():
+    emitted: List[dict] = []
+    handler = loguru_logger.add(
+        lambda message: emitted.append(message.record), level="DEBUG"
+    )
+    yield emitted
+    loguru_logger.remove(handler)
+    disable_logging()
+
+
+def test_silent_by_default(records):
+    logger.info("not {}", "sent")
+    logger.error("not sent either")
+    assert records == []
+
+
+def test_emits_once_enabled(records):
+    enable_logging()
+    logger.warning("chunk {} of {} failed", 2, 5)
+    assert len(records) == 1
+    assert records[0]["level"].name == "WARNING"
+    assert records[0]["message"] == "chunk 2 of 5 failed"
+    # The record is attributed to the caller, not to the shim.
+    assert records[0]["name"] == __name__
+    assert records[0]["name"] != log.__name__
+
+    disable_logging()
+    logger.warning("dropped")
+    assert len(records) == 1
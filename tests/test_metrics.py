@@ -0,0 +1,64 @@
+from typing import List
+
+import pytest
+from aiohttp import web
+
+from ozon_api.metrics import InMemoryMetrics, MetricsSink, RequestSample
+from ozon_api.retry import RetryPolicy
+from tests.test_retry import replies
+
+
+class Recorder(MetricsSink):
+    def __init__(self) -> None:
+        self.samples: List[RequestSample] = []
+
+    def observe(self, sample: RequestSample) -> None:
+        self.samples.append(sample)
+
+
+def test_a_sink_must_implement_observe():
+    class Incomplete(MetricsSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_every_attempt_is_reported(ozon_stub):
+    calls: List[str] = []
+    sink = Recorder()
+    api = await ozon_stub(
+        {"/v1/description-category/tree": replies([503, 502], calls)},
+        retry_policies={
+            "description-category/tree": RetryPolicy(base_delay=0.001, max_delay=0.01)
+        },
+        metrics=sink,
+    )
+    assert await api.get_description_category_tree() == {"result": []}
+
+    assert [sample.status for sample in sink.samples] == [503, 502, 200]
+    assert {sample.endpoint for sample in sink.samples} == {"description-category/tree"}
+    assert all(sample.latency > 0 for sample in sink.samples)
+    # The bodies of the retried responses are not read.
+    assert sink.samples[-1].bytes_received == len(b'{"result": []}')
+    assert sink.samples[-1].server > 0
+    # The attempts reported to the sink match the retry counters.
+    stats = api.retry_stats.endpoint("description-category/tree")
+    assert (stats.attempts, stats.retries) == (len(sink.samples), 2)
+
+
+async def test_in_memory_metrics_count_statuses(ozon_stub):
+    calls: List[str] = []
+    metrics = InMemoryMetrics()
+    api = await ozon_stub(
+        {"/v1/description-category/tree": replies([503], calls)},
+        retry_policies={
+            "description-category/tree": RetryPolicy(base_delay=0.001, max_delay=0.01)
+        },
+        metrics=metrics,
+    )
+    await api.get_description_category_tree()
+    snapshot = metrics.snapshot()["description-category/tree"]
+    assert snapshot["requests"] == 2
+    assert snapshot["statuses"] == {503: 1, 200: 1}
+    assert snapshot["latency"]["count"] == 2
@@ -0,0 +1,107 @@
+from typing import Any, Dict, List
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from ozon_api.exceptions import OzonAPIError
+from ozon_api.pagination import prefetched
+from tests.conftest import json_response
+
+PRODUCTS = 25
+
+
+class ProductList:
+    """
+    A product/list stand-in: PRODUCTS products paged by last_id, the id of the last one.
+    """
+
+    def __init__(self) -> None:
+        self.requests: List[Dict[str, Any]] = []
+
+    async def handler(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests.append(body)
+        start = int(body["last_id"] or 0)
+        end = min(start + body["limit"], PRODUCTS)
+        items = [
+            {"product_id": product_id, "offer_id": f"A-{product_id}"}
+            for product_id in range(start + 1, end + 1)
+        ]
+        # Like Ozon, the last page still has a last_id; the next one is empty.
+        return json_response(
+            {"result": {"items": items, "total": PRODUCTS, "last_id": str(end)}}
+        )
+
+
+async def test_every_product_is_listed_in_order(ozon_stub):
+    products = ProductList()
+    api = await ozon_stub({"/v1/product/list": products.handler})
+    listed = [item async for item in api.iter_product_list(limit=10)]
+    assert [item["product_id"] for item in listed] == list(range(1, PRODUCTS + 1))
+    assert [body["last_id"] for body in products.requests] == ["", "10", "20", "25"]
+    assert products.requests[0]["filter"] == {"visibility": "ALL"}
+
+    pairs = [
+        pair
+        async for pair in api.iter_product_list(
+            limit=10, prefetch=0, fields=("product_id", "offer_id")
+        )
+    ]
+    assert pairs[:2] == [(1, "A-1"), (2, "A-2")]
+    ids = [pid async for pid in api.iter_product_list(fields=("product_id",))]
+    assert ids == list(range(1, PRODUCTS + 1))
+
+
+async def test_a_failed_page_is_raised(ozon_stub):
+    async def handler(request: web.Request) -> web.Response:
+        return json_response({"code": 7, "message": "denied"})
+
+    api = await ozon_stub({"/v1/product/list": handler})
+    with pytest.raises(OzonAPIError, match="denied"):
+        async for _ in api.iter_product_list():
+            pass
+
+
+async def test_stopping_early_cancels_the_prefetch(ozon_stub):
+    products = ProductList()
+    api = await ozon_stub({"/v1/product/list": products.handler})
+    listing = api.iter_product_list(limit=5, prefetch=2)
+    async for item in listing:
+        break
+    await listing.aclose()
+    # A request in flight when the prefetch was cancelled may still reach the server.
+    await asyncio.sleep(0.05)
+    requested = len(products.requests)
+    await asyncio.sleep(0.05)
+    assert len(products.requests) == requested
+    # The first page, the two queued ones and one in flight at most, of 6 pages in total.
+    assert requested <= 4
+
+
+async def test_prefetched_reads_ahead_in_order():
+    produced: List[int] = []
+    finished = asyncio.Event()
+
+    async def source():
+        try:
+            for page in range(10):
+                produced.append(page)
+                yield page
+        finally:
+            finished.set()
+
+    consumed = []
+    pages = prefetched(source(), depth=2)
+    async for page in pages:
+        consumed.append(page)
+        await asyncio.sleep(0)
+        # The producer runs at most `depth` pages ahead of the consumer.
+        assert len(produced) - len(consumed) <= 3
+        if page == 4:
+            break
+    await pages.aclose()
+    assert consumed == [0, 1, 2, 3, 4]
+    # The source is closed right away, not when it is garbage collected.
+    assert finished.is_set()
@@ -0,0 +1,73 @@
+from typing import Any, Dict, List
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from ozon_api.exceptions import OzonAPIError
+from tests.conftest import json_response
+
+PENDING = {"result": {"items": [{"offer_id": "A-1", "status": "pending"}], "total": 1}}
+IMPORTED = {
+    "result": {"items": [{"offer_id": "A-1", "status": "imported"}], "total": 1}
+}
+
+
+def import_info(responses: Dict[int, List[Dict[str, Any]]], calls: List[int]):
+    """
+    A product/import/info handler answering each task with its responses in turn,
+    then with the last one again.
+    """
+
+    async def handler(request: web.Request) -> web.Response:
+        task_id = (await request.json())["task_id"]
+        calls.append(task_id)
+        queued = responses[task_id]
+        return json_response(queued.pop(0) if len(queued) > 1 else queued[0])
+
+    return handler
+
+
+async def test_tasks_finish_with_their_final_status(ozon_stub):
+    calls: List[int] = []
+    api = await ozon_stub(
+        {"/v1/product/import/info": import_info({1: [PENDING, IMPORTED]}, calls)}
+    )
+    api.import_poller.min_interval = 0.01
+    assert await api.wait_import_task(1) == IMPORTED["result"]
+    assert calls == [1, 1]
+    assert len(api.import_poller) == 0
+
+
+async def test_a_task_without_result_fails_its_waiters(ozon_stub):
+    calls: List[int] = []
+    unknown = {"code": 5, "message": "task not found"}
+    api = await ozon_stub(
+        {"/v1/product/import/info": import_info({1: [unknown], 2: [IMPORTED]}, calls)}
+    )
+    api.import_poller.min_interval = 0.01
+    first, second, other = await asyncio.gather(
+        api.wait_import_task(1),
+        api.wait_import_task(1),
+        api.wait_import_task(2),
+        return_exceptions=True,
+    )
+    assert isinstance(first, OzonAPIError) and first is second
+    assert first.body == unknown
+    assert other == IMPORTED["result"]
+    assert calls.count(1) == 1
+
+
+async def test_pending_tasks_time_out(ozon_stub):
+    calls: List[int] = []
+    api = await ozon_stub(
+        {"/v1/product/import/info": import_info({1: [PENDING]}, calls)}
+    )
+    assert api.import_poller.timeout == 30 * 60
+
+    api.import_poller.min_interval = 0.01
+    api.import_poller.timeout = 0.1
+    with pytest.raises(asyncio.TimeoutError):
+        await api.wait_import_task(1)
+    assert len(api.import_poller) == 0
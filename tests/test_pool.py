@@ -0,0 +1,85 @@
+from typing import Dict, List, Tuple
+
+import asyncio
+
+from aiohttp import web
+
+from ozon_api import OzonAPI
+from ozon_api.pool import OzonAPIPool
+from tests.conftest import json_response
+
+ACCOUNTS = [("1", "key-1"), ("2", "key-2"), ("3", "key-3")]
+
+
+class Accounts:
+    """
+    A product/list stand-in recording the credentials of every call; the first
+    accounts answer last.
+    """
+
+    def __init__(self) -> None:
+        self.seen: List[Tuple[str, str]] = []
+
+    async def product_list(self, request: web.Request) -> web.Response:
+        client_id = request.headers["Client-Id"]
+        self.seen.append((client_id, request.headers["Api-Key"]))
+        await asyncio.sleep(0.02 * (len(ACCOUNTS) - int(client_id)))
+        return json_response({"result": {"client_id": client_id}})
+
+
+async def start(ozon_stub, accounts: Accounts, **options) -> OzonAPIPool:
+    stub = await ozon_stub({"/v1/product/list": accounts.product_list})
+    pool = OzonAPIPool(ACCOUNTS, **options)
+    for client_id in pool:
+        pool[client_id].api_url = stub.api_url
+    return pool
+
+
+async def product_list(api: OzonAPI) -> Dict[str, str]:
+    return (await api.product_list({"filter": {}, "limit": 1}))["result"]
+
+
+async def test_credentials_are_routed_to_their_client(ozon_stub):
+    accounts = Accounts()
+    async with await start(ozon_stub, accounts) as pool:
+        assert len(pool) == 3 and "2" in pool
+        assert pool["2"] is pool.get("2")
+        assert await product_list(pool["2"]) == {"client_id": "2"}
+        assert accounts.seen == [("2", "key-2")]
+
+        pool.add("4", "key-4")
+        pool["4"].api_url = pool["1"].api_url
+        await product_list(pool["4"])
+        assert accounts.seen[-1] == ("4", "key-4")
+
+
+async def test_map_keeps_the_order_of_the_accounts(ozon_stub):
+    accounts = Accounts()
+    async with await start(ozon_stub, accounts) as pool:
+        # The first account answers last, the results still follow the accounts.
+        results = await pool.map(product_list)
+        assert list(results) == ["1", "2", "3"]
+        assert results == {client_id: {"client_id": client_id} for client_id in pool}
+
+        results = await pool.map(product_list, client_ids=["3", "1"])
+        assert list(results) == ["3", "1"]
+
+
+async def test_close_closes_every_member_session(ozon_stub):
+    accounts = Accounts()
+    pool = await start(ozon_stub, accounts)
+    await pool.map(product_list)
+    sessions = [await pool[client_id]._get_session() for client_id in pool]
+    connector = sessions[0].connector
+    assert all(session.connector is connector for session in sessions)
+
+    api_url = pool["1"].api_url
+    await pool.close()
+    assert all(session.closed for session in sessions)
+    assert connector.closed
+
+    # The pool can be used again, with new clients on a new connector.
+    pool["1"].api_url = api_url
+    assert await product_list(pool["1"]) == {"client_id": "1"}
+    assert (await pool["1"]._get_session()).connector is not connector
+    await pool.close()
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from ozon_api.exceptions import QuotaExceededError
+from ozon_api.quota import QuotaScheduler
+from tests.conftest import json_response
+
+
+RESET_AT = (datetime.now(timezone.utc) + timedelta(hours=1)).replace(microsecond=0)
+
+
+def limits(
+    create: int, create_usage: int = 0, reset_in: Optional[float] = None
+) -> Dict[str, Any]:
+    reset_at = RESET_AT
+    if reset_in is not None:
+        reset_at = datetime.now(timezone.utc) + timedelta(seconds=reset_in)
+    reset_at = reset_at.isoformat()
+    return {
+        "daily_create": {"limit": create, "usage": create_usage, "reset_at": reset_at},
+        "daily_update": {"limit": 1000, "usage": 0, "reset_at": reset_at},
+        "total": {"limit": -1, "usage": 0},
+    }
+
+
+class Limits:
+    """
+    A product/info/limit stand-in returning the queued responses, then the last one again.
+    """
+
+    def __init__(self, *responses: Dict[str, Any]) -> None:
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def __call__(self) -> Dict[str, Any]:
+        self.calls += 1
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        return self.responses[0]
+
+
+async def test_take_counts_locally_between_refreshes():
+    fetch = Limits(limits(create=100, create_usage=10))
+    quota = QuotaScheduler(fetch=fetch)
+    assert await quota.take("create", 40) == 40
+    assert await quota.take("create", 80, partial=True) == 50
+    assert fetch.calls == 1
+
+    status = quota.status()["create"]
+    assert (status["usage"], status["remaining"], status["sent"]) == (100, 0, 90)
+
+    quota.release("create", 30)
+    assert quota.status()["create"]["remaining"] == 30
+
+
+async def test_never_fitting_work_is_rejected():
+    quota = QuotaScheduler(fetch=Limits(limits(create=100)), reserve=10)
+    with pytest.raises(QuotaExceededError):
+        await quota.take("create", 95)
+
+
+async def test_waits_for_the_reset_in_order():
+    fetch = Limits(limits(create=10, create_usage=10, reset_in=0.1), limits(create=10))
+    quota = QuotaScheduler(fetch=fetch, reset_grace=0)
+    started = time.monotonic()
+    granted = await asyncio.gather(quota.take("create", 6), quota.take("create", 4))
+    assert granted == [6, 4]
+    assert 0.05 < time.monotonic() - started < 2
+    assert quota.status()["create"]["usage"] == 10
+
+
+async def test_server_usage_does_not_hide_local_sends():
+    fetch = Limits(
+        limits(create=100, create_usage=0), limits(create=100, create_usage=5)
+    )
+    quota = QuotaScheduler(fetch=fetch)
+    await quota.take("create", 30)
+    await quota.refresh(force=True)
+    # Ozon reports 5 of the 30 sent so far, the local count is kept within the window.
+    assert quota.status()["create"]["usage"] == 30
+
+
+async def test_project_counts_whole_windows():
+    quota = QuotaScheduler(fetch=Limits(limits(create=100, create_usage=60)))
+    await quota.refresh()
+    now = datetime.now(timezone.utc)
+    assert quota.project("create", 40) <= datetime.now(timezone.utc)
+    assert quota.project("create", 41) == RESET_AT
+    assert quota.project("create", 241) == RESET_AT + timedelta(days=2)
+    assert quota.project("create", 40) >= now
+
+
+async def test_bulk_import_splits_chunks_at_the_quota(ozon_stub):
+    quota = QuotaScheduler(reset_grace=0)
+    limit_calls: List[int] = []
+    sent: List[int] = []
+
+    async def product_info_limit(request: web.Request) -> web.Response:
+        limit_calls.append(1)
+        # 150 products left today; the window resets shortly after the first fetch.
+        if len(limit_calls) == 1:
+            return json_response(limits(create=150, reset_in=0.2))
+        return json_response(limits(create=150))
+
+    async def product_import(request: web.Request) -> web.Response:
+        sent.append(len((await request.json())["items"]))
+        if sent[-1] == 1:
+            return json_response({"code": 3, "message": "rejected"})
+        return json_response({"result": {"task_id": len(sent)}})
+
+    async def product_import_info(request: web.Request) -> web.Response:
+        return json_response(
+            {"result": {"items": [{"offer_id": "x", "status": "imported"}]}}
+        )
+
+    api = await ozon_stub(
+        {
+            "/v4/product/info/limit": product_info_limit,
+            "/v3/product/import": product_import,
+            "/v1/product/import/info": product_import_info,
+        },
+        quota=quota,
+    )
+    api.import_poller.min_interval = 0.01
+
+    items = [{"offer_id": str(index)} for index in range(250)]
+    results = [
+        result
+        async for result in api.product_import_bulk(items, chunk_size=100, trusted=True)
+    ]
+    # The first chunk and half of the second fill the first window, the rest of the second
+    # and the last chunk are sent after the reset.
+    assert sorted(sent) == [50, 50, 50, 100]
+    assert len(limit_calls) == 2
+    assert len(results) == 4
+    assert quota.status()["create"]["sent"] == 250
+
+    # A request rejected by the API gives its products back.
+    await api.product_import([{"offer_id": "x"}], trusted=True)
+    assert quota.status()["create"]["sent"] == 250
@@ -0,0 +1,116 @@
+from typing import List
+
+import asyncio
+
+import pytest
+
+from ozon_api import ratelimit
+from ozon_api.ratelimit import FairLimiter, RateLimiter, TokenBucket
+
+_sleep = asyncio.sleep
+
+
+class Clock:
+    """
+    Replaces time.monotonic and asyncio.sleep of ozon_api.ratelimit: sleeping moves the
+    clock forward at once and is recorded.
+    """
+
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+        await _sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+async def test_tokens_refill_at_the_rate(clock):
+    # Binary fractions keep the fake clock exact.
+    bucket = TokenBucket(rate=4, burst=2)
+    for _ in range(3):
+        await bucket.acquire()
+    # The burst is spent at once, the third request waits for one token.
+    assert clock.sleeps == [0.25]
+
+    clock.now += 10
+    for _ in range(4):
+        await bucket.acquire()
+    # Idle time refills up to the burst only.
+    assert clock.sleeps == [0.25, 0.25, 0.25]
+
+
+async def test_rate_halves_on_429_and_grows_additively(clock):
+    bucket = TokenBucket(rate=10, min_rate=2, decrease_factor=0.5, recovery_step=0.1)
+    bucket.throttle(retry_after=1)
+    assert bucket.rate == 5
+    # Other 429 responses of the same pause do not lower it again.
+    bucket.throttle(retry_after=1)
+    assert bucket.rate == 5
+
+    await bucket.acquire()
+    assert clock.sleeps[0] == 1
+
+    bucket.throttle()
+    assert bucket.rate == 2.5
+    clock.now += 1
+    bucket.throttle()
+    assert bucket.rate == 2
+
+    rates = []
+    for _ in range(10):
+        bucket.recover()
+        rates.append(bucket.rate)
+    assert rates[:3] == [3, 4, 5]
+    assert rates[-1] == 10
+
+
+def test_groups_and_accounts_get_their_own_buckets():
+    limiter = RateLimiter(rate=50, groups={"product/import": 10})
+    imports = limiter.bucket("1", "product/import/info")
+    assert imports.rate == 10
+    assert limiter.bucket("1", "product/import-by-sku").rate == 50
+    assert limiter.bucket("1", "/product/import/") is imports
+    assert limiter.bucket("2", "product/import") is not imports
+
+    limiter.set_rate(5, "product/import", client_id="2")
+    assert limiter.bucket("2", "product/import").rate == 5
+    assert limiter.bucket("1", "product/import") is imports
+
+
+async def test_fair_limiter_alternates_between_accounts():
+    limiter = FairLimiter(concurrency=1, per_account=None)
+    granted: List[str] = []
+
+    async def request(account: str, name: str) -> None:
+        await limiter.acquire(account)
+        granted.append(name)
+
+    await limiter.acquire("a")
+    tasks = [
+        asyncio.ensure_future(request(account, f"{account}{index}"))
+        for account, count in (("a", 3), ("b", 2))
+        for index in range(count)
+    ]
+    await _sleep(0)
+    assert limiter.waiting() == 5
+
+    limiter.release("a")
+    for _ in range(5):
+        await _sleep(0)
+        limiter.release(granted[-1][0])
+    await asyncio.gather(*tasks)
+    assert granted == ["a0", "b0", "a1", "b1", "a2"]
+    assert limiter.in_flight == 0
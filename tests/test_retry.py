@@ -0,0 +1,179 @@
+from dataclasses import replace
+from typing import List
+
+import asyncio
+
+import pytest
+from aiohttp import ClientConnectorError, web
+
+from ozon_api import retry
+from ozon_api.exceptions import CircuitOpenError, OzonAPIError
+from ozon_api.retry import WRITE_POLICY, CircuitBreaker, RetryPolicy, default_policy
+from tests.conftest import json_response
+
+FAST = RetryPolicy(base_delay=0.001, max_delay=0.01)
+
+
+def replies(statuses: List[int], calls: List[str]):
+    """
+    A handler answering with the given statuses in turn, then with 200.
+    """
+
+    async def handler(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        status = statuses[len(calls) - 1] if len(calls) <= len(statuses) else 200
+        return json_response(
+            {"result": [] if status == 200 else "error"}, status=status
+        )
+
+    return handler
+
+
+async def test_reads_are_retried_on_5xx(ozon_stub):
+    calls: List[str] = []
+    api = await ozon_stub(
+        {"/v1/description-category/tree": replies([503, 502], calls)},
+        retry_policies={"description-category/tree": FAST},
+    )
+    assert await api.get_description_category_tree() == {"result": []}
+    assert len(calls) == 3
+    stats = api.retry_stats.endpoint("description-category/tree")
+    assert (stats.attempts, stats.retries, stats.failures) == (3, 2, 0)
+
+
+async def test_reads_fail_after_the_last_attempt(ozon_stub):
+    calls: List[str] = []
+    api = await ozon_stub(
+        {"/v1/description-category/tree": replies([500] * 10, calls)},
+        retry_policies={"description-category/tree": FAST},
+    )
+    with pytest.raises(OzonAPIError) as error:
+        await api.get_description_category_tree()
+    assert error.value.status == 500
+    assert len(calls) == FAST.max_attempts
+
+
+async def test_writes_are_not_repeated_after_a_response(ozon_stub):
+    calls: List[str] = []
+    api = await ozon_stub({"/v3/product/import": replies([500], calls)})
+    with pytest.raises(OzonAPIError):
+        await api.product_import([], trusted=True)
+    assert calls == ["/v3/product/import"]
+
+
+async def test_circuit_breaker_opens_and_probes(ozon_stub):
+    calls: List[str] = []
+    statuses = [503, 503]
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
+    api = await ozon_stub(
+        {"/v1/description-category/tree": replies(statuses, calls)},
+        retry_policies={"description-category/tree": RetryPolicy(max_attempts=1)},
+        circuit_breaker=breaker,
+    )
+    for _ in statuses:
+        with pytest.raises(OzonAPIError):
+            await api.get_description_category_tree()
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        await api.get_description_category_tree()
+    assert len(calls) == 2
+
+    await asyncio.sleep(0.1)
+    assert breaker.state == "half-open"
+    # One probe is sent, the concurrent request fails fast instead of waiting for it.
+    probe, other = await asyncio.gather(
+        api.get_description_category_tree(),
+        api.get_description_category_tree(),
+        return_exceptions=True,
+    )
+    assert probe == {"result": []}
+    assert isinstance(other, CircuitOpenError)
+    assert breaker.state == "closed"
+    assert len(calls) == 3
+
+
+def test_backoff_grows_from_the_base_delay(monkeypatch):
+    monkeypatch.setattr("ozon_api.retry.random.uniform", lambda low, high: high)
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+    assert [policy.backoff(retry) for retry in (1, 2, 3, 4, 5)] == [
+        0.5,
+        1.0,
+        2.0,
+        3.0,
+        3.0,
+    ]
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_after_consecutive_failures(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(retry, "time", clock)
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    # A success in between resets the count.
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request("product/list")
+
+    clock.now += 10
+    assert breaker.state == "half-open"
+    breaker.before_request("product/list")
+    # Only one probe is let through.
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request("product/list")
+
+    # A failed probe opens the breaker for another recovery_timeout.
+    breaker.record_failure()
+    clock.now += 9
+    assert breaker.state == "open"
+    clock.now += 1
+    breaker.before_request("product/list")
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_request("product/list")
+
+
+async def test_writes_are_not_repeated_after_a_timeout(ozon_stub):
+    calls: List[str] = []
+
+    async def product_import(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        await asyncio.sleep(1)
+        return json_response({"result": {"task_id": 1}})
+
+    assert default_policy("product/import") is WRITE_POLICY
+    api = await ozon_stub(
+        {"/v3/product/import": product_import},
+        retry_policies={"product/import": replace(WRITE_POLICY, timeout=0.1)},
+    )
+    with pytest.raises(asyncio.TimeoutError):
+        await api.product_import([], trusted=True)
+    assert calls == ["/v3/product/import"]
+
+
+async def test_writes_are_retried_when_not_sent(ozon_stub):
+    api = await ozon_stub(
+        {},
+        retry_policies={"product/import": replace(WRITE_POLICY, base_delay=0.001)},
+    )
+    # Nothing listens on port 1, so no request ever reaches a server.
+    api.api_url = "http://127.0.0.1:1"
+    with pytest.raises(ClientConnectorError):
+        await api.product_import([], trusted=True)
+    stats = api.retry_stats.endpoint("product/import")
+    assert (stats.attempts, stats.retries) == (WRITE_POLICY.max_attempts, 2)
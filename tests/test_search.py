@@ -0,0 +1,73 @@
+from typing import List
+
+from aiohttp import web
+
+from ozon_api.search import AttributeValueIndex, normalize, trigrams
+from tests.conftest import json_response
+
+BRANDS = [
+    {"id": 1, "value": "Adidas"},
+    {"id": 2, "value": "Adidas Originals"},
+    {"id": 3, "value": "Nike"},
+    {"id": 4, "value": "Ёлочка"},
+    {"id": 5, "value": "New Balance"},
+]
+
+
+def test_exact_casefold_and_prefix():
+    index = AttributeValueIndex(BRANDS)
+    assert index.lookup("Nike").method == "exact"
+    assert index.lookup("  nike ").method == "casefold"
+    assert index.lookup("елочка").id == 4
+    assert [match.id for match in index.prefix("adi")] == [1, 2]
+    assert index.lookup("Puma") is None
+    assert "ADIDAS" in index
+
+
+def test_fuzzy_matches_agree_with_the_dice_coefficient():
+    index = AttributeValueIndex(BRANDS)
+    found = index.fuzzy("Adidsa Originals", threshold=0.5)
+    assert found[0].id == 2
+
+    grams = trigrams(normalize("Adidsa Originals"))
+    other = trigrams(normalize("Adidas Originals"))
+    assert found[0].score == 2 * len(grams & other) / (len(grams) + len(other))
+
+    assert index.match("New Balanse").id == 5
+    assert index.match("completely different") is None
+
+
+def test_values_added_after_the_first_search_are_found():
+    index = AttributeValueIndex(BRANDS)
+    assert index.fuzzy("Reebok Classic") == []
+    assert index.add([{"id": 6, "value": "Reebok"}, {"id": 3, "value": "Nike"}]) == 1
+    assert len(index) == 6
+    assert index.fuzzy("Reebokk", threshold=0.6)[0].id == 6
+    assert index.prefix("ree")[0].id == 6
+
+
+async def test_misses_are_searched_remotely_once(ozon_stub):
+    searched: List[str] = []
+
+    async def search(request: web.Request) -> web.Response:
+        body = await request.json()
+        searched.append(body["value"])
+        if body["value"] == "Puma":
+            return json_response({"result": [{"id": 7, "value": "PUMA"}]})
+        return json_response({"result": []})
+
+    api = await ozon_stub({"/v1/description-category/attribute/values/search": search})
+    index = AttributeValueIndex(
+        BRANDS, attribute_id=85, description_category_id=1, type_id=2, language="RU"
+    )
+    matches = await api.resolve_attribute_values(
+        index, ["Nike", "Puma", "Unknown", "Puma"]
+    )
+    assert matches["Nike"].method == "exact"
+    assert (matches["Puma"].id, matches["Puma"].method) == (7, "remote")
+    assert matches["Unknown"] is None
+    assert sorted(searched) == ["Puma", "Unknown"]
+
+    # The remote value is in the index now.
+    await api.resolve_attribute_values(index, ["puma"])
+    assert sorted(searched) == ["Puma", "Unknown"]
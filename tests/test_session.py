@@ -0,0 +1,69 @@
+from typing import Dict, Set
+
+import asyncio
+
+from aiohttp import TCPConnector, web
+
+from tests.conftest import json_response
+
+
+async def test_requests_share_one_pooled_session(ozon_stub):
+    peers: Set[int] = set()
+
+    async def tree(request: web.Request) -> web.Response:
+        peers.add(request.transport.get_extra_info("peername")[1])
+        return json_response({"result": []})
+
+    api = await ozon_stub({"/v1/description-category/tree": tree})
+    session = await api._get_session()
+    for _ in range(5):
+        await api.get_description_category_tree()
+    assert await api._get_session() is session
+    # Sequential requests reuse one kept-alive connection.
+    assert len(peers) == 1
+
+    connector = session.connector
+    await api.close()
+    assert session.closed and connector.closed
+
+    # A closed client opens a new session on its next request.
+    await api.get_description_category_tree()
+    assert await api._get_session() is not session
+
+
+async def test_connector_limits_are_applied(ozon_stub):
+    in_flight: Dict[str, int] = {"now": 0, "max": 0}
+
+    async def tree(request: web.Request) -> web.Response:
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight.values())
+        await asyncio.sleep(0.02)
+        in_flight["now"] -= 1
+        return json_response({"result": []})
+
+    api = await ozon_stub(
+        {"/v1/description-category/tree": tree},
+        limit=3,
+        limit_per_host=2,
+        keepalive_timeout=5,
+    )
+    connector = (await api._get_session()).connector
+    assert (connector.limit, connector.limit_per_host) == (3, 2)
+
+    await asyncio.gather(*(api.get_description_category_tree() for _ in range(8)))
+    assert in_flight["max"] == 2
+
+
+async def test_an_external_connector_is_not_closed(ozon_stub):
+    async def tree(request: web.Request) -> web.Response:
+        return json_response({"result": []})
+
+    connector = TCPConnector()
+    api = await ozon_stub({"/v1/description-category/tree": tree}, connector=connector)
+    await api.get_description_category_tree()
+    session = await api._get_session()
+    assert session.connector is connector
+
+    await api.close()
+    assert session.closed and not connector.closed
+    await connector.close()
@@ -0,0 +1,88 @@
+from typing import List
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from ozon_api.exceptions import OzonAPIError
+from ozon_api.retry import RetryPolicy
+from ozon_api.singleflight import SingleFlight
+from tests.conftest import json_response
+
+
+async def test_identical_reads_are_sent_once(ozon_stub):
+    bodies: List[dict] = []
+
+    async def attribute(request: web.Request) -> web.Response:
+        bodies.append(await request.json())
+        await asyncio.sleep(0.05)
+        return json_response({"result": [{"id": 85}]})
+
+    api = await ozon_stub(
+        {"/v1/description-category/attribute": attribute}, coalesce_reads=True
+    )
+    same = dict(description_category_id=1, type_id=2, language="RU")
+    responses = await asyncio.gather(
+        *(api.get_description_category_attribute(**same) for _ in range(10)),
+        api.get_description_category_attribute(description_category_id=1, type_id=3),
+    )
+    assert len(bodies) == 2
+    assert all(response is responses[0] for response in responses[:10])
+    assert responses[10] is not responses[0]
+
+    # Nothing is cached once the request is finished.
+    await api.get_description_category_attribute(**same)
+    assert len(bodies) == 3
+
+
+async def test_writes_are_not_coalesced(ozon_stub):
+    calls: List[str] = []
+
+    async def product_import(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        await asyncio.sleep(0.02)
+        return json_response({"result": {"task_id": len(calls)}})
+
+    api = await ozon_stub({"/v3/product/import": product_import}, coalesce_reads=True)
+    await asyncio.gather(*(api.product_import([], trusted=True) for _ in range(3)))
+    assert len(calls) == 3
+
+
+async def test_errors_reach_every_waiter(ozon_stub):
+    calls: List[str] = []
+
+    async def tree(request: web.Request) -> web.Response:
+        calls.append(request.path)
+        await asyncio.sleep(0.02)
+        return json_response({"message": "unavailable"}, status=503)
+
+    api = await ozon_stub(
+        {"/v1/description-category/tree": tree},
+        coalesce_reads=True,
+        retry_policies={"description-category/tree": RetryPolicy(max_attempts=1)},
+    )
+    results = await asyncio.gather(
+        *(api.get_description_category_tree() for _ in range(5)), return_exceptions=True
+    )
+    assert len(calls) == 1
+    assert all(isinstance(result, OzonAPIError) for result in results)
+
+
+async def test_a_cancelled_waiter_does_not_cancel_the_call():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def call() -> str:
+        started.set()
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("key", call))
+    second = asyncio.ensure_future(flight.do("key", call))
+    await started.wait()
+    first.cancel()
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert len(flight) == 0
@@ -0,0 +1,82 @@
+from typing import Any, Dict, List, Set
+
+from aiohttp import web
+
+from ozon_api.snapshot import AttributeSnapshot
+from tests.conftest import json_response
+
+
+def item(offer_id: str, value: str) -> Dict[str, Any]:
+    return {
+        "offer_id": offer_id,
+        "attributes": [{"complex_id": 0, "id": 4180, "values": [{"value": value}]}],
+    }
+
+
+class Updates:
+    """
+    The stub endpoints of attribute updates, rejecting the products in `rejected`.
+    """
+
+    def __init__(self) -> None:
+        self.sent: List[List[str]] = []
+        self.rejected: Set[str] = set()
+        self.lost = False
+
+    def routes(self) -> Dict[str, Any]:
+        return {
+            "/v1/product/attributes/update": self.update,
+            "/v1/product/import/info": self.info,
+        }
+
+    async def update(self, request: web.Request) -> web.Response:
+        self.sent.append([item["offer_id"] for item in (await request.json())["items"]])
+        return json_response({"task_id": len(self.sent)})
+
+    async def info(self, request: web.Request) -> web.Response:
+        if self.lost:
+            return json_response({"code": 5, "message": "task not found"})
+        offers = self.sent[(await request.json())["task_id"] - 1]
+        items = [
+            {
+                "offer_id": offer_id,
+                "status": "failed" if offer_id in self.rejected else "imported",
+            }
+            for offer_id in offers
+        ]
+        return json_response({"result": {"items": items, "total": len(items)}})
+
+
+async def test_snapshot_keeps_only_imported_products(ozon_stub, tmp_path):
+    updates = Updates()
+    updates.rejected.add("B")
+    api = await ozon_stub(updates.routes())
+    api.import_poller.min_interval = 0.01
+    snapshot = AttributeSnapshot(tmp_path)
+    items = [item("A", "one"), item("B", "two")]
+
+    result = await api.product_attributes_update_diff(items, snapshot, trusted=True)
+    assert (result["updated"], result["failed"]) == (["A"], ["B"])
+    assert set(snapshot.get_many(api.client_id, ["A", "B"])) == {"A"}
+
+    # The rejected product is sent again, the imported one is not.
+    updates.rejected.clear()
+    result = await api.product_attributes_update_diff(items, snapshot, trusted=True)
+    assert updates.sent[-1] == ["B"]
+    assert (result["updated"], result["unchanged"]) == (["B"], ["A"])
+    snapshot.close()
+
+
+async def test_unconfirmed_tasks_leave_the_snapshot(ozon_stub, tmp_path):
+    updates = Updates()
+    updates.lost = True
+    api = await ozon_stub(updates.routes())
+    api.import_poller.min_interval = 0.01
+    snapshot = AttributeSnapshot(tmp_path)
+
+    result = await api.product_attributes_update_diff(
+        [item("A", "one")], snapshot, trusted=True
+    )
+    assert (result["task_ids"], result["updated"], result["failed"]) == ([1], [], ["A"])
+    assert snapshot.get_many(api.client_id, ["A"]) == {}
+    snapshot.close()
@@ -0,0 +1,102 @@
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List
+
+import asyncio
+import threading
+
+import pytest
+from aiohttp import web
+
+from ozon_api.sync import SyncOzonAPI
+from tests.conftest import json_response
+
+# The stub server runs in the loop of the test, so the blocking calls are made from other
+# threads with asyncio.to_thread.
+
+
+async def pending_tasks(api) -> int:
+    return len(asyncio.all_tasks()) - 1
+
+
+def make_sync(stub, **options) -> SyncOzonAPI:
+    sync = SyncOzonAPI("client", "key", **options)
+    sync.api.api_url = stub.api_url
+    return sync
+
+
+async def test_calls_from_many_threads_share_one_loop(ozon_stub):
+    threads: List[str] = []
+
+    async def tree(request: web.Request) -> web.Response:
+        await asyncio.sleep(0.01)
+        return json_response({"result": []})
+
+    stub = await ozon_stub({"/v1/description-category/tree": tree})
+    sync = make_sync(stub)
+
+    def call(_: int) -> dict:
+        threads.append(threading.current_thread().name)
+        return sync.get_description_category_tree()
+
+    def run_all() -> List[dict]:
+        with ThreadPoolExecutor(8) as executor:
+            return list(executor.map(call, range(32)))
+
+    try:
+        assert await asyncio.to_thread(run_all) == [{"result": []}] * 32
+        assert len(set(threads)) > 1
+        assert sync._thread.name == "ozon-api-loop"
+    finally:
+        await asyncio.to_thread(sync.close)
+
+
+async def test_a_timed_out_call_is_cancelled(ozon_stub):
+    finished: List[bool] = []
+
+    async def tree(request: web.Request) -> web.Response:
+        await asyncio.sleep(0.5)
+        finished.append(True)
+        return json_response({"result": []})
+
+    stub = await ozon_stub({"/v1/description-category/tree": tree})
+    sync = make_sync(stub, timeout=0.1)
+    try:
+        with pytest.raises(FutureTimeoutError):
+            await asyncio.to_thread(sync.get_description_category_tree)
+        await asyncio.sleep(0.05)
+        assert await asyncio.to_thread(sync.run, pending_tasks) == 0
+    finally:
+        await asyncio.to_thread(sync.close)
+
+
+async def test_close_cancels_pending_calls_and_reuse_starts_a_new_loop(ozon_stub):
+    started = asyncio.Event()
+
+    async def tree(request: web.Request) -> web.Response:
+        started.set()
+        await asyncio.sleep(5)
+        return json_response({"result": []})
+
+    async def limit(request: web.Request) -> web.Response:
+        return json_response({"result": "ok"})
+
+    stub = await ozon_stub(
+        {"/v1/description-category/tree": tree, "/v4/product/info/limit": limit}
+    )
+    sync = make_sync(stub)
+    pending = sync.submit("get_description_category_tree")
+    await started.wait()
+    first_loop = sync._loop
+
+    await asyncio.to_thread(sync.close)
+    assert pending.cancelled()
+    with pytest.raises(CancelledError):
+        pending.result(0)
+    assert first_loop.is_closed()
+
+    try:
+        assert await asyncio.to_thread(sync.product_info_limit) == {"result": "ok"}
+        assert sync._loop is not first_loop
+    finally:
+        await asyncio.to_thread(sync.close)
@@ -0,0 +1,225 @@
+from types import MappingProxyType
+from typing import Any, Dict
+
+import pytest
+from aiohttp import web
+from pydantic import ValidationError
+
+from ozon_api.models import ProductImport_Item
+from ozon_api.validation import ImportValidator
+from tests.conftest import json_response
+
+CATEGORY = 17027949
+
+ATTRIBUTES = [
+    {
+        "id": 85,
+        "name": "Бренд",
+        "is_required": True,
+        "dictionary_id": 28732849,
+        "values": [{"id": 1, "value": "Acme"}, {"id": 2, "value": "Other"}],
+    },
+    {
+        "id": 10,
+        "name": "Цвет",
+        "is_collection": True,
+        "max_value_count": 2,
+        "dictionary_id": 1495,
+        "values": [
+            {"id": value_id, "value": str(value_id)} for value_id in (61, 62, 63)
+        ],
+    },
+    {"id": 20, "name": "Количество", "type": "Integer"},
+    {"id": 30, "name": "Название модели"},
+]
+
+
+def make_validator() -> ImportValidator:
+    # Two types of one category: items must name their type to be checked.
+    return ImportValidator.from_full_info(
+        {
+            (CATEGORY, 94765): ATTRIBUTES,
+            (CATEGORY, 94766): [{"id": 30, "name": "Модель", "is_required": True}],
+        }
+    )
+
+
+def product(**fields: Any) -> Dict[str, Any]:
+    item = {
+        "attributes": [
+            {"complex_id": 0, "id": 85, "values": [{"dictionary_value_id": 1}]}
+        ],
+        "barcode": "",
+        "description_category_id": CATEGORY,
+        "new_description_category_id": 0,
+        "type_id": 94765,
+        "color_image": "",
+        "complex_attributes": [],
+        "currency_code": "RUB",
+        "depth": 10,
+        "dimension_unit": "mm",
+        "height": 10,
+        "images": [],
+        "images360": [],
+        "name": "Товар",
+        "offer_id": "A-1",
+        "old_price": "",
+        "pdf_list": [],
+        "price": "100",
+        "primary_image": "",
+        "vat": "0.2",
+        "weight": 100,
+        "weight_unit": "g",
+        "width": 10,
+    }
+    item.update(fields)
+    return item
+
+
+def codes(errors) -> list:
+    return sorted(error.code for error in errors)
+
+
+def test_valid_dict_and_model_agree():
+    validator = make_validator()
+    item = product()
+    assert validator.check(item) == []
+    assert validator.check(ProductImport_Item.model_validate(item)) == []
+
+
+def test_model_of_a_category_with_several_types():
+    validator = make_validator()
+    model = ProductImport_Item.model_validate(product(type_id=94766, attributes=[]))
+    assert codes(validator.check(model)) == ["required"]
+
+    # Without a type, a category with several types can not be resolved.
+    model = ProductImport_Item.model_validate(product(type_id=0))
+    assert codes(validator.check(model)) == ["unknown_category"]
+
+
+def test_model_requires_the_type():
+    item = product()
+    del item["type_id"]
+    with pytest.raises(ValidationError):
+        ProductImport_Item.model_validate(item)
+
+
+def test_attribute_errors():
+    validator = make_validator()
+    item = product(
+        attributes=[
+            {"complex_id": 0, "id": 85, "values": [{"dictionary_value_id": 99}]},
+            {
+                "complex_id": 0,
+                "id": 10,
+                "values": [
+                    {"dictionary_value_id": value_id} for value_id in (61, 62, 63)
+                ],
+            },
+            {"complex_id": 0, "id": 20, "values": [{"value": "1.5"}]},
+            {"complex_id": 0, "id": 40, "values": [{"value": "x"}]},
+        ]
+    )
+    errors = validator.check(item, index=7)
+    assert codes(errors) == [
+        "invalid_value",
+        "too_many_values",
+        "unknown_attribute",
+        "unknown_value",
+    ]
+    assert {error.index for error in errors} == {7}
+    assert {error.offer_id for error in errors} == {"A-1"}
+
+    model_errors = validator.check(ProductImport_Item.model_validate(item), index=7)
+    assert codes(model_errors) == codes(errors)
+
+
+def test_item_fields():
+    validator = make_validator()
+    errors = validator.check(
+        product(vat="0.18", currency_code="GBP", price="abc", name="")
+    )
+    assert codes(errors) == [
+        "invalid_currency",
+        "invalid_price",
+        "invalid_vat",
+        "missing_field",
+    ]
+
+    errors = validator.check(product(attributes=[]))
+    assert [(error.code, error.attribute_id) for error in errors] == [("required", 85)]
+
+
+def test_mappings_that_are_not_dicts():
+    validator = make_validator()
+    attribute = MappingProxyType(
+        {"id": 85, "values": [MappingProxyType({"dictionary_value_id": 2})]}
+    )
+    assert validator.check(MappingProxyType(product(attributes=[attribute]))) == []
+
+
+def test_split_reports_indices_from_start():
+    validator = make_validator()
+    items = [product(), product(offer_id="bad", vat="1"), product()]
+    valid, invalid = validator.split(items, start=100)
+    assert len(valid) == 2
+    assert list(invalid) == [101]
+    assert invalid[101][0].index == 101
+    assert [error.index for error in validator.validate(items, start=100)] == [101]
+
+
+async def test_bulk_import_reports_invalid_items_by_their_position(ozon_stub):
+    tasks: Dict[int, list] = {}
+
+    async def product_import(request: web.Request) -> web.Response:
+        body = await request.json()
+        task_id = len(tasks) + 1
+        tasks[task_id] = body["items"]
+        return json_response({"result": {"task_id": task_id}})
+
+    async def product_import_info(request: web.Request) -> web.Response:
+        items = tasks[(await request.json())["task_id"]]
+        return json_response(
+            {
+                "result": {
+                    "items": [
+                        {
+                            "offer_id": item["offer_id"],
+                            "product_id": 1,
+                            "status": "imported",
+                        }
+                        for item in items
+                    ],
+                    "total": len(items),
+                }
+            }
+        )
+
+    api = await ozon_stub(
+        {
+            "/v3/product/import": product_import,
+            "/v1/product/import/info": product_import_info,
+        }
+    )
+    api.import_poller.min_interval = 0.01
+
+    items = [product(offer_id=f"A-{index}") for index in range(250)]
+    items[30]["vat"] = "1"
+    items[180]["vat"] = "1"
+    results = [
+        result
+        async for result in api.product_import_bulk(
+            items, chunk_size=100, validator=make_validator()
+        )
+    ]
+
+    invalid = {
+        result["offer_id"]: result
+        for result in results
+        if result["status"] == "invalid"
+    }
+    assert sorted(invalid) == ["A-180", "A-30"]
+    assert invalid["A-180"]["errors"][0]["index"] == 180
+    assert invalid["A-30"]["errors"][0]["index"] == 30
+    assert sum(result["status"] == "imported" for result in results) == 248
+    assert sum(len(items) for items in tasks.values()) == 248